@@ -10,7 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 # Import the models and base
 from app.db.base import Base
-from app.models import User, Project, Document, Character
+from app.models import User, Project, Document, DocumentVersion, Character, GenerationJob
 from app.core.config import settings
 
 # this is the Alembic Config object
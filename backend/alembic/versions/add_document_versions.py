@@ -0,0 +1,143 @@
+"""Move document versions from JSONB metadata to document_versions
+
+Revision ID: add_document_versions_003
+Revises: add_generation_jobs_002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_document_versions_003'
+down_revision = 'add_generation_jobs_002'
+branch_labels = None
+depends_on = None
+
+UUID_PATTERN = '^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+TIMESTAMP_PATTERN = r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}'
+
+
+def upgrade() -> None:
+    # Create document_versions table
+    op.create_table(
+        'document_versions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.String(length=32), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('min_word_count', sa.Integer(), nullable=True),
+        sa.Column('max_word_count', sa.Integer(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('instructions', sa.Text(), nullable=True),
+        sa.Column('source_version_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('source_version', sa.String(length=32), nullable=True),
+        sa.Column('source_type', sa.String(length=50), nullable=True),
+        sa.Column('source_comment_ids', postgresql.JSONB(), nullable=True),
+        sa.Column('edited_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    )
+
+    # Create indexes
+    op.create_index(
+        'ix_document_versions_document_id_created_at',
+        'document_versions',
+        ['document_id', 'created_at']
+    )
+
+    # Backfill from documents.document_metadata->'versions'. Entries keep their ids so
+    # comments and source_version_id references stay valid; malformed ids/dates get
+    # fresh values, and the array position breaks created_at ties.
+    op.execute(
+        f"""
+        INSERT INTO document_versions (
+            id, document_id, version, content, word_count,
+            min_word_count, max_word_count, summary, instructions,
+            source_version_id, source_version, source_type, source_comment_ids,
+            edited_by, created_at
+        )
+        SELECT
+            CASE WHEN v.entry->>'id' ~ '{UUID_PATTERN}'
+                 THEN (v.entry->>'id')::uuid ELSE gen_random_uuid() END,
+            d.id,
+            COALESCE(v.entry->>'version', 'v1'),
+            v.entry->>'content',
+            CASE WHEN jsonb_typeof(v.entry->'word_count') = 'number'
+                 THEN (v.entry->>'word_count')::numeric::int
+                 ELSE COALESCE(array_length(regexp_split_to_array(trim(v.entry->>'content'), '\\s+'), 1), 0) END,
+            CASE WHEN jsonb_typeof(v.entry->'min_word_count') = 'number'
+                 THEN (v.entry->>'min_word_count')::numeric::int END,
+            CASE WHEN jsonb_typeof(v.entry->'max_word_count') = 'number'
+                 THEN (v.entry->>'max_word_count')::numeric::int END,
+            v.entry->>'summary',
+            v.entry->>'instructions',
+            CASE WHEN v.entry->>'source_version_id' ~ '{UUID_PATTERN}'
+                 THEN (v.entry->>'source_version_id')::uuid END,
+            v.entry->>'source_version',
+            v.entry->>'source_type',
+            CASE WHEN jsonb_typeof(v.entry->'source_comment_ids') = 'array'
+                 THEN v.entry->'source_comment_ids' END,
+            CASE WHEN v.entry->>'edited_by' ~ '{UUID_PATTERN}'
+                 THEN (v.entry->>'edited_by')::uuid END,
+            CASE WHEN v.entry->>'created_at' ~ '{TIMESTAMP_PATTERN}'
+                 THEN (v.entry->>'created_at')::timestamp
+                 ELSE d.created_at END + (v.position * interval '1 microsecond')
+        FROM documents d
+        CROSS JOIN LATERAL jsonb_array_elements(d.document_metadata->'versions')
+            WITH ORDINALITY AS v(entry, position)
+        WHERE jsonb_typeof(d.document_metadata->'versions') = 'array'
+          AND jsonb_typeof(v.entry) = 'object'
+          AND v.entry->>'content' IS NOT NULL
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+
+    op.execute(
+        "UPDATE documents SET document_metadata = document_metadata - 'versions' "
+        "WHERE document_metadata ? 'versions'"
+    )
+
+
+def downgrade() -> None:
+    # Fold versions back into the JSONB metadata
+    op.execute(
+        """
+        UPDATE documents d
+        SET document_metadata = COALESCE(d.document_metadata, '{}'::jsonb) || jsonb_build_object(
+            'versions',
+            (
+                SELECT jsonb_agg(
+                    jsonb_strip_nulls(jsonb_build_object(
+                        'id', v.id::text,
+                        'version', v.version,
+                        'created_at', v.created_at,
+                        'content', v.content,
+                        'word_count', v.word_count,
+                        'min_word_count', v.min_word_count,
+                        'max_word_count', v.max_word_count,
+                        'summary', v.summary,
+                        'instructions', v.instructions,
+                        'source_version_id', v.source_version_id::text,
+                        'source_version', v.source_version,
+                        'source_type', v.source_type,
+                        'source_comment_ids', v.source_comment_ids,
+                        'edited_by', v.edited_by::text
+                    ))
+                    ORDER BY v.created_at
+                )
+                FROM document_versions v
+                WHERE v.document_id = d.id
+            )
+        )
+        WHERE EXISTS (SELECT 1 FROM document_versions v WHERE v.document_id = d.id)
+        """
+    )
+
+    # Drop indexes
+    op.drop_index('ix_document_versions_document_id_created_at', table_name='document_versions')
+
+    # Drop table
+    op.drop_table('document_versions')
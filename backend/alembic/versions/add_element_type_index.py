@@ -0,0 +1,36 @@
+"""Add an expression index for element type lookups per project
+
+Revision ID: add_element_type_index_006
+Revises: add_query_indexes_005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_element_type_index_006'
+down_revision = 'add_query_indexes_005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_documents_project_id_element_type',
+            'documents',
+            ['project_id', sa.text("(document_metadata ->> 'element_type')")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_documents_project_id_element_type',
+            table_name='documents',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,74 @@
+"""Add generation jobs table
+
+Revision ID: add_generation_jobs_002
+Revises: add_chat_messages_001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'add_generation_jobs_002'
+down_revision = 'add_chat_messages_001'
+branch_labels = None
+depends_on = None
+
+JOB_TYPES = ('GENERATE_CHAPTER', 'GENERATE_BOOK', 'GENERATE_ELEMENT', 'INDEX_PROJECT')
+JOB_STATUSES = ('PENDING', 'RUNNING', 'SUCCEEDED', 'FAILED', 'CANCELLED')
+
+
+def upgrade() -> None:
+    # Create enums
+    job_type_enum = postgresql.ENUM(*JOB_TYPES, name='jobtype')
+    job_type_enum.create(op.get_bind())
+    job_status_enum = postgresql.ENUM(*JOB_STATUSES, name='jobstatus')
+    job_status_enum.create(op.get_bind())
+
+    # Create generation_jobs table
+    op.create_table(
+        'generation_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('job_type', postgresql.ENUM(*JOB_TYPES, name='jobtype', create_type=False), nullable=False),
+        sa.Column('status', postgresql.ENUM(*JOB_STATUSES, name='jobstatus', create_type=False), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_message', sa.String(length=255), nullable=True),
+        sa.Column('params', postgresql.JSONB(), server_default='{}'),
+        sa.Column('result', postgresql.JSONB(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('celery_task_id', sa.String(length=255), nullable=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    )
+
+    # Create indexes
+    op.create_index(
+        'ix_generation_jobs_user_id',
+        'generation_jobs',
+        ['user_id']
+    )
+    op.create_index(
+        'ix_generation_jobs_project_id',
+        'generation_jobs',
+        ['project_id']
+    )
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index('ix_generation_jobs_project_id', table_name='generation_jobs')
+    op.drop_index('ix_generation_jobs_user_id', table_name='generation_jobs')
+
+    # Drop table
+    op.drop_table('generation_jobs')
+
+    # Drop enums
+    postgresql.ENUM(name='jobstatus').drop(op.get_bind())
+    postgresql.ENUM(name='jobtype').drop(op.get_bind())
@@ -0,0 +1,62 @@
+"""Add indexes for project-scoped document, character and project queries
+
+Revision ID: add_query_indexes_005
+Revises: compress_document_versions_004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_query_indexes_005'
+down_revision = 'compress_document_versions_004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build; it cannot run
+    # inside the migration transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        # Listings (ORDER BY order_index), counts and max(order_index) per project
+        op.create_index(
+            'ix_documents_project_id_order_index',
+            'documents',
+            ['project_id', 'order_index'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Containment lookups on element_type / parent_id (document_metadata @> ...)
+        op.create_index(
+            'ix_documents_document_metadata',
+            'documents',
+            ['document_metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'document_metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Character listings are ordered by name
+        op.create_index(
+            'ix_characters_project_id_name',
+            'characters',
+            ['project_id', 'name'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Project listings are ordered by most recent update
+        op.create_index(
+            'ix_projects_owner_id_updated_at',
+            'projects',
+            ['owner_id', 'updated_at'],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_owner_id_updated_at', table_name='projects', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_characters_project_id_name', table_name='characters', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_documents_document_metadata', table_name='documents', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_documents_project_id_order_index', table_name='documents', postgresql_concurrently=True, if_exists=True)
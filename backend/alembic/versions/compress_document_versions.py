@@ -0,0 +1,73 @@
+"""Store document version content as compressed snapshots and deltas
+
+Revision ID: compress_document_versions_004
+Revises: add_document_versions_003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'compress_document_versions_004'
+down_revision = 'add_document_versions_003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep their text in `content` (encoding "plain") and act as snapshots
+    op.add_column(
+        'document_versions',
+        sa.Column('content_encoding', sa.String(length=16), nullable=False, server_default='plain'),
+    )
+    op.add_column('document_versions', sa.Column('content_data', sa.LargeBinary(), nullable=True))
+    op.add_column(
+        'document_versions',
+        sa.Column('base_version_id', postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        'fk_document_versions_base_version_id',
+        'document_versions',
+        'document_versions',
+        ['base_version_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+    op.alter_column('document_versions', 'content', existing_type=sa.Text(), nullable=True)
+
+
+def downgrade() -> None:
+    from app.services.version_codec import DELTA, SNAPSHOT, apply_delta, decompress_text
+
+    # Decode compressed rows back into plain text before dropping the columns
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, content_encoding, content_data, base_version_id "
+        "FROM document_versions WHERE content_encoding <> 'plain'"
+    )).fetchall()
+    snapshots = {row.id: decompress_text(row.content_data) for row in rows if row.content_encoding == SNAPSHOT}
+    for row in rows:
+        if row.content_encoding == SNAPSHOT:
+            text = snapshots[row.id]
+        elif row.content_encoding == DELTA:
+            base = snapshots.get(row.base_version_id)
+            if base is None:
+                base = bind.execute(
+                    sa.text("SELECT content FROM document_versions WHERE id = :id"),
+                    {"id": row.base_version_id},
+                ).scalar() or ""
+            text = apply_delta(base, row.content_data)
+        else:
+            continue
+        bind.execute(
+            sa.text("UPDATE document_versions SET content = :content WHERE id = :id"),
+            {"content": text, "id": row.id},
+        )
+
+    op.alter_column('document_versions', 'content', existing_type=sa.Text(), nullable=False)
+    op.drop_constraint('fk_document_versions_base_version_id', 'document_versions', type_='foreignkey')
+    op.drop_column('document_versions', 'base_version_id')
+    op.drop_column('document_versions', 'content_data')
+    op.drop_column('document_versions', 'content_encoding')
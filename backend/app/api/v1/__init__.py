@@ -1,7 +1,7 @@
 """API v1 router"""
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import health, auth, projects, documents, characters, agents, chat, upload, writing
+from app.api.v1.endpoints import health, auth, projects, documents, characters, agents, chat, upload, writing, jobs
 
 api_router = APIRouter()
 
@@ -15,3 +15,4 @@ api_router.include_router(agents.router, prefix="/agents", tags=["AI Agents"])
 api_router.include_router(chat.router, prefix="/chat", tags=["Chat"])
 api_router.include_router(upload.router, prefix="/upload", tags=["Upload"])
 api_router.include_router(writing.router, prefix="/writing", tags=["Writing"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
@@ -1,24 +1,29 @@
 """Documents endpoints"""
+import json
+import logging
 import math
 import re
 from datetime import datetime
 from uuid import uuid4
 from httpx import ReadTimeout
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import Dict, Any, Optional
+from sqlalchemy import select, func, and_, case, or_, Integer, Numeric
+from typing import Any, Awaitable, Callable, Dict, Literal, Optional, Union
 from uuid import UUID
 
-from app.db.session import get_db
+from app.db.session import get_db, AsyncSessionLocal, commit
 from app.models.user import User
 from app.models.document import Document, DocumentType
+from app.models.document_version import DocumentVersion
+from app.models.job import JobType
 from app.schemas.document import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
     DocumentList,
+    DocumentSummaryList,
     ElementCreateRequest,
     ElementGenerateRequest,
     DocumentVersionCreate,
@@ -29,12 +34,27 @@ from app.schemas.document import (
     DocumentComment,
     DocumentCommentList,
 )
+from app.schemas.job import JobResponse
 from app.services.document_service import DocumentService
+from app.services.document_version_service import (
+    DocumentVersionService,
+    base_version_id,
+    base_version_summary,
+    next_version_label,
+)
 from app.services.context_service import ProjectContextService
+from app.services.context_packer import pack_context
 from app.services.llm_client import DeepSeekClient
+from app.services.job_service import JobService
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.tasks.generation import generate_element_task
 from app.core.config import settings
+from app.core.http_cache import make_etag, not_modified, set_cache_headers
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.security import get_current_active_user
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 ELEMENT_TYPE_DEFS: Dict[str, Dict[str, Any]] = {
@@ -77,23 +97,6 @@ def _count_words(text: str) -> int:
     return len(text.split())
 
 
-def _parse_version(value: Optional[str]) -> tuple[int, int]:
-    if not value:
-        return (1, 0)
-    match = re.match(r"^v(?P<major>\d+)(?:\.(?P<minor>\d+))?$", value.strip())
-    if not match:
-        return (1, 0)
-    major = int(match.group("major"))
-    minor = int(match.group("minor") or 0)
-    return (major, minor)
-
-
-def _format_version(major: int, minor: int) -> str:
-    if minor <= 0:
-        return f"v{major}"
-    return f"v{major}.{minor:02d}"
-
-
 def _safe_filename(value: str, fallback: str) -> str:
     cleaned = re.sub(r"[^\w\s-]", "", (value or "").strip())
     cleaned = re.sub(r"\s+", "-", cleaned).strip("-")
@@ -102,27 +105,11 @@ def _safe_filename(value: str, fallback: str) -> str:
     return cleaned[:120]
 
 
-def _load_versions(metadata: Dict[str, Any]) -> list[dict]:
-    versions = metadata.get("versions") if isinstance(metadata, dict) else None
-    return versions if isinstance(versions, list) else []
-
-
 def _load_comments(metadata: Dict[str, Any]) -> list[dict]:
     comments = metadata.get("comments") if isinstance(metadata, dict) else None
     return comments if isinstance(comments, list) else []
 
 
-def _get_version_label(versions: list[dict], version_id: Optional[UUID]) -> Optional[str]:
-    if not version_id:
-        return None
-    for entry in versions:
-        if not isinstance(entry, dict):
-            continue
-        if str(entry.get("id")) == str(version_id):
-            return entry.get("version")
-    return None
-
-
 def _serialize_comment(entry: dict) -> Optional[dict]:
     if not isinstance(entry, dict):
         return None
@@ -152,103 +139,68 @@ async def _ensure_versions_for_document(
     *,
     document: Document,
     document_service: DocumentService,
+    version_service: DocumentVersionService,
     user_id: UUID,
-) -> tuple[list[dict], Optional[str]]:
+) -> Optional[str]:
+    """Give documents that predate versioning a "v1" and return the current version label."""
     metadata = document.document_metadata or {}
-    versions = _load_versions(metadata)
     current_version = metadata.get("current_version") if isinstance(metadata, dict) else None
-    if versions:
-        return versions, current_version
+    if await version_service.get_latest(document.id):
+        return current_version
 
-    content = (document.content or "").strip()
-    if not content:
-        return versions, current_version
-
-    base_version = "v1"
-    versions.append(
-        {
-            "id": str(uuid4()),
-            "version": base_version,
-            "created_at": datetime.utcnow().isoformat(),
-            "content": content,
-            "word_count": _count_words(content),
-            "min_word_count": metadata.get("min_word_count"),
-            "max_word_count": metadata.get("max_word_count"),
-            "summary": metadata.get("summary"),
-            "instructions": None,
-            "source_version_id": None,
-            "source_version": None,
-            "source_type": None,
-            "source_comment_ids": None,
-        }
-    )
+    if not (document.content or "").strip():
+        return current_version
 
-    metadata_updates = {
-        **(metadata if isinstance(metadata, dict) else {}),
-        "versions": versions,
-        "current_version": base_version,
-    }
+    await version_service.create_base_version(document)
     await document_service.update(
         document.id,
-        DocumentUpdate(metadata=metadata_updates),
+        DocumentUpdate(metadata={**(metadata if isinstance(metadata, dict) else {}), "current_version": "v1"}),
         user_id,
     )
-    return versions, base_version
+    return "v1"
 
 
-def _get_source_content(versions: list[dict], source_version_id: Optional[UUID]) -> tuple[str, Optional[str]]:
-    if not source_version_id:
-        return ("", None)
-    for entry in versions:
-        if not isinstance(entry, dict):
-            continue
-        if str(entry.get("id")) == str(source_version_id):
-            content = str(entry.get("content") or "")
-            source_version = entry.get("version")
-            if len(content) <= 3200:
-                return (content, source_version)
-            head = content[:1600]
-            tail = content[-1600:]
-            excerpt = f"{head}\n\n[...]\n\n{tail}"
-            return (excerpt, source_version)
-    return ("", None)
-
-
-def _serialize_version(entry: dict, current_version: Optional[str], include_content: bool) -> Optional[dict]:
-    if not isinstance(entry, dict):
-        return None
-    version_id = entry.get("id")
-    version = entry.get("version")
-    content = entry.get("content")
-    if not version_id or not version or content is None:
-        return None
-    created_at = entry.get("created_at")
+def _parse_version_cursor(cursor: str) -> tuple[datetime, UUID]:
+    created_at, version_id = decode_cursor(cursor, 2)
     try:
-        created_at_dt = datetime.fromisoformat(created_at) if created_at else datetime.utcnow()
+        return datetime.fromisoformat(created_at), UUID(version_id)
     except ValueError:
-        created_at_dt = datetime.utcnow()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _source_excerpt(content: str) -> str:
+    if len(content) <= 3200:
+        return content
+    head = content[:1600]
+    tail = content[-1600:]
+    return f"{head}\n\n[...]\n\n{tail}"
 
-    word_count = entry.get("word_count")
-    if not isinstance(word_count, int):
-        word_count = _count_words(str(content))
 
+def _parse_uuid(value: Any) -> Optional[UUID]:
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+def _serialize_version(version: Any, current_version: Optional[str], content: Optional[str] = None) -> dict:
     base = {
-        "id": UUID(str(version_id)),
-        "version": str(version),
-        "created_at": created_at_dt,
-        "word_count": word_count,
-        "min_word_count": entry.get("min_word_count"),
-        "max_word_count": entry.get("max_word_count"),
-        "summary": entry.get("summary"),
-        "instructions": entry.get("instructions"),
-        "source_version_id": entry.get("source_version_id"),
-        "source_version": entry.get("source_version"),
-        "source_type": entry.get("source_type"),
-        "source_comment_ids": entry.get("source_comment_ids"),
-        "is_current": str(version) == str(current_version),
+        "id": version.id,
+        "version": version.version,
+        "created_at": version.created_at,
+        "word_count": version.word_count or 0,
+        "min_word_count": version.min_word_count,
+        "max_word_count": version.max_word_count,
+        "summary": version.summary,
+        "instructions": version.instructions,
+        "source_version_id": str(version.source_version_id) if version.source_version_id else None,
+        "source_version": version.source_version,
+        "source_type": version.source_type,
+        "source_comment_ids": version.source_comment_ids,
+        "is_current": version.version == current_version,
     }
-    if include_content:
-        base["content"] = str(content)
+    if content is not None:
+        base["content"] = content
     return base
 
 
@@ -304,28 +256,38 @@ async def _get_next_order_index(db: AsyncSession, project_id: UUID) -> int:
     return (max_index + 1) if max_index is not None else 0
 
 
+async def _lock_project_elements(db: AsyncSession, project_id: UUID) -> None:
+    """Serialize element creation per project until the transaction ends (commit/rollback)."""
+    await db.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(f"document-elements:{project_id}")))
+    )
+
+
 async def _get_next_element_index(
     db: AsyncSession,
     project_id: UUID,
     element_type: str,
 ) -> int:
+    # Same rules as _infer_element_type, evaluated in SQL: only two numbers come back
+    type_expr = Document.document_metadata["element_type"].astext
+    matches = type_expr == element_type
+    if element_type == "chapitre":
+        untyped = or_(type_expr.is_(None), type_expr.not_in(list(ELEMENT_TYPE_DEFS)))
+        matches = or_(matches, and_(untyped, Document.document_type == DocumentType.CHAPTER))
+
+    raw_index = Document.document_metadata["element_index"]
+    index_expr = case(
+        (func.jsonb_typeof(raw_index) == "number", func.trunc(raw_index.astext.cast(Numeric)).cast(Integer)),
+        (raw_index.astext.regexp_match(r"^\s*[-+]?\d{1,9}\s*$"), func.trim(raw_index.astext).cast(Integer)),
+        else_=0,
+    )
     result = await db.execute(
-        select(Document).where(Document.project_id == project_id)
+        select(func.coalesce(func.max(index_expr), 0), func.count(Document.id)).where(
+            Document.project_id == project_id,
+            matches,
+        )
     )
-    documents = result.scalars().all()
-    current_max = 0
-    seen = 0
-    for doc in documents:
-        doc_type = _infer_element_type(doc)
-        if doc_type != element_type:
-            continue
-        seen += 1
-        metadata = doc.document_metadata or {}
-        try:
-            index = int(metadata.get("element_index", 0))
-        except (TypeError, ValueError):
-            index = 0
-        current_max = max(current_max, index)
+    current_max, seen = result.one()
     return max(current_max, seen) + 1
 
 
@@ -340,28 +302,32 @@ def _validate_parent_child(parent: Document, child_type: str) -> None:
         )
 
 
-def _format_context_block(context: Dict[str, Any]) -> str:
+def _format_context_block(
+    context: Dict[str, Any],
+    focus: str = "",
+    anchor_index: Optional[int] = None,
+) -> str:
     project = context.get("project", {})
-    instructions = context.get("instructions", [])
-    characters = context.get("characters", [])
-    documents = context.get("documents", [])
     constraints = context.get("constraints", {})
 
-    instruction_lines = [
-        f"- {item.get('title')}: {item.get('detail')}"
-        for item in instructions
-        if item.get("title") and item.get("detail")
-    ]
-    character_lines = [
-        f"- {char.get('name')}: {char.get('description') or ''}"
-        for char in characters
-        if char.get("name")
-    ]
-    document_lines = [
-        f"- {doc.get('title')}"
-        for doc in documents
-        if doc.get("title")
-    ]
+    packed = pack_context(
+        context,
+        {
+            "instructions": lambda item: (
+                f"- {item.get('title')}: {item.get('detail')}"
+                if item.get("title") and item.get("detail") else None
+            ),
+            "characters": lambda char: (
+                f"- {char.get('name')}: {char.get('description') or ''}" if char.get("name") else None
+            ),
+            "documents": lambda doc: f"- {doc.get('title')}" if doc.get("title") else None,
+        },
+        focus=focus,
+        anchor_index=anchor_index,
+    )
+    instruction_lines = packed["instructions"]["lines"]
+    character_lines = packed["characters"]["lines"]
+    document_lines = packed["documents"]["lines"]
 
     return (
         "PROJECT CONTEXT:\n"
@@ -376,11 +342,302 @@ def _format_context_block(context: Dict[str, Any]) -> str:
     )
 
 
-@router.get("/", response_model=DocumentList)
+SYSTEM_WRITER_PROMPT = "You are THOTH, a French literary writing assistant."
+
+
+async def _prepare_element_generation(
+    *,
+    db: AsyncSession,
+    document_service: DocumentService,
+    document_id: UUID,
+    payload: ElementGenerateRequest,
+    user_id: UUID,
+) -> Dict[str, Any]:
+    """Load the document and context, validate the request and build the generation plan."""
+    document = await document_service.get_by_id(document_id, user_id)
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+
+    context_service = ProjectContextService(db)
+    context = await context_service.build_project_context(
+        project_id=document.project_id,
+        user_id=user_id,
+    )
+
+    element_type = _infer_element_type(document) or "chapitre"
+    element_label = ELEMENT_TYPE_DEFS.get(element_type, {}).get("label", "Element")
+    mode = "rewrite" if (document.content or "").strip() else "write"
+    user_instructions = (payload.instructions or "").strip()
+    summary = (payload.summary or "").strip()
+    context_block = _format_context_block(
+        context,
+        focus="\n".join(part for part in (document.title, summary, user_instructions) if part),
+        anchor_index=document.order_index,
+    )
+    min_words = payload.min_word_count
+    max_words = payload.max_word_count
+    if min_words and max_words and max_words < min_words:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum word count must be greater than or equal to minimum word count",
+        )
+    metadata = document.document_metadata or {}
+    comments = _load_comments(metadata)
+    version_service = DocumentVersionService(db)
+    source_content = ""
+    source_version = None
+    if payload.source_version_id:
+        source = await version_service.get(document.id, payload.source_version_id)
+        source_text = await version_service.get_content(source) if source else ""
+        if not source_text:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Source version not found",
+            )
+        source_content = _source_excerpt(source_text)
+        source_version = source.version
+    if source_content:
+        mode = "rewrite"
+    chunk_word_target = 1200
+    max_iterations = 1
+    if min_words:
+        estimated = math.ceil(min_words / chunk_word_target)
+        max_iterations = min(24, max(1, estimated + 2))
+
+    comment_lines: list[str] = []
+    comment_ids: list[str] = []
+    selected_comment_ids = (
+        {str(cid) for cid in payload.comment_ids} if payload.comment_ids is not None else None
+    )
+    selected_comments = [
+        entry
+        for entry in comments
+        if isinstance(entry, dict)
+        and (selected_comment_ids is None or str(entry.get("id")) in selected_comment_ids)
+        and str(entry.get("content") or "").strip()
+    ]
+    if selected_comments:
+        version_lookup = await version_service.get_labels(
+            document.id,
+            {
+                version_id
+                for version_id in (_parse_uuid(entry.get("version_id")) for entry in selected_comments)
+                if version_id
+            },
+        )
+        for entry in selected_comments:
+            comment_id = entry.get("id")
+            content_text = str(entry.get("content") or "").strip()
+            if comment_id:
+                comment_ids.append(str(comment_id))
+            version_id = entry.get("version_id")
+            version_label = version_lookup.get(str(version_id)) if version_id else None
+            suffix = f" (version {version_label})" if version_label else ""
+            comment_lines.append(f"- {content_text}{suffix}")
+    comment_block = "\n".join(comment_lines)
+    if selected_comment_ids is not None and payload.comment_ids and not comment_lines:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Comment not found",
+        )
+
+    return {
+        "document": document,
+        "metadata": metadata,
+        "comments": comments,
+        "element_type": element_type,
+        "element_label": element_label,
+        "mode": mode,
+        "user_instructions": user_instructions,
+        "summary": summary,
+        "context_block": context_block,
+        "min_words": min_words,
+        "max_words": max_words,
+        "source_content": source_content,
+        "source_version": source_version,
+        "source_version_id": payload.source_version_id,
+        "comment_block": comment_block,
+        "comment_ids": comment_ids,
+        "chunk_word_target": chunk_word_target,
+        "max_iterations": max_iterations,
+    }
+
+
+def _build_iteration_messages(
+    plan: Dict[str, Any],
+    content: str,
+    current_words: int,
+) -> Optional[list[dict]]:
+    """Build the chat messages for the next iteration, or None when the targets are met."""
+    min_words = plan["min_words"]
+    max_words = plan["max_words"]
+    if min_words and current_words >= min_words:
+        return None
+    if max_words and current_words >= max_words:
+        return None
+    remaining_min = min_words - current_words if min_words else None
+    remaining_max = max_words - current_words if max_words else None
+    remaining = remaining_min if remaining_min is not None else remaining_max
+    if remaining_max is not None and remaining is not None:
+        remaining = min(remaining, remaining_max)
+    chunk_target = min(plan["chunk_word_target"], remaining) if remaining else None
+    if content:
+        excerpt = content[-1200:]
+        continuation_hint = (
+            "Last excerpt:\n"
+            f"{excerpt}\n"
+            "Continue from the excerpt without repeating earlier text."
+        )
+    else:
+        continuation_hint = "Start the element from the beginning."
+    prompt = _build_element_prompt(
+        mode=plan["mode"],
+        element_label=plan["element_label"],
+        element_type=plan["element_type"],
+        title=plan["document"].title,
+        summary=plan["summary"],
+        user_instructions=plan["user_instructions"],
+        comment_block=plan["comment_block"],
+        context_block=plan["context_block"],
+        min_words=min_words,
+        max_words=max_words,
+        current_words=current_words,
+        chunk_target=chunk_target,
+        continuation_hint=continuation_hint,
+        source_content=plan["source_content"],
+    )
+    return [
+        {"role": "system", "content": SYSTEM_WRITER_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _append_generated_part(
+    plan: Dict[str, Any],
+    content: str,
+    part: str,
+) -> tuple[str, int, bool]:
+    """Append a generated part and return (content, word count, finished)."""
+    part = (part or "").strip()
+    if not part:
+        return content, _count_words(content), True
+    content = f"{content}\n\n{part}" if content else part
+    current_words = _count_words(content)
+    max_words = plan["max_words"]
+    if max_words and current_words > max_words:
+        words = content.split()
+        return " ".join(words[:max_words]), max_words, True
+    if not plan["min_words"]:
+        return content, current_words, True
+    return content, current_words, False
+
+
+def _llm_error_to_http(exc: Exception) -> HTTPException:
+    if isinstance(exc, ReadTimeout):
+        return HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Generation timed out. Try a smaller minimum word count or retry.",
+        )
+    return HTTPException(
+        status_code=status.HTTP_502_BAD_GATEWAY,
+        detail=str(exc),
+    )
+
+
+async def _persist_element_version(
+    *,
+    document_service: DocumentService,
+    version_service: DocumentVersionService,
+    plan: Dict[str, Any],
+    content: str,
+    user_id: UUID,
+) -> tuple[Document, DocumentVersion]:
+    """Store the generated content as a new version and return (document, version)."""
+    document = plan["document"]
+    metadata = plan["metadata"]
+    comments = plan["comments"]
+    comment_ids = plan["comment_ids"]
+    min_words = plan["min_words"]
+    max_words = plan["max_words"]
+    summary = plan["summary"]
+
+    latest = await version_service.get_latest(document.id)
+    latest_version = latest.version if latest else None
+    if latest is None and (document.content or "").strip():
+        await version_service.create_base_version(document)
+        latest_version = "v1"
+    next_version = next_version_label(latest_version)
+
+    if plan["source_content"]:
+        source_type = "commented_rewrite" if plan["comment_block"] else "rewrite"
+    else:
+        source_type = "commented_generate" if plan["comment_block"] else "generate"
+
+    version = await version_service.add(
+        document.id,
+        version=next_version,
+        content=content.strip(),
+        word_count=_count_words(content),
+        min_word_count=min_words,
+        max_word_count=max_words,
+        summary=summary or None,
+        instructions=plan["user_instructions"] or None,
+        source_version_id=plan["source_version_id"],
+        source_version=plan["source_version"],
+        source_type=source_type,
+        source_comment_ids=comment_ids or None,
+    )
+    version_id = str(version.id)
+
+    if comment_ids:
+        for entry in comments:
+            if not isinstance(entry, dict):
+                continue
+            entry_id = entry.get("id")
+            if not entry_id or str(entry_id) not in comment_ids:
+                continue
+            applied = entry.get("applied_version_ids")
+            applied_list = applied if isinstance(applied, list) else []
+            if version_id not in applied_list:
+                applied_list.append(version_id)
+            entry["applied_version_ids"] = applied_list
+
+    metadata_updates = {
+        **(metadata if isinstance(metadata, dict) else {}),
+        "current_version": next_version,
+        "comments": comments,
+    }
+    if min_words is not None:
+        metadata_updates["min_word_count"] = min_words
+    if max_words is not None:
+        metadata_updates["max_word_count"] = max_words
+    if summary:
+        metadata_updates["summary"] = summary
+
+    update_payload = DocumentUpdate(content=content.strip(), metadata=metadata_updates)
+
+    updated = await document_service.update(
+        document.id,
+        update_payload,
+        user_id,
+    )
+    return updated, version
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.get("/", response_model=Union[DocumentList, DocumentSummaryList])
 async def list_documents(
     project_id: UUID = Query(..., description="Project ID to filter documents"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    view: Literal["full", "summary"] = Query("full", description="summary: preview and essential metadata only"),
+    preview_chars: int = Query(280, ge=0, le=2000),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -390,8 +647,20 @@ async def list_documents(
     - **project_id**: Project ID (required)
     - **skip**: Number of records to skip (pagination)
     - **limit**: Maximum number of records to return (max 100)
+    - **view**: `full` (default) or `summary` (no content, `content_preview` instead)
+    - **preview_chars**: Preview length in summary view
     """
     document_service = DocumentService(db)
+    if view == "summary":
+        rows, total = await document_service.get_summaries_by_project(
+            project_id=project_id,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            preview_chars=preview_chars,
+        )
+        return DocumentSummaryList(documents=rows, total=total)
+
     documents, total = await document_service.get_all_by_project(
         project_id=project_id,
         user_id=current_user.id,
@@ -425,6 +694,8 @@ async def create_document(
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -432,6 +703,7 @@ async def get_document(
     Get a specific document by ID.
 
     Returns 404 if document not found or user doesn't have access.
+    Supports If-None-Match: an unchanged document is answered with 304.
     """
     document_service = DocumentService(db)
     document = await document_service.get_by_id(document_id, current_user.id)
@@ -442,17 +714,24 @@ async def get_document(
             detail="Document not found"
         )
 
+    metadata = document.document_metadata if isinstance(document.document_metadata, dict) else {}
+    etag = make_etag(document.id, document.updated_at, metadata.get("current_version"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_cache_headers(response, etag)
     return document
 
 
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: UUID,
+    export_format: Literal["markdown", "epub", "docx"] = Query("markdown", alias="format"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
-    Download a single document as a markdown file.
+    Download a single document as a markdown, EPUB or DOCX file.
     """
     document_service = DocumentService(db)
     document = await document_service.get_by_id(document_id, current_user.id)
@@ -463,6 +742,22 @@ async def download_document(
         )
 
     title = document.title or "document"
+    if export_format != "markdown":
+        media_type, extension = EXPORT_FORMATS[export_format]
+        path = await ExportService(db).build(
+            export_format,
+            document.id,
+            title,
+            None,
+            Document.id == document.id,
+            show_title=False,
+        )
+        return FileResponse(
+            path,
+            media_type=media_type,
+            filename=f"{_safe_filename(title, 'document')}{extension}",
+        )
+
     filename = f"{_safe_filename(title, 'document')}.md"
     content_parts = []
     if document.title:
@@ -541,6 +836,9 @@ async def create_element(
             )
         _validate_parent_child(parent, element_type)
 
+    # Held until get_db commits the request transaction (DocumentService.create only flushes),
+    # so concurrent calls get distinct indexes
+    await _lock_project_elements(db, payload.project_id)
     element_index = await _get_next_element_index(db, payload.project_id, element_type)
     order_index = await _get_next_order_index(db, payload.project_id)
     element_label = ELEMENT_TYPE_DEFS[element_type]["label"]
@@ -567,250 +865,207 @@ async def create_element(
     return document
 
 
-@router.post("/{document_id}/generate", response_model=DocumentResponse)
-async def generate_element(
+async def run_element_generation(
+    *,
+    db: AsyncSession,
     document_id: UUID,
     payload: ElementGenerateRequest,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-):
+    user_id: UUID,
+    on_progress: Optional[Callable[[int, int, int], Awaitable[None]]] = None,
+) -> tuple[Document, DocumentVersion]:
     """
-    Generate or rewrite an element based on project context and instructions.
+    Run the iterative generation of an element and persist it as a new version.
+
+    Shared by the synchronous endpoint and the background job worker.
+    `on_progress(iteration, max_iterations, word_count)` is awaited after each part.
     """
     document_service = DocumentService(db)
-    document = await document_service.get_by_id(document_id, current_user.id)
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
-
-    context_service = ProjectContextService(db)
-    context = await context_service.build_project_context(
-        project_id=document.project_id,
-        user_id=current_user.id,
+    plan = await _prepare_element_generation(
+        db=db,
+        document_service=document_service,
+        document_id=document_id,
+        payload=payload,
+        user_id=user_id,
     )
 
-    element_type = _infer_element_type(document) or "chapitre"
-    element_label = ELEMENT_TYPE_DEFS.get(element_type, {}).get("label", "Element")
-    mode = "rewrite" if (document.content or "").strip() else "write"
-    user_instructions = (payload.instructions or "").strip()
-    summary = (payload.summary or "").strip()
-    context_block = _format_context_block(context)
-    min_words = payload.min_word_count
-    max_words = payload.max_word_count
-    if min_words and max_words and max_words < min_words:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum word count must be greater than or equal to minimum word count",
-        )
-    metadata = document.document_metadata or {}
-    versions = _load_versions(metadata)
-    comments = _load_comments(metadata)
-    source_content, source_version = _get_source_content(versions, payload.source_version_id)
-    if payload.source_version_id and not source_content:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source version not found",
-        )
-    if source_content:
-        mode = "rewrite"
-    chunk_word_target = 1200
-    max_iterations = 1
-    if min_words:
-        estimated = math.ceil(min_words / chunk_word_target)
-        max_iterations = min(24, max(1, estimated + 2))
-
-    comment_lines: list[str] = []
-    comment_ids: list[str] = []
-    selected_comment_ids = (
-        {str(cid) for cid in payload.comment_ids} if payload.comment_ids is not None else None
-    )
-    if comments:
-        version_lookup = {
-            str(entry.get("id")): entry.get("version")
-            for entry in versions
-            if isinstance(entry, dict) and entry.get("id")
-        }
-        for entry in comments:
-            if not isinstance(entry, dict):
-                continue
-            comment_id = entry.get("id")
-            if selected_comment_ids is not None and str(comment_id) not in selected_comment_ids:
-                continue
-            content_text = str(entry.get("content") or "").strip()
-            if not content_text:
-                continue
-            if comment_id:
-                comment_ids.append(str(comment_id))
-            version_id = entry.get("version_id")
-            version_label = version_lookup.get(str(version_id)) if version_id else None
-            suffix = f" (version {version_label})" if version_label else ""
-            comment_lines.append(f"- {content_text}{suffix}")
-    comment_block = "\n".join(comment_lines)
-    if selected_comment_ids is not None and payload.comment_ids and not comment_lines:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Comment not found",
-        )
-
     llm_client = DeepSeekClient()
     content = ""
     current_words = 0
-    for _ in range(max_iterations):
-        if min_words and current_words >= min_words:
-            break
-        if max_words and current_words >= max_words:
+    max_iterations = plan["max_iterations"]
+    for iteration in range(1, max_iterations + 1):
+        messages = _build_iteration_messages(plan, content, current_words)
+        if messages is None:
             break
-        remaining_min = min_words - current_words if min_words else None
-        remaining_max = max_words - current_words if max_words else None
-        remaining = remaining_min if remaining_min is not None else remaining_max
-        if remaining_max is not None and remaining is not None:
-            remaining = min(remaining, remaining_max)
-        chunk_target = min(chunk_word_target, remaining) if remaining else None
-        if content:
-            excerpt = content[-1200:]
-            continuation_hint = (
-                "Last excerpt:\n"
-                f"{excerpt}\n"
-                "Continue from the excerpt without repeating earlier text."
-            )
-        else:
-            continuation_hint = "Start the element from the beginning."
-        prompt = _build_element_prompt(
-            mode=mode,
-            element_label=element_label,
-            element_type=element_type,
-            title=document.title,
-            summary=summary,
-            user_instructions=user_instructions,
-            comment_block=comment_block,
-            context_block=context_block,
-            min_words=min_words,
-            max_words=max_words,
-            current_words=current_words,
-            chunk_target=chunk_target,
-            continuation_hint=continuation_hint,
-            source_content=source_content,
-        )
         try:
             part = await llm_client.chat(
-                messages=[
-                    {"role": "system", "content": "You are THOTH, a French literary writing assistant."},
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 temperature=0.7,
                 max_tokens=max(1, settings.CHAT_MAX_TOKENS),
             )
-        except ReadTimeout as exc:
-            raise HTTPException(
-                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-                detail="Generation timed out. Try a smaller minimum word count or retry.",
-            ) from exc
-        except RuntimeError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=str(exc),
-            ) from exc
-        part = (part or "").strip()
-        if not part:
-            break
-        content = f"{content}\n\n{part}" if content else part
-        current_words = _count_words(content)
-        if max_words and current_words > max_words:
-            words = content.split()
-            content = " ".join(words[:max_words])
-            current_words = max_words
-            break
-        if not min_words:
+        except (ReadTimeout, RuntimeError) as exc:
+            raise _llm_error_to_http(exc) from exc
+        content, current_words, finished = _append_generated_part(plan, content, part)
+        if on_progress:
+            await on_progress(iteration, max_iterations, current_words)
+        if finished:
             break
 
-    current_version = metadata.get("current_version") if isinstance(metadata, dict) else None
-    existing_content = (document.content or "").strip()
-    if not versions and existing_content:
-        base_version = "v1"
-        versions.append(
-            {
-                "id": str(uuid4()),
-                "version": base_version,
-                "created_at": datetime.utcnow().isoformat(),
-                "content": existing_content,
-                "word_count": _count_words(existing_content),
-                "min_word_count": metadata.get("min_word_count"),
-                "max_word_count": metadata.get("max_word_count"),
-                "summary": metadata.get("summary"),
-                "instructions": None,
-                "source_type": None,
-                "source_comment_ids": None,
-            }
-        )
-        current_version = base_version
+    return await _persist_element_version(
+        document_service=document_service,
+        version_service=DocumentVersionService(db),
+        plan=plan,
+        content=content,
+        user_id=user_id,
+    )
 
-    if versions:
-        last_version = versions[-1].get("version") if isinstance(versions[-1], dict) else current_version
-        major, minor = _parse_version(str(last_version))
-        minor = minor + 1 if minor >= 0 else 1
-        next_version = _format_version(major, minor)
-    else:
-        next_version = "v1"
 
-    if source_content:
-        source_type = "commented_rewrite" if comment_lines else "rewrite"
-    else:
-        source_type = "commented_generate" if comment_lines else "generate"
+@router.post("/{document_id}/generate", response_model=DocumentResponse)
+async def generate_element(
+    document_id: UUID,
+    payload: ElementGenerateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Generate or rewrite an element based on project context and instructions.
+    """
+    updated, _ = await run_element_generation(
+        db=db,
+        document_id=document_id,
+        payload=payload,
+        user_id=current_user.id,
+    )
+    return updated
 
-    version_id = str(uuid4())
-    version_entry = {
-        "id": version_id,
-        "version": next_version,
-        "created_at": datetime.utcnow().isoformat(),
-        "content": content.strip(),
-        "word_count": _count_words(content),
-        "min_word_count": min_words,
-        "max_word_count": max_words,
-        "summary": summary or None,
-        "instructions": user_instructions or None,
-        "source_version_id": str(payload.source_version_id) if payload.source_version_id else None,
-        "source_version": source_version,
-        "source_type": source_type,
-        "source_comment_ids": comment_ids or None,
-    }
-    versions.append(version_entry)
 
-    if comment_ids:
-        for entry in comments:
-            if not isinstance(entry, dict):
-                continue
-            entry_id = entry.get("id")
-            if not entry_id or str(entry_id) not in comment_ids:
-                continue
-            applied = entry.get("applied_version_ids")
-            applied_list = applied if isinstance(applied, list) else []
-            if version_id not in applied_list:
-                applied_list.append(version_id)
-            entry["applied_version_ids"] = applied_list
+@router.post(
+    "/{document_id}/generate/jobs",
+    response_model=JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_element_job(
+    document_id: UUID,
+    payload: ElementGenerateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Queue the generation of an element as a background job.
 
-    metadata_updates = {
-        **(metadata if isinstance(metadata, dict) else {}),
-        "versions": versions,
-        "current_version": next_version,
-        "comments": comments,
-    }
-    if min_words is not None:
-        metadata_updates["min_word_count"] = min_words
-    if max_words is not None:
-        metadata_updates["max_word_count"] = max_words
-    if summary:
-        metadata_updates["summary"] = summary
+    Poll `GET /jobs/{id}` for progress and `GET /jobs/{id}/result` once finished.
+    """
+    document_service = DocumentService(db)
+    document = await document_service.get_by_id(document_id, current_user.id)
+    if not document:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-    update_payload = DocumentUpdate(content=content.strip(), metadata=metadata_updates)
+    job_service = JobService(db)
+    job = await job_service.create(
+        JobType.GENERATE_ELEMENT,
+        user_id=current_user.id,
+        project_id=document.project_id,
+        params={
+            "document_id": str(document_id),
+            "payload": payload.model_dump(mode="json"),
+        },
+    )
+    await job_service.enqueue(job, generate_element_task)
+    return job
 
-    updated = await document_service.update(
-        document_id,
-        update_payload,
-        current_user.id,
+
+@router.post("/{document_id}/generate/stream")
+async def generate_element_stream(
+    document_id: UUID,
+    payload: ElementGenerateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream the generation of an element as Server-Sent Events.
+
+    Events: `token` (content delta), `progress` (iteration and word count),
+    `done` (persisted document and version) and `error`.
+    """
+    plan = await _prepare_element_generation(
+        db=db,
+        document_service=DocumentService(db),
+        document_id=document_id,
+        payload=payload,
+        user_id=current_user.id,
+    )
+    user_id = current_user.id
+
+    async def event_stream():
+        llm_client = DeepSeekClient()
+        content = ""
+        current_words = 0
+        max_iterations = plan["max_iterations"]
+        try:
+            for iteration in range(1, max_iterations + 1):
+                messages = _build_iteration_messages(plan, content, current_words)
+                if messages is None:
+                    break
+                parts: list[str] = []
+                async for delta in llm_client.stream_chat(
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max(1, settings.CHAT_MAX_TOKENS),
+                ):
+                    parts.append(delta)
+                    yield _sse_event("token", {"iteration": iteration, "text": delta})
+                content, current_words, finished = _append_generated_part(plan, content, "".join(parts))
+                yield _sse_event(
+                    "progress",
+                    {
+                        "iteration": iteration,
+                        "max_iterations": max_iterations,
+                        "word_count": current_words,
+                        "min_word_count": plan["min_words"],
+                        "max_word_count": plan["max_words"],
+                    },
+                )
+                if finished:
+                    break
+
+            # The request-scoped session is released before the body is streamed,
+            # so the final version is persisted with a dedicated session.
+            async with AsyncSessionLocal() as session:
+                updated, version = await _persist_element_version(
+                    document_service=DocumentService(session),
+                    version_service=DocumentVersionService(session),
+                    plan=plan,
+                    content=content,
+                    user_id=user_id,
+                )
+                await commit(session)
+                document_payload = DocumentResponse.model_validate(updated).model_dump(
+                    mode="json",
+                    by_alias=True,
+                )
+            yield _sse_event(
+                "done",
+                {
+                    "document": document_payload,
+                    "version_id": str(version.id),
+                    "version": version.version,
+                    "word_count": version.word_count,
+                },
+            )
+        except (ReadTimeout, RuntimeError) as exc:
+            error = _llm_error_to_http(exc)
+            yield _sse_event("error", {"status_code": error.status_code, "detail": error.detail})
+        except HTTPException as exc:
+            yield _sse_event("error", {"status_code": exc.status_code, "detail": exc.detail})
+        except Exception:
+            # Headers are already sent: report as an event what generate_element would return as a 500
+            logger.exception(f"Streamed generation failed for document {document_id}")
+            yield _sse_event("error", {"status_code": 500, "detail": "Internal server error"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return updated
 
 
 @router.post("/{document_id}/versions", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
@@ -830,72 +1085,46 @@ async def create_document_version(
     if not content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Content is required")
 
+    version_service = DocumentVersionService(db)
     metadata = document.document_metadata or {}
-    versions = _load_versions(metadata)
     current_version = metadata.get("current_version") if isinstance(metadata, dict) else None
-    existing_content = (document.content or "").strip()
-    if not versions and existing_content:
-        base_version = "v1"
-        versions.append(
-            {
-                "id": str(uuid4()),
-                "version": base_version,
-                "created_at": datetime.utcnow().isoformat(),
-                "content": existing_content,
-                "word_count": _count_words(existing_content),
-                "min_word_count": metadata.get("min_word_count"),
-                "max_word_count": metadata.get("max_word_count"),
-                "summary": metadata.get("summary"),
-                "instructions": None,
-                "source_type": None,
-                "source_comment_ids": None,
-            }
-        )
-        current_version = base_version
+    latest = await version_service.get_latest(document_id)
+    latest_version = latest.version if latest else None
+    if latest is None and (document.content or "").strip():
+        await version_service.create_base_version(document)
+        latest_version = current_version = "v1"
 
     source_version_id: Optional[UUID] = payload.source_version_id
     if source_version_id:
-        source_version = _get_version_label(versions, source_version_id)
+        source_version = (await version_service.get_labels(document_id, [source_version_id])).get(
+            str(source_version_id)
+        )
         if not source_version:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Source version not found")
     else:
         source_version = None
-        if current_version:
-            for entry in versions:
-                if isinstance(entry, dict) and str(entry.get("version")) == str(current_version):
-                    source_version_id = UUID(str(entry.get("id")))
-                    source_version = entry.get("version")
-                    break
+        current = await version_service.find_by_label(document_id, current_version) if current_version else None
+        if current:
+            source_version_id = current.id
+            source_version = current.version
 
-    if versions:
-        last_version = versions[-1].get("version") if isinstance(versions[-1], dict) else current_version
-        major, minor = _parse_version(str(last_version))
-        minor = minor + 1 if minor >= 0 else 1
-        next_version = _format_version(major, minor)
-    else:
-        next_version = "v1"
-
-    version_entry = {
-        "id": str(uuid4()),
-        "version": next_version,
-        "created_at": datetime.utcnow().isoformat(),
-        "content": content,
-        "word_count": _count_words(content),
-        "min_word_count": metadata.get("min_word_count"),
-        "max_word_count": metadata.get("max_word_count"),
-        "summary": metadata.get("summary"),
-        "instructions": None,
-        "source_version_id": str(source_version_id) if source_version_id else None,
-        "source_version": source_version,
-        "source_type": "manual_edit",
-        "source_comment_ids": None,
-        "edited_by": str(current_user.id),
-    }
-    versions.append(version_entry)
+    next_version = next_version_label(latest_version)
+    await version_service.add(
+        document_id,
+        version=next_version,
+        content=content,
+        word_count=_count_words(content),
+        min_word_count=metadata.get("min_word_count"),
+        max_word_count=metadata.get("max_word_count"),
+        summary=metadata.get("summary"),
+        source_version_id=source_version_id,
+        source_version=source_version,
+        source_type="manual_edit",
+        edited_by=current_user.id,
+    )
 
     metadata_updates = {
         **(metadata if isinstance(metadata, dict) else {}),
-        "versions": versions,
         "current_version": next_version,
     }
 
@@ -910,53 +1139,101 @@ async def create_document_version(
 @router.get("/{document_id}/versions", response_model=DocumentVersionList)
 async def list_document_versions(
     document_id: UUID,
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (every version when omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    order: Literal["asc", "desc"] = Query("asc", description="asc: oldest first, desc: newest first"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List all versions for a document."""
+    """
+    List versions for a document (without their content).
+
+    Keyset-paginated with `limit` and `cursor` (created_at, id), so a page costs the
+    same whatever the length of the history. Read-only: a document with content but
+    no stored history lists a virtual "v1", created on the next write that needs it.
+    Supports If-None-Match: the ETag changes with the document and its latest version.
+    """
     document_service = DocumentService(db)
-    document = await document_service.get_by_id(document_id, current_user.id)
-    if not document:
+    header = await document_service.get_history_header(document_id, current_user.id)
+    if not header:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-    metadata = document.document_metadata or {}
-    versions, current_version = await _ensure_versions_for_document(
-        document=document,
-        document_service=document_service,
-        user_id=current_user.id,
+    version_service = DocumentVersionService(db)
+    latest = await version_service.get_latest(document_id)
+    virtual_base = latest is None and header.has_content
+    current_version = (header.current_version or "v1") if virtual_base else header.current_version
+    etag = make_etag(header.id, header.updated_at, current_version, latest.id if latest else virtual_base)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_cache_headers(response, etag)
+
+    if latest is None:
+        versions = []
+        if virtual_base and not cursor:
+            versions.append(DocumentVersionSummary(**base_version_summary(header), is_current=current_version == "v1"))
+        return DocumentVersionList(versions=versions, total=1 if virtual_base else 0)
+
+    rows = await version_service.list_summaries(
+        document_id,
+        limit=limit + 1 if limit else None,
+        after=_parse_version_cursor(cursor) if cursor else None,
+        descending=order == "desc",
     )
-    serialized: list[DocumentVersionSummary] = []
-    for entry in versions:
-        payload = _serialize_version(entry, current_version, include_content=False)
-        if not payload:
-            continue
-        serialized.append(DocumentVersionSummary(**payload))
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at.isoformat(), str(rows[-1].id))
+    serialized = [DocumentVersionSummary(**_serialize_version(row, current_version)) for row in rows]
 
-    return DocumentVersionList(versions=serialized, total=len(serialized))
+    # A complete first page already holds the total
+    total = len(serialized) if not cursor and next_cursor is None else await version_service.count(document_id)
+    return DocumentVersionList(versions=serialized, total=total, next_cursor=next_cursor)
 
 
 @router.get("/{document_id}/comments", response_model=DocumentCommentList)
 async def list_document_comments(
     document_id: UUID,
+    limit: Optional[int] = Query(None, ge=1, le=200, description="Page size (every comment when omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    order: Literal["asc", "desc"] = Query("asc", description="asc: oldest first, desc: newest first"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """List comments for a document."""
+    """
+    List comments for a document.
+
+    Keyset-paginated with `limit` and `cursor` (created_at, id); the page is cut in
+    SQL so the rest of the metadata is never loaded. `total` is the number of
+    stored comment entries.
+    """
     document_service = DocumentService(db)
-    document = await document_service.get_by_id(document_id, current_user.id)
-    if not document:
+    header = await document_service.get_history_header(document_id, current_user.id)
+    if not header:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-    metadata = document.document_metadata or {}
-    comments = _load_comments(metadata)
+    entries = await document_service.list_comments(
+        document_id,
+        limit=limit + 1 if limit else None,
+        after=tuple(decode_cursor(cursor, 2)) if cursor else None,
+        descending=order == "desc",
+    )
+    next_cursor = None
+    if limit and len(entries) > limit:
+        entries = entries[:limit]
+        last = entries[-1] if isinstance(entries[-1], dict) else {}
+        next_cursor = encode_cursor(str(last.get("created_at") or ""), str(last.get("id") or ""))
+
     serialized: list[DocumentComment] = []
-    for entry in comments:
+    for entry in entries:
         payload = _serialize_comment(entry)
         if not payload:
             continue
         serialized.append(DocumentComment(**payload))
 
-    return DocumentCommentList(comments=serialized, total=len(serialized))
+    return DocumentCommentList(comments=serialized, total=header.comment_count, next_cursor=next_cursor)
 
 
 @router.post("/{document_id}/comments", response_model=DocumentComment, status_code=status.HTTP_201_CREATED)
@@ -976,15 +1253,17 @@ async def create_document_comment(
     if not content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Comment content is required")
 
-    metadata = document.document_metadata or {}
-    versions, current_version = await _ensure_versions_for_document(
+    version_service = DocumentVersionService(db)
+    await _ensure_versions_for_document(
         document=document,
         document_service=document_service,
+        version_service=version_service,
         user_id=current_user.id,
     )
-    if payload.version_id and not _get_version_label(versions, payload.version_id):
+    if payload.version_id and not await version_service.get_labels(document_id, [payload.version_id]):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
 
+    metadata = document.document_metadata or {}
     comments = _load_comments(metadata)
 
     comment_entry = {
@@ -1001,10 +1280,6 @@ async def create_document_comment(
         **(metadata if isinstance(metadata, dict) else {}),
         "comments": comments,
     }
-    if versions:
-        metadata_updates["versions"] = versions
-    if current_version:
-        metadata_updates["current_version"] = current_version
     await document_service.update(
         document_id,
         DocumentUpdate(metadata=metadata_updates),
@@ -1021,27 +1296,58 @@ async def create_document_comment(
 async def get_document_version(
     document_id: UUID,
     version_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Get a specific version for a document."""
+    """
+    Get a specific version for a document.
+
+    The content of a stored version never changes, but is_current does when a newer
+    version is written, so the response is revalidated: its ETag covers the version
+    and whether it is current, and If-None-Match is answered with 304 before the
+    content is loaded or rebuilt. The virtual "v1" of a document without stored
+    history is read-only and revalidated the same way.
+    """
     document_service = DocumentService(db)
-    document = await document_service.get_by_id(document_id, current_user.id)
-    if not document:
+    header = await document_service.get_history_header(document_id, current_user.id)
+    if not header:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found")
 
-    metadata = document.document_metadata or {}
-    versions, current_version = await _ensure_versions_for_document(
-        document=document,
-        document_service=document_service,
-        user_id=current_user.id,
-    )
-    for entry in versions:
-        if str(entry.get("id")) != str(version_id):
-            continue
-        payload = _serialize_version(entry, current_version, include_content=True)
-        if not payload:
-            break
-        return DocumentVersionResponse(**payload)
+    version_service = DocumentVersionService(db)
+    labels = await version_service.get_labels(document_id, [version_id])
+    if str(version_id) not in labels:
+        if (
+            version_id != base_version_id(document_id)
+            or not header.has_content
+            or await version_service.get_latest(document_id)
+        ):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
+        # Virtual "v1": the document's current text, which can still change until it is stored
+        current_version = header.current_version or "v1"
+        etag = make_etag(version_id, header.updated_at, current_version)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        content = await db.scalar(select(Document.content).where(Document.id == document_id))
+        set_cache_headers(response, etag)
+        return DocumentVersionResponse(
+            **base_version_summary(header),
+            is_current=current_version == "v1",
+            content=(content or "").strip(),
+        )
+
+    current_version = header.current_version
+    etag = make_etag(version_id, labels[str(version_id)] == current_version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
+    version = await version_service.get(document_id, version_id)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
 
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
+    content = await version_service.get_content(version)
+    set_cache_headers(response, etag)
+    return DocumentVersionResponse(**_serialize_version(version, current_version, content))
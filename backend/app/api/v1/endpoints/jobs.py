@@ -0,0 +1,113 @@
+"""Background jobs endpoints"""
+from typing import Optional
+from uuid import UUID
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.models.user import User
+from app.models.job import JobStatus
+from app.schemas.job import JobResponse, JobList, JobResultResponse
+from app.services.job_service import JobService
+from app.core.celery_app import celery_app
+from app.core.security import get_current_active_user
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/", response_model=JobList)
+async def list_jobs(
+    project_id: Optional[UUID] = Query(None, description="Optional project ID filter"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get background jobs for the current user, most recent first.
+
+    - **project_id**: Optional project ID to filter jobs
+    - **skip**: Number of records to skip (pagination)
+    - **limit**: Maximum number of records to return (max 100)
+    """
+    job_service = JobService(db)
+    jobs, total = await job_service.get_all_by_user(
+        user_id=current_user.id,
+        project_id=project_id,
+        skip=skip,
+        limit=limit,
+    )
+    return JobList(jobs=jobs, total=total)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get the status and progress of a job.
+
+    Returns 404 if job not found or user doesn't have access.
+    """
+    job_service = JobService(db)
+    job = await job_service.get_by_id(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}/result", response_model=JobResultResponse)
+async def get_job_result(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get the result of a succeeded job.
+
+    Returns 409 while the job is still pending/running or if it did not succeed.
+    """
+    job_service = JobService(db)
+    job = await job_service.get_by_id(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}, no result available",
+        )
+    return JobResultResponse(
+        id=job.id,
+        job_type=job.job_type,
+        status=job.status,
+        result=job.result or {},
+    )
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Cancel a pending or running job.
+
+    Pending jobs are revoked from the queue; running jobs stop at their next checkpoint
+    (between chapters or generation iterations).
+    """
+    job_service = JobService(db)
+    job = await job_service.cancel(job_id, current_user.id)
+
+    if job.celery_task_id:
+        try:
+            celery_app.control.revoke(job.celery_task_id)
+        except Exception as exc:
+            logger.warning(f"Failed to revoke task {job.celery_task_id}: {exc}")
+
+    return job
@@ -1,15 +1,17 @@
 """Projects endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from typing import AsyncIterator, List, Literal
 from uuid import UUID, uuid4
 from datetime import datetime
 import re
 import unicodedata
+import zlib
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, AsyncSessionLocal
 from app.models.user import User
 from app.models.document import Document
 from app.schemas.project import (
@@ -26,6 +28,9 @@ from app.schemas.instruction import (
     InstructionList,
 )
 from app.services.project_service import ProjectService
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.context_cache import mark_project_stale
+from app.core.http_cache import make_etag, not_modified, set_cache_headers
 from app.core.security import get_current_active_user
 
 router = APIRouter()
@@ -118,6 +123,8 @@ async def create_project(
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
@@ -125,6 +132,7 @@ async def get_project(
     Get a specific project by ID.
 
     Returns 404 if project not found or user doesn't have access.
+    Supports If-None-Match: an unchanged project is answered with 304.
     """
     project_service = ProjectService(db)
     project = await project_service.get_by_id(project_id, current_user.id)
@@ -135,50 +143,109 @@ async def get_project(
             detail="Project not found"
         )
 
+    # current_word_count is reconciled without touching updated_at
+    etag = make_etag(project.id, project.updated_at, project.current_word_count)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    set_cache_headers(response, etag)
     return project
 
 
 @router.get("/{project_id}/download")
 async def download_project(
     project_id: UUID,
+    export_format: Literal["markdown", "epub", "docx"] = Query("markdown", alias="format"),
+    gzip: bool = Query(False, description="Download a gzip-compressed file (.md.gz, markdown only)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """
-    Download all project elements in order as a markdown file.
+    Download all project elements in order as a markdown, EPUB or DOCX file.
+
+    Markdown is streamed: documents are read through a server-side cursor
+    (title and content only, EXPORT_DOCUMENT_BATCH_SIZE rows at a time) and
+    written out as they arrive, so memory stays flat whatever the project size.
+    EPUB and DOCX files are built in worker processes and cached on disk.
     """
     project_service = ProjectService(db)
     project = await project_service.get_by_id(project_id, current_user.id)
     if not project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
 
-    documents_result = await db.execute(
-        select(Document).where(Document.project_id == project_id).order_by(Document.order_index.asc())
-    )
-    documents = documents_result.scalars().all()
+    if export_format != "markdown":
+        media_type, extension = EXPORT_FORMATS[export_format]
+        path = await ExportService(db).build(
+            export_format,
+            project.id,
+            project.title or "Projet",
+            project.description,
+            Document.project_id == project_id,
+        )
+        return FileResponse(
+            path,
+            media_type=media_type,
+            filename=f"{_safe_filename(project.title or 'project', 'project')}{extension}",
+        )
 
-    parts: list[str] = []
+    header: list[str] = []
     if project.title:
-        parts.append(f"# {project.title}")
+        header.append(f"# {project.title}")
     if project.description:
-        parts.append(project.description)
-
-    for doc in documents:
-        if doc.title:
-            parts.append(f"## {doc.title}")
-        if doc.content:
-            parts.append(doc.content)
+        header.append(project.description)
 
-    payload = "\n\n".join(parts)
     filename = f"{_safe_filename(project.title or 'project', 'project')}.md"
-
-    return Response(
-        content=payload,
-        media_type="text/markdown; charset=utf-8",
+    media_type = "text/markdown; charset=utf-8"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _stream_markdown(project_id, header, gzip),
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
+async def _markdown_parts(project_id: UUID, header: list[str]) -> AsyncIterator[str]:
+    for part in header:
+        yield part
+
+    # The request-scoped session is released before the body is streamed
+    async with AsyncSessionLocal() as session:
+        stream = await session.stream(
+            select(Document.title, Document.content)
+            .where(Document.project_id == project_id)
+            .order_by(Document.order_index.asc())
+            .execution_options(yield_per=settings.EXPORT_DOCUMENT_BATCH_SIZE)
+        )
+        try:
+            async for doc in stream:
+                if doc.title:
+                    yield f"## {doc.title}"
+                if doc.content:
+                    yield doc.content
+        finally:
+            await stream.close()
+
+
+async def _stream_markdown(project_id: UUID, header: list[str], gzip: bool) -> AsyncIterator[bytes]:
+    # wbits=31: gzip container instead of raw zlib
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    separator = ""
+    async for part in _markdown_parts(project_id, header):
+        chunk = f"{separator}{part}".encode("utf-8")
+        separator = "\n\n"
+        if compressor is None:
+            yield chunk
+        else:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+    if compressor is not None:
+        yield compressor.flush()
+
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: UUID,
@@ -297,8 +364,8 @@ async def create_instruction(
     instructions = _load_instructions(project)
     instructions.append(instruction)
     _save_instructions(project, instructions)
-    await db.commit()
-    await db.refresh(project)
+    mark_project_stale(db, project.id)
+    await db.flush()
 
     return _serialize_instruction(instruction)
 
@@ -334,8 +401,8 @@ async def update_instruction(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instruction not found")
 
     _save_instructions(project, instructions)
-    await db.commit()
-    await db.refresh(project)
+    mark_project_stale(db, project.id)
+    await db.flush()
     return _serialize_instruction(updated)
 
 
@@ -362,6 +429,6 @@ async def delete_instruction(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Instruction not found")
 
     _save_instructions(project, filtered)
-    await db.commit()
-    await db.refresh(project)
+    mark_project_stale(db, project.id)
+    await db.flush()
     return None
@@ -11,7 +11,8 @@ from app.models.user import User
 from app.models.project import Project
 from app.models.document import Document, DocumentType
 from app.core.security import get_current_active_user
-from app.services.file_processor import FileProcessor
+from app.core.config import settings
+from app.services.file_processor import FileProcessor, FileTooLargeError
 from app.services.document_service import DocumentService
 from app.schemas.document import DocumentCreate
 from app.schemas.upload import UploadResponse
@@ -39,7 +40,7 @@ async def upload_file(
     Upload and process a document file.
 
     Supported formats: TXT, DOCX, PDF, MD
-    Maximum file size: 10 MB
+    Maximum file size: MAX_UPLOAD_SIZE (10 MB by default), enforced while the body is received
 
     Args:
         file: The file to upload
@@ -63,16 +64,25 @@ async def upload_file(
                 detail="Project not found or access denied"
             )
 
-        # Read file content
         if not file.filename:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Filename is required"
             )
-        file_content = await file.read()
+        if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / (1024 * 1024):.0f} MB"
+            )
 
-        # Process file
-        content, _ = await FileProcessor.process_file(file.filename, file_content)
+        # Copy the spooled upload to disk in chunks and parse it in a worker process
+        try:
+            content, _ = await FileProcessor.process_file(file.filename, file.file)
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=str(e)
+            )
 
         # Create document
         title = (document_title or file.filename).strip()
@@ -3,12 +3,10 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.db.session import get_db
 from app.models.user import User
-from app.models.project import Project
-from app.models.document import Document
+from app.models.job import JobType
 from app.core.security import get_current_active_user
 from app.schemas.writing import (
     IndexProjectRequest,
@@ -18,18 +16,19 @@ from app.schemas.writing import (
     BookGenerationRequest,
     BookGenerationResponse,
 )
-from app.services.rag_service import RagService
-from app.services.writing_pipeline import WritingPipeline
+from app.schemas.job import JobResponse
+from app.services.auth_cache import owns_project
+from app.services.indexing_pipeline import IndexingPipeline
+from app.services.job_service import JobService
+from app.services.writing_pipeline import WritingPipeline, build_chapter_state
+from app.tasks.generation import generate_book_task, generate_chapter_task
+from app.tasks.indexing import index_project_task
 
 router = APIRouter()
 
 
 async def _verify_project_access(db: AsyncSession, project_id: UUID, user_id: UUID) -> None:
-    result = await db.execute(
-        select(Project).where(Project.id == project_id, Project.owner_id == user_id)
-    )
-    project = result.scalar_one_or_none()
-    if not project:
+    if not await owns_project(db, user_id, project_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found or access denied",
@@ -45,20 +44,20 @@ async def index_project_documents(
     """Index all documents for a project into Qdrant."""
     await _verify_project_access(db, request.project_id, current_user.id)
 
-    documents_result = await db.execute(
-        select(Document).where(Document.project_id == request.project_id)
+    stats = await IndexingPipeline(db).run(
+        request.project_id,
+        prune_missing_documents=request.clear_existing,
     )
-    documents = list(documents_result.scalars().all())
 
-    rag_service = RagService()
-    chunks_indexed = await rag_service.aindex_documents(
-        project_id=request.project_id,
-        documents=documents,
-        clear_existing=request.clear_existing,
+    return IndexProjectResponse(
+        success=True,
+        chunks_indexed=stats["chunks"],
+        chunks_embedded=stats["embedded"],
+        chunks_deleted=stats["deleted"],
+        seconds=stats["seconds"],
+        chunks_per_second=stats["chunks_per_second"],
     )
 
-    return IndexProjectResponse(success=True, chunks_indexed=chunks_indexed)
-
 
 @router.post("/generate-chapter", response_model=ChapterGenerationResponse)
 async def generate_chapter(
@@ -70,20 +69,7 @@ async def generate_chapter(
     await _verify_project_access(db, request.project_id, current_user.id)
 
     pipeline = WritingPipeline(db)
-    result = await pipeline.generate_chapter(
-        {
-            "project_id": request.project_id,
-            "user_id": current_user.id,
-            "chapter_title": request.chapter_title or "",
-            "chapter_prompt": request.chapter_prompt,
-            "target_word_count": request.target_word_count,
-            "constraints": request.constraints or {},
-            "use_rag": request.use_rag,
-            "reindex_documents": request.reindex_documents,
-            "order_index": request.order_index,
-            "create_document": request.create_document,
-        }
-    )
+    result = await pipeline.generate_chapter(build_chapter_state(request, current_user.id))
 
     return ChapterGenerationResponse(
         success=True,
@@ -115,6 +101,8 @@ async def generate_book(
         use_rag=request.use_rag,
         reindex_documents=request.reindex_documents,
         create_documents=request.create_documents,
+        concurrency=request.concurrency,
+        continuity_pass=request.continuity_pass,
     )
 
     return BookGenerationResponse(
@@ -122,3 +110,75 @@ async def generate_book(
         outline=result.get("outline", []),
         chapters=result.get("chapters", []),
     )
+
+
+async def _create_job(
+    db: AsyncSession,
+    job_type: JobType,
+    project_id: UUID,
+    user_id: UUID,
+    params: dict,
+    task,
+):
+    job_service = JobService(db)
+    job = await job_service.create(job_type, user_id=user_id, project_id=project_id, params=params)
+    await job_service.enqueue(job, task)
+    return job
+
+
+@router.post("/index/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def index_project_documents_job(
+    request: IndexProjectRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Queue the indexing of a project into Qdrant as a background job."""
+    await _verify_project_access(db, request.project_id, current_user.id)
+    return await _create_job(
+        db,
+        JobType.INDEX_PROJECT,
+        request.project_id,
+        current_user.id,
+        request.model_dump(mode="json"),
+        index_project_task,
+    )
+
+
+@router.post("/generate-chapter/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generate_chapter_job(
+    request: ChapterGenerationRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Queue a chapter generation as a background job."""
+    await _verify_project_access(db, request.project_id, current_user.id)
+    return await _create_job(
+        db,
+        JobType.GENERATE_CHAPTER,
+        request.project_id,
+        current_user.id,
+        request.model_dump(mode="json"),
+        generate_chapter_task,
+    )
+
+
+@router.post("/generate-book/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def generate_book_job(
+    request: BookGenerationRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Queue a full book generation as a background job.
+
+    Progress is reported per generated chapter on `GET /jobs/{id}`.
+    """
+    await _verify_project_access(db, request.project_id, current_user.id)
+    return await _create_job(
+        db,
+        JobType.GENERATE_BOOK,
+        request.project_id,
+        current_user.id,
+        request.model_dump(mode="json"),
+        generate_book_task,
+    )
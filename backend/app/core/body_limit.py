@@ -0,0 +1,55 @@
+"""Reject oversized request bodies while they are received."""
+from typing import Sequence
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    """
+    Cap the request body size of selected routes.
+
+    A declared Content-Length over the limit is answered with 413 before the
+    body is read; otherwise bytes are counted as they arrive and the request
+    fails with 413 as soon as the limit is crossed, so an oversized upload is
+    never fully received or spooled.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, path_prefixes: Sequence[str]) -> None:
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_prefixes = tuple(path_prefixes)
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Request body too large. Maximum size: {self.max_body_size / (1024 * 1024):.0f} MB",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_size:
+            error = self._too_large()
+            response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Re-raised by FastAPI's body parsing and rendered by the HTTPException handler
+                    raise self._too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
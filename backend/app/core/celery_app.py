@@ -1,5 +1,8 @@
 """Celery application configuration"""
+import logging
+
 from celery import Celery
+from celery.signals import worker_process_init
 from app.core.config import settings
 
 # Create Celery instance
@@ -24,11 +27,26 @@ celery_app.conf.update(
     worker_max_tasks_per_child=1000,
 )
 
-# Optional: Beat schedule for periodic tasks
+
+
+@worker_process_init.connect
+def warmup_worker_embeddings(**kwargs):
+    """Load the embedding model once per worker process."""
+    if not settings.EMBEDDING_WARMUP:
+        return
+    from app.services.embeddings import warmup_embeddings
+
+    try:
+        warmup_embeddings()
+    except Exception as exc:
+        logging.getLogger(__name__).error("Embedding warmup failed: %s", exc)
+
+
+# Beat schedule for periodic tasks
 celery_app.conf.beat_schedule = {
-    # Example: cleanup old tasks every day
-    # "cleanup-old-tasks": {
-    #     "task": "app.tasks.cleanup_old_tasks",
-    #     "schedule": crontab(hour=0, minute=0),
-    # },
+    # Project word counts are maintained by delta; fix any drift
+    "reconcile-word-counts": {
+        "task": "app.tasks.maintenance.reconcile_word_counts",
+        "schedule": float(settings.WORD_COUNT_RECONCILE_INTERVAL),
+    },
 }
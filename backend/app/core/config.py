@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     SECRET_KEY: str = Field(default="", env="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    BCRYPT_ROUNDS: int = Field(default=12, ge=4, le=31, env="BCRYPT_ROUNDS")  # Cost factor for new hashes
+    BCRYPT_MAX_WORKERS: int = Field(default=4, env="BCRYPT_MAX_WORKERS")  # Threads hashing passwords
 
     @field_validator('SECRET_KEY')
     @classmethod
@@ -100,6 +102,7 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: str = Field(..., env="REDIS_URL")
+    REDIS_SOCKET_TIMEOUT: float = Field(default=2.0, env="REDIS_SOCKET_TIMEOUT")
 
     # Qdrant Vector Database
     QDRANT_URL: str = Field(..., env="QDRANT_URL")
@@ -113,24 +116,81 @@ class Settings(BaseSettings):
     DEEPSEEK_REASONING_MODEL: str = "deepseek-reasoner"
     DEEPSEEK_TIMEOUT: float = Field(default=300.0, env="DEEPSEEK_TIMEOUT")
     CHAT_MAX_TOKENS: int = Field(default=4096, env="CHAT_MAX_TOKENS")
+    DEEPSEEK_HTTP2: bool = Field(default=True, env="DEEPSEEK_HTTP2")
+    DEEPSEEK_MAX_CONNECTIONS: int = Field(default=100, env="DEEPSEEK_MAX_CONNECTIONS")
+    DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, env="DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS")
+    DEEPSEEK_KEEPALIVE_EXPIRY: float = Field(default=60.0, env="DEEPSEEK_KEEPALIVE_EXPIRY")
 
     # Embeddings
     EMBEDDING_MODEL: str = "BAAI/bge-m3"
     EMBEDDING_DIMENSION: int = 1024
+    EMBEDDING_DEVICE: Optional[str] = Field(default=None, env="EMBEDDING_DEVICE")
+    EMBEDDING_BATCH_SIZE: int = Field(default=32, env="EMBEDDING_BATCH_SIZE")
+    EMBEDDING_NUM_THREADS: int = Field(default=0, env="EMBEDDING_NUM_THREADS")
+    EMBEDDING_MEMORY_BUDGET_MB: int = Field(default=0, env="EMBEDDING_MEMORY_BUDGET_MB")
+    EMBEDDING_WARMUP: bool = Field(default=True, env="EMBEDDING_WARMUP")
+    EMBEDDING_CACHE_ENABLED: bool = Field(default=True, env="EMBEDDING_CACHE_ENABLED")
+    EMBEDDING_CACHE_MAX_ENTRIES: int = Field(default=50_000, env="EMBEDDING_CACHE_MAX_ENTRIES")
+    EMBEDDING_QUERY_CACHE_SIZE: int = Field(default=1024, env="EMBEDDING_QUERY_CACHE_SIZE")
+
+    # Project context cache (Redis revision counter + in-process L1)
+    CONTEXT_CACHE_ENABLED: bool = Field(default=True, env="CONTEXT_CACHE_ENABLED")
+    CONTEXT_CACHE_TTL_SECONDS: int = Field(default=3600, env="CONTEXT_CACHE_TTL_SECONDS")
+    CONTEXT_CACHE_L1_SIZE: int = Field(default=256, env="CONTEXT_CACHE_L1_SIZE")
+
+    # Auth caches: current user and project ownership (Redis + short-lived local LRU)
+    AUTH_CACHE_ENABLED: bool = Field(default=True, env="AUTH_CACHE_ENABLED")
+    AUTH_CACHE_TTL_SECONDS: int = Field(default=60, env="AUTH_CACHE_TTL_SECONDS")
+    AUTH_CACHE_LOCAL_TTL_SECONDS: int = Field(default=5, env="AUTH_CACHE_LOCAL_TTL_SECONDS")
+    AUTH_CACHE_LOCAL_SIZE: int = Field(default=4096, env="AUTH_CACHE_LOCAL_SIZE")
+
+    # Prompt context budgets, in tokens per section (0 = unlimited)
+    CONTEXT_TOKEN_ENCODING: str = Field(default="cl100k_base", env="CONTEXT_TOKEN_ENCODING")
+    CONTEXT_BUDGET_INSTRUCTIONS: int = Field(default=1000, env="CONTEXT_BUDGET_INSTRUCTIONS")
+    CONTEXT_BUDGET_CHARACTERS: int = Field(default=1500, env="CONTEXT_BUDGET_CHARACTERS")
+    CONTEXT_BUDGET_DOCUMENTS: int = Field(default=800, env="CONTEXT_BUDGET_DOCUMENTS")
+
+    # Document versions
+    VERSION_SNAPSHOT_INTERVAL: int = Field(default=10, env="VERSION_SNAPSHOT_INTERVAL")
+    VERSION_DELTA_MAX_RATIO: float = Field(default=0.5, env="VERSION_DELTA_MAX_RATIO")
+    VERSION_COMPRESSION_LEVEL: int = Field(default=6, env="VERSION_COMPRESSION_LEVEL")
+
+    # Response compression
+    COMPRESSION_ENABLED: bool = Field(default=True, env="COMPRESSION_ENABLED")
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1024, env="COMPRESSION_MINIMUM_SIZE")  # Bytes
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, ge=1, le=9, env="COMPRESSION_GZIP_LEVEL")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=5, ge=0, le=11, env="COMPRESSION_BROTLI_QUALITY")
 
     # File Upload
-    MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10 MB
+    MAX_UPLOAD_SIZE: int = Field(default=10 * 1024 * 1024, env="MAX_UPLOAD_SIZE")  # 10 MB
+    UPLOAD_PARSE_WORKERS: int = Field(default=2, env="UPLOAD_PARSE_WORKERS")  # Processes parsing PDF/DOCX/TXT
+    UPLOAD_PARSE_TASKS_PER_WORKER: int = Field(default=50, env="UPLOAD_PARSE_TASKS_PER_WORKER")  # Recycle after N files
     ALLOWED_EXTENSIONS: List[str] = [".txt", ".docx", ".pdf", ".md"]
     UPLOAD_DIR: str = "./uploads"
 
+    # Export
+    EXPORT_DOCUMENT_BATCH_SIZE: int = Field(default=50, env="EXPORT_DOCUMENT_BATCH_SIZE")  # Rows per cursor fetch
+    EXPORT_WORKERS: int = Field(default=2, env="EXPORT_WORKERS")  # Processes building EPUB/DOCX files
+    EXPORT_TASKS_PER_WORKER: int = Field(default=50, env="EXPORT_TASKS_PER_WORKER")
+    EXPORT_CACHE_DIR: str = Field(default="./exports", env="EXPORT_CACHE_DIR")
+    EXPORT_CACHE_MAX_AGE_DAYS: int = Field(default=30, env="EXPORT_CACHE_MAX_AGE_DAYS")
+    EXPORT_LANGUAGE: str = Field(default="fr", env="EXPORT_LANGUAGE")
+
     # Celery
     CELERY_BROKER_URL: str = Field(default="", env="REDIS_URL")
     CELERY_RESULT_BACKEND: str = Field(default="", env="REDIS_URL")
+    BOOK_MAX_CONCURRENCY: int = Field(default=4, env="BOOK_MAX_CONCURRENCY")  # Parallel chapter drafts per book
+    BOOK_JOB_TIME_LIMIT: int = Field(default=6 * 60 * 60, env="BOOK_JOB_TIME_LIMIT")  # 6 hours
+    WORD_COUNT_RECONCILE_INTERVAL: int = Field(default=60 * 60, env="WORD_COUNT_RECONCILE_INTERVAL")  # seconds
 
     # RAG Settings
     RAG_CHUNK_SIZE: int = 512
     RAG_CHUNK_OVERLAP: int = 50
     RAG_TOP_K: int = 5
+    RAG_AUTO_REINDEX: bool = Field(default=True, env="RAG_AUTO_REINDEX")
+    INDEXING_DOCUMENT_BATCH_SIZE: int = Field(default=50, env="INDEXING_DOCUMENT_BATCH_SIZE")
+    INDEXING_EMBED_BATCH_SIZE: int = Field(default=256, env="INDEXING_EMBED_BATCH_SIZE")
+    INDEXING_UPSERT_PARALLELISM: int = Field(default=4, env="INDEXING_UPSERT_PARALLELISM")
 
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
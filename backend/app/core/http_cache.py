@@ -0,0 +1,45 @@
+"""ETag and conditional GET helpers for read endpoints."""
+from typing import Any, Optional
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Mutable resources: the client may keep a copy but must revalidate it every time
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values identifying a representation (ids, updated_at, labels)."""
+    digest = hashlib.sha1("\x1f".join("" if part is None else str(part) for part in parts).encode("utf-8"))
+    return f'"{digest.hexdigest()}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison: a W/ prefix does not matter
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def not_modified(request: Request, etag: str, cache_control: str = REVALIDATE) -> Optional[Response]:
+    """
+    Answer a conditional GET.
+
+    Returns:
+        An empty 304 response when If-None-Match matches the ETag, None otherwise
+    """
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+    return None
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str = REVALIDATE) -> None:
+    """Attach the ETag and Cache-Control to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
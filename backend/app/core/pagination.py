@@ -0,0 +1,28 @@
+"""Opaque cursors for keyset pagination."""
+from typing import List
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*keys: str) -> str:
+    """Cursor pointing after the item with these sort keys (e.g. created_at, id)."""
+    return base64.urlsafe_b64encode(json.dumps(list(keys)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """
+    Sort keys stored in a cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        keys = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        keys = None
+    if not isinstance(keys, list) or len(keys) != size or not all(isinstance(key, str) for key in keys):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return keys
@@ -0,0 +1,35 @@
+"""Named process pools for CPU-bound work kept off the event loop."""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import multiprocessing
+
+_pools: Dict[str, ProcessPoolExecutor] = {}
+
+
+def get_process_pool(name: str, max_workers: int, max_tasks_per_child: Optional[int] = None) -> ProcessPoolExecutor:
+    """Return the pool called `name`, created on first use."""
+    pool = _pools.get(name)
+    if pool is None:
+        # spawn: the API process runs threads (bcrypt pool, asyncio.to_thread), fork would copy their locks.
+        # Recycled workers keep a leaky library from growing forever.
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, max_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=max_tasks_per_child,
+        )
+        _pools[name] = pool
+    return pool
+
+
+async def run_in_process(pool: ProcessPoolExecutor, func: Callable[..., Any], *args: Any) -> Any:
+    """Await a picklable function call in a worker process."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, func, *args)
+
+
+def shutdown_process_pools() -> None:
+    """Stop every worker process (application shutdown)."""
+    while _pools:
+        _, pool = _pools.popitem()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,7 +1,9 @@
 """Security utilities for authentication and authorization"""
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
+import asyncio
 from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
@@ -12,10 +14,18 @@ from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.token import TokenPayload
+from app.services.auth_cache import load_user
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
+# bcrypt releases the GIL, so a few threads hash in parallel without blocking the event loop;
+# the bound keeps a login burst from starving the rest of the process of CPU
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.BCRYPT_MAX_WORKERS),
+    thread_name_prefix="bcrypt",
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -52,11 +62,23 @@ def get_password_hash(password: str) -> str:
         password_bytes = password_bytes[:72]
 
     # Generate salt and hash password
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
 
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password run in the bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash run in the bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_access_token(user_id: UUID, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -139,8 +161,8 @@ async def get_current_user(
     if token_data is None or token_data.sub is None:
         raise credentials_exception
 
-    # Get user from database
-    user = await db.get(User, token_data.sub)
+    # Get user (cached for a short while, see auth_cache)
+    user = await load_user(db, token_data.sub)
     if user is None:
         raise credentials_exception
 
@@ -1,9 +1,16 @@
 """Database session configuration"""
+from typing import Callable, List
+import asyncio
+import logging
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -30,11 +37,63 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+_COMMITTED_KEY = "committed_callbacks"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Run a callback once the session's current transaction commits (dropped on rollback).
+
+    Callbacks may block (Redis, Celery broker): they run in a worker thread from
+    commit(), never inside the commit itself on the event loop.
+    """
+    db.sync_session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_after_commit_callbacks(session: Session) -> None:
+    # Fired on the event loop thread during the commit: only hand the callbacks over
+    callbacks = session.info.pop(_AFTER_COMMIT_KEY, None)
+    if callbacks:
+        session.info.setdefault(_COMMITTED_KEY, []).extend(callbacks)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
+
+
+def _run_callbacks(callbacks: List[Callable[[], None]]) -> None:
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as exc:
+            logger.warning(f"After-commit callback failed: {exc}")
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit the session, then run its after-commit callbacks in a worker thread."""
+    await session.commit()
+    callbacks = session.sync_session.info.pop(_COMMITTED_KEY, None)
+    if callbacks:
+        await asyncio.to_thread(_run_callbacks, callbacks)
+
+
 # Dependency to get DB session
 async def get_db() -> AsyncSession:
-    """Get database session"""
+    """
+    Get database session.
+
+    One unit of work per request: services only flush, and the session commits
+    once when the endpoint returns (or rolls back if it raised). Code running
+    outside a request (Celery tasks, streamed response bodies) commits itself
+    through commit() so after-commit callbacks run.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-        finally:
-            await session.close()
+            await commit(session)
+        except Exception:
+            await session.rollback()
+            raise
@@ -5,17 +5,23 @@ Main FastAPI Application
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+import asyncio
 import time
 import logging
 
 from app.core.config import settings
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.process_pool import shutdown_process_pools
 from app.api.v1 import api_router
 from app.db.session import engine
 from app.db.base import Base
+from app.services.llm_client import close_http_client
+from app.services.embeddings import warmup_embeddings
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +41,7 @@ app = FastAPI(
     docs_url="/api/docs" if settings.DEBUG else None,
     redoc_url="/api/redoc" if settings.DEBUG else None,
     openapi_url="/api/openapi.json" if settings.DEBUG else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Add rate limiter state
@@ -57,6 +64,22 @@ if not settings.DEBUG:
         allowed_hosts=settings.ALLOWED_HOSTS
     )
 
+# Uploads: reject oversized bodies while they are received (64 KB of slack for the other form fields)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_body_size=settings.MAX_UPLOAD_SIZE + 64 * 1024,
+    path_prefixes=["/api/v1/upload"],
+)
+
+# Response compression (Brotli or gzip; SSE streams and archives are left alone)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 
 # Request timing middleware
 @app.middleware("http")
@@ -141,6 +164,13 @@ async def startup_event():
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created")
 
+    # Load the embedding model once per process instead of on the first RAG request
+    if settings.EMBEDDING_WARMUP:
+        try:
+            await asyncio.to_thread(warmup_embeddings)
+        except Exception as exc:
+            logger.error(f"Embedding warmup failed: {exc}")
+
 
 # Shutdown event
 @app.on_event("shutdown")
@@ -148,6 +178,12 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
 
+    # Release pooled DeepSeek connections
+    await close_http_client()
+
+    # Stop the upload parsing and export processes
+    shutdown_process_pools()
+
 
 if __name__ == "__main__":
     import uvicorn
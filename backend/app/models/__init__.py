@@ -2,6 +2,8 @@
 from app.models.user import User
 from app.models.project import Project
 from app.models.document import Document
+from app.models.document_version import DocumentVersion
 from app.models.character import Character
+from app.models.job import GenerationJob
 
-__all__ = ["User", "Project", "Document", "Character"]
+__all__ = ["User", "Project", "Document", "DocumentVersion", "Character", "GenerationJob"]
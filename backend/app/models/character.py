@@ -1,5 +1,5 @@
 """Character model"""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -17,6 +17,9 @@ def utc_now():
 class Character(Base):
     """Character model"""
     __tablename__ = "characters"
+    __table_args__ = (
+        Index("ix_characters_project_id_name", "project_id", "name"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)
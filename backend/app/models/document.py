@@ -1,5 +1,5 @@
 """Document model"""
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -26,6 +26,22 @@ class DocumentType(str, enum.Enum):
 class Document(Base):
     """Document model"""
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_project_id_order_index", "project_id", "order_index"),
+        # Next element index per type (see documents._get_next_element_index)
+        Index(
+            "ix_documents_project_id_element_type",
+            "project_id",
+            text("(document_metadata ->> 'element_type')"),
+        ),
+        # Serves document_metadata @> '{...}' lookups (element_type, parent_id)
+        Index(
+            "ix_documents_document_metadata",
+            "document_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"document_metadata": "jsonb_path_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
@@ -46,6 +62,14 @@ class Document(Base):
 
     # Relationships
     project = relationship("Project", back_populates="documents")
+    # Never loaded implicitly: history is read through DocumentVersionService
+    versions = relationship(
+        "DocumentVersion",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="noload",
+    )
 
     def __repr__(self):
         return f"<Document {self.title}>"
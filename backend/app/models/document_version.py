@@ -0,0 +1,59 @@
+"""Document version model"""
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.db.base import Base
+
+
+def utc_now():
+    """Return current UTC time - compatible with SQLAlchemy default"""
+    # Return timezone-naive UTC datetime for PostgreSQL TIMESTAMP WITHOUT TIME ZONE
+    return datetime.utcnow()
+
+
+class DocumentVersion(Base):
+    """Snapshot of a document's content (generation, rewrite or manual edit)"""
+    __tablename__ = "document_versions"
+    __table_args__ = (
+        Index("ix_document_versions_document_id_created_at", "document_id", "created_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    version = Column(String(32), nullable=False)  # "v1", "v1.01", ...
+    word_count = Column(Integer, default=0, nullable=False)
+
+    # Content storage: plain text (legacy), zlib snapshot, or zlib delta against a snapshot.
+    # Use DocumentVersionService.get_content() to read it.
+    content = Column(Text, nullable=True)
+    content_encoding = Column(String(16), default="plain", nullable=False)
+    content_data = Column(LargeBinary, nullable=True)
+    base_version_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("document_versions.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    # Generation parameters
+    min_word_count = Column(Integer, nullable=True)
+    max_word_count = Column(Integer, nullable=True)
+    summary = Column(Text, nullable=True)
+    instructions = Column(Text, nullable=True)
+
+    # Provenance
+    source_version_id = Column(UUID(as_uuid=True), nullable=True)
+    source_version = Column(String(32), nullable=True)
+    source_type = Column(String(50), nullable=True)
+    source_comment_ids = Column(JSONB, nullable=True)
+    edited_by = Column(UUID(as_uuid=True), nullable=True)
+
+    created_at = Column(DateTime, default=utc_now, nullable=False)
+
+    # Relationships
+    document = relationship("Document", back_populates="versions")
+
+    def __repr__(self):
+        return f"<DocumentVersion {self.version} of {self.document_id}>"
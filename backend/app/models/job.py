@@ -0,0 +1,72 @@
+"""Background job model"""
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+import enum
+
+from app.db.base import Base
+
+
+def utc_now():
+    """Return current UTC time - compatible with SQLAlchemy default"""
+    # Return timezone-naive UTC datetime for PostgreSQL TIMESTAMP WITHOUT TIME ZONE
+    return datetime.utcnow()
+
+
+class JobType(str, enum.Enum):
+    """Job type enumeration"""
+    GENERATE_CHAPTER = "generate_chapter"
+    GENERATE_BOOK = "generate_book"
+    GENERATE_ELEMENT = "generate_element"
+    INDEX_PROJECT = "index_project"
+
+
+class JobStatus(str, enum.Enum):
+    """Job status enumeration"""
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class GenerationJob(Base):
+    """Long-running generation or indexing job executed by a Celery worker"""
+    __tablename__ = "generation_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(Enum(JobType), nullable=False)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False)
+
+    # Progress reporting
+    progress = Column(Integer, default=0, nullable=False)  # 0-100
+    progress_message = Column(String(255), nullable=True)
+
+    # Input parameters and outcome
+    params = Column(JSONB, default=dict)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    celery_task_id = Column(String(255), nullable=True)
+
+    # Ownership
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=utc_now, nullable=False)
+    updated_at = Column(DateTime, default=utc_now, onupdate=utc_now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    user = relationship("User")
+    project = relationship("Project")
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def __repr__(self):
+        return f"<GenerationJob {self.job_type} {self.status}>"
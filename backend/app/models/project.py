@@ -1,5 +1,5 @@
 """Project model"""
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -39,6 +39,9 @@ class Genre(str, enum.Enum):
 class Project(Base):
     """Project model"""
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_owner_id_updated_at", "owner_id", "updated_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
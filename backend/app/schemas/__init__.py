@@ -17,6 +17,8 @@ from app.schemas.document import (
     DocumentUpdate,
     DocumentResponse,
     DocumentList,
+    DocumentSummary,
+    DocumentSummaryList,
     DocumentVersionCreate,
     DocumentVersionSummary,
     DocumentVersionResponse,
@@ -38,6 +40,11 @@ from app.schemas.instruction import (
     InstructionResponse,
     InstructionList,
 )
+from app.schemas.job import (
+    JobResponse,
+    JobList,
+    JobResultResponse,
+)
 from app.schemas.token import Token, TokenPayload
 
 __all__ = [
@@ -57,6 +64,8 @@ __all__ = [
     "DocumentUpdate",
     "DocumentResponse",
     "DocumentList",
+    "DocumentSummary",
+    "DocumentSummaryList",
     "DocumentVersionCreate",
     "DocumentVersionSummary",
     "DocumentVersionResponse",
@@ -75,6 +84,10 @@ __all__ = [
     "InstructionUpdate",
     "InstructionResponse",
     "InstructionList",
+    # Job
+    "JobResponse",
+    "JobList",
+    "JobResultResponse",
     # Token
     "Token",
     "TokenPayload",
@@ -59,6 +59,28 @@ class DocumentList(BaseModel):
     total: int
 
 
+class DocumentSummary(BaseModel):
+    """Lightweight document listing entry (content preview, essential metadata)"""
+    id: UUID
+    title: str
+    document_type: DocumentType
+    order_index: int
+    word_count: int
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    content_preview: Optional[str] = None
+    project_id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DocumentSummaryList(BaseModel):
+    """Schema for summary document list response"""
+    documents: list[DocumentSummary]
+    total: int
+
+
 class ElementCreateRequest(BaseModel):
     """Schema for creating a structured element"""
     project_id: UUID
@@ -108,6 +130,7 @@ class DocumentVersionList(BaseModel):
     """Schema for list of document versions"""
     versions: list[DocumentVersionSummary]
     total: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next page
 
 
 class DocumentCommentCreate(BaseModel):
@@ -130,3 +153,4 @@ class DocumentCommentList(BaseModel):
     """Schema for list of document comments"""
     comments: list[DocumentComment]
     total: int
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next page
@@ -0,0 +1,38 @@
+"""Background job schemas"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from uuid import UUID
+
+from app.models.job import JobType, JobStatus
+
+
+class JobResponse(BaseModel):
+    """Schema for job status and progress"""
+    id: UUID
+    job_type: JobType
+    status: JobStatus
+    progress: int
+    progress_message: Optional[str] = None
+    error: Optional[str] = None
+    project_id: Optional[UUID] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobList(BaseModel):
+    """Schema for job list response"""
+    jobs: list[JobResponse]
+    total: int
+
+
+class JobResultResponse(BaseModel):
+    """Schema for the result of a finished job"""
+    id: UUID
+    job_type: JobType
+    status: JobStatus
+    result: Dict[str, Any]
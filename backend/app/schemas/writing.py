@@ -13,6 +13,10 @@ class IndexProjectRequest(BaseModel):
 class IndexProjectResponse(BaseModel):
     success: bool
     chunks_indexed: int
+    chunks_embedded: int = 0
+    chunks_deleted: int = 0
+    seconds: float = 0.0
+    chunks_per_second: float = 0.0
 
 
 class ChapterGenerationRequest(BaseModel):
@@ -47,6 +51,8 @@ class BookGenerationRequest(BaseModel):
     use_rag: bool = True
     reindex_documents: bool = False
     create_documents: bool = True
+    concurrency: int = Field(1, ge=1, le=16, description="Number of chapters drafted in parallel")
+    continuity_pass: bool = Field(False, description="Smooth chapter transitions after parallel drafting")
 
 
 class BookGenerationResponse(BaseModel):
@@ -1,15 +1,15 @@
 """Base agent class for all AI agents"""
-import os
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
-import httpx
+
+from app.services.llm_client import DeepSeekClient
 
 
 class BaseAgent(ABC):
     """Base class for all THOTH AI agents"""
 
     def __init__(self):
-        self.api_key = os.getenv("DEEPSEEK_API_KEY")
+        self.llm_client = DeepSeekClient()
         self.model = "deepseek-chat"
 
     @property
@@ -39,11 +39,6 @@ class BaseAgent(ABC):
     ) -> str:
         """Call DeepSeek API"""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
             # Build context string if provided
             context_str = ""
             if context:
@@ -57,26 +52,13 @@ class BaseAgent(ABC):
                 {"role": "user", "content": user_prompt + context_str},
             ]
 
-            payload = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0,
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"API error: {response.text}")
-
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+            return await self.llm_client.chat(
+                messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                model=self.model,
+                timeout=60.0,
+            )
 
         except Exception as e:
             raise Exception(f"Error calling API for {self.name}: {str(e)}")
@@ -0,0 +1,204 @@
+"""Short-lived caches for the authenticated user and project ownership checks."""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+import asyncio
+import enum
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import run_after_commit
+from app.models.project import Project
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# The password hash never leaves the database
+_USER_COLUMNS = [column for column in User.__table__.columns if column.key != "hashed_password"]
+
+
+class _LocalCache:
+    """Thread-safe LRU whose entries expire after AUTH_CACHE_LOCAL_TTL_SECONDS."""
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Any, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + settings.AUTH_CACHE_LOCAL_TTL_SECONDS, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_CACHE_LOCAL_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+_local = _LocalCache()
+
+
+def _user_key(user_id: UUID) -> str:
+    return f"auth:user:{user_id}"
+
+
+def _ownership_key(user_id: UUID) -> str:
+    return f"auth:owns:{user_id}"
+
+
+def _encode_user(user: User) -> str:
+    return json.dumps({column.key: getattr(user, column.key) for column in _USER_COLUMNS}, default=str)
+
+
+def _decode_user(raw: str) -> Dict[str, Any]:
+    data = json.loads(raw)
+    values = {}
+    for column in _USER_COLUMNS:
+        value = data.get(column.key)
+        python_type = column.type.python_type
+        if value is not None:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is UUID:
+                value = UUID(value)
+            elif issubclass(python_type, enum.Enum):
+                value = python_type(value)
+        values[column.key] = value
+    return values
+
+
+def _read_user(user_id: UUID) -> Optional[str]:
+    raw = _local.get(("user", user_id))
+    if raw is not None:
+        return raw
+    try:
+        data = get_redis().get(_user_key(user_id))
+    except Exception as exc:
+        logger.warning(f"Auth cache read failed: {exc}")
+        return None
+    if data is None:
+        return None
+    raw = data.decode("utf-8")
+    _local.set(("user", user_id), raw)
+    return raw
+
+
+def _write_user(user_id: UUID, raw: str) -> None:
+    _local.set(("user", user_id), raw)
+    try:
+        get_redis().set(_user_key(user_id), raw.encode("utf-8"), ex=settings.AUTH_CACHE_TTL_SECONDS)
+    except Exception as exc:
+        logger.warning(f"Auth cache write failed: {exc}")
+
+
+def _read_ownership(user_id: UUID, project_id: UUID) -> bool:
+    if _local.get(("owns", user_id, project_id)):
+        return True
+    try:
+        owned = get_redis().hexists(_ownership_key(user_id), str(project_id))
+    except Exception as exc:
+        logger.warning(f"Auth cache read failed: {exc}")
+        return False
+    if owned:
+        _local.set(("owns", user_id, project_id), True)
+    return bool(owned)
+
+
+def _write_ownership(user_id: UUID, project_id: UUID) -> None:
+    _local.set(("owns", user_id, project_id), True)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hset(_ownership_key(user_id), str(project_id), "1")
+        pipe.expire(_ownership_key(user_id), settings.AUTH_CACHE_TTL_SECONDS)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning(f"Auth cache write failed: {exc}")
+
+
+async def load_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """
+    Return the user, from the cache when possible.
+
+    A cached user is attached to the session without a query (merge with load=False),
+    so callers get a regular persistent instance either way.
+    """
+    if settings.AUTH_CACHE_ENABLED:
+        raw = await asyncio.to_thread(_read_user, user_id)
+        if raw is not None:
+            user = User(**_decode_user(raw))
+            make_transient_to_detached(user)
+            return await db.merge(user, load=False)
+
+    user = await db.get(User, user_id)
+    if user is not None and settings.AUTH_CACHE_ENABLED:
+        await asyncio.to_thread(_write_user, user_id, _encode_user(user))
+    return user
+
+
+async def owns_project(db: AsyncSession, user_id: UUID, project_id: UUID) -> bool:
+    """Whether the user owns the project; only positive answers are cached."""
+    if settings.AUTH_CACHE_ENABLED and await asyncio.to_thread(_read_ownership, user_id, project_id):
+        return True
+
+    result = await db.execute(
+        select(Project.id).where(Project.id == project_id, Project.owner_id == user_id)
+    )
+    if result.scalar_one_or_none() is None:
+        return False
+    if settings.AUTH_CACHE_ENABLED:
+        await asyncio.to_thread(_write_ownership, user_id, project_id)
+    return True
+
+
+def forget_user(db: AsyncSession, user_id: UUID, ownership: bool = False) -> None:
+    """
+    Drop the cached user (and optionally its ownership entries) after the transaction commits.
+
+    The Redis DELETE runs from app.db.session.commit() in a worker thread, off the event loop.
+    """
+
+    def invalidate() -> None:
+        _local.discard(("user", user_id))
+        keys = [_user_key(user_id)]
+        if ownership:
+            keys.append(_ownership_key(user_id))
+        try:
+            get_redis().delete(*keys)
+        except Exception as exc:
+            logger.warning(f"Auth cache invalidation failed for user {user_id}: {exc}")
+
+    run_after_commit(db, invalidate)
+
+
+def forget_project(db: AsyncSession, user_id: UUID, project_id: UUID) -> None:
+    """Drop a cached ownership entry after the transaction commits (HDEL in a worker thread)."""
+
+    def invalidate() -> None:
+        _local.discard(("owns", user_id, project_id))
+        try:
+            get_redis().hdel(_ownership_key(user_id), str(project_id))
+        except Exception as exc:
+            logger.warning(f"Auth cache invalidation failed for project {project_id}: {exc}")
+
+    run_after_commit(db, invalidate)
@@ -7,7 +7,8 @@ from fastapi import HTTPException, status
 
 from app.models.user import User
 from app.schemas.user import UserCreate
-from app.core.security import verify_password, get_password_hash
+from app.core.security import averify_password, aget_password_hash
+from app.services.auth_cache import forget_user
 
 
 class AuthService:
@@ -45,12 +46,11 @@ class AuthService:
         user = User(
             email=user_data.email,
             full_name=user_data.full_name,
-            hashed_password=get_password_hash(user_data.password)
+            hashed_password=await aget_password_hash(user_data.password)
         )
 
         self.db.add(user)
-        await self.db.commit()
-        await self.db.refresh(user)
+        await self.db.flush()
 
         return user
 
@@ -75,11 +75,12 @@ class AuthService:
             return None
 
         # Verify password
-        if not verify_password(password, user.hashed_password):
+        if not await averify_password(password, user.hashed_password):
             return None
 
         # Update last login
         user.last_login_at = datetime.utcnow()
-        await self.db.commit()
+        forget_user(self.db, user.id)
+        await self.db.flush()
 
         return user
@@ -8,6 +8,8 @@ from fastapi import HTTPException, status
 from app.models.character import Character
 from app.models.project import Project
 from app.schemas.character import CharacterCreate, CharacterUpdate
+from app.services.auth_cache import owns_project
+from app.services.context_cache import mark_project_stale
 
 
 class CharacterService:
@@ -20,29 +22,19 @@ class CharacterService:
         self,
         project_id: UUID,
         user_id: UUID
-    ) -> Project:
+    ) -> None:
         """
         Verify that user owns the project.
 
         Raises:
             HTTPException: If project not found or not owned by user
         """
-        result = await self.db.execute(
-            select(Project).where(
-                Project.id == project_id,
-                Project.owner_id == user_id
-            )
-        )
-        project = result.scalar_one_or_none()
-
-        if not project:
+        if not await owns_project(self.db, user_id, project_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found or access denied"
             )
 
-        return project
-
     async def get_by_id(
         self,
         character_id: UUID,
@@ -139,8 +131,8 @@ class CharacterService:
         )
 
         self.db.add(character)
-        await self.db.commit()
-        await self.db.refresh(character)
+        mark_project_stale(self.db, character.project_id)
+        await self.db.flush()
 
         return character
 
@@ -176,8 +168,8 @@ class CharacterService:
         for field, value in update_data.items():
             setattr(character, field, value)
 
-        await self.db.commit()
-        await self.db.refresh(character)
+        mark_project_stale(self.db, character.project_id)
+        await self.db.flush()
 
         return character
 
@@ -197,6 +189,7 @@ class CharacterService:
             return False
 
         await self.db.delete(character)
-        await self.db.commit()
+        mark_project_stale(self.db, character.project_id)
+        await self.db.flush()
 
         return True
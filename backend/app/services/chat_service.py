@@ -1,5 +1,4 @@
 """Chat service with context and AI integration"""
-import os
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,7 +9,10 @@ from app.models.chat import ChatMessage, MessageRole
 from app.models.project import Project
 from app.models.document import Document
 from app.models.character import Character
+from app.services.document_service import document_summary_columns
 from app.schemas.chat import ChatMessageResponse
+from app.services.llm_client import DeepSeekClient
+from app.services.context_packer import pack_context
 from app.core.config import settings
 
 
@@ -19,7 +21,7 @@ class ChatService:
 
     def __init__(self, db: AsyncSession):
         self.db = db
-        self.deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
+        self.llm_client = DeepSeekClient()
 
     async def _build_project_context(self, project_id: UUID) -> Dict[str, Any]:
         """Build context from project data for AI"""
@@ -34,11 +36,12 @@ class ChatService:
 
         # Get documents
         doc_result = await self.db.execute(
-            select(Document)
+            select(*document_summary_columns(500))
             .where(Document.project_id == project_id)
             .order_by(Document.order_index)
+            .limit(10)
         )
-        documents = doc_result.scalars().all()
+        documents = doc_result.all()
 
         # Get characters
         char_result = await self.db.execute(
@@ -62,9 +65,9 @@ class ChatService:
                     "title": doc.title,
                     "type": doc.document_type.value if doc.document_type else None,
                     "word_count": doc.word_count,
-                    "content_preview": doc.content[:500] if doc.content else None,
+                    "content_preview": doc.content_preview or None,
                 }
-                for doc in documents[:10]  # Limit to 10 most recent
+                for doc in documents  # Limit to 10 most recent
             ],
             "characters": [
                 {
@@ -94,7 +97,7 @@ class ChatService:
 
         return list(reversed(messages))  # Return in chronological order
 
-    def _build_system_prompt(self, context: Optional[Dict[str, Any]] = None) -> str:
+    def _build_system_prompt(self, context: Optional[Dict[str, Any]] = None, focus: str = "") -> str:
         """Build system prompt with context"""
         base_prompt = """Tu es THOTH, un assistant d'écriture littéraire expert et bienveillant.
 Ta mission est d'aider les auteurs francophones à créer des romans, nouvelles et œuvres littéraires de qualité.
@@ -123,10 +126,17 @@ Structure : {project.get('structure_template', 'Aucune structure définie')}
 Progression : {project.get('word_count', 0)} / {project.get('target_word_count', 'N/A')} mots
 """
 
-            if context.get("characters"):
-                context_info += "\nPERSONNAGES :\n"
-                for char in context["characters"]:
-                    context_info += f"- {char['name']} ({char['role']}): {char['description'] or 'Pas de description'}\n"
+            characters = pack_context(
+                context,
+                {
+                    "characters": lambda char: (
+                        f"- {char['name']} ({char['role']}): {char['description'] or 'Pas de description'}"
+                    ),
+                },
+                focus=focus,
+            )["characters"]
+            if characters["lines"]:
+                context_info += "\nPERSONNAGES :\n" + "\n".join(characters["lines"]) + "\n"
 
             if context.get("documents"):
                 context_info += f"\nDOCUMENTS : {len(context['documents'])} chapitre(s)/scène(s)\n"
@@ -142,33 +152,12 @@ Progression : {project.get('word_count', 0)} / {project.get('target_word_count',
     ) -> str:
         """Call DeepSeek API for chat completion"""
         try:
-            import httpx
-
-            headers = {
-                "Authorization": f"Bearer {self.deepseek_api_key}",
-                "Content-Type": "application/json",
-            }
-
-            payload = {
-                "model": "deepseek-chat",
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max(1, settings.CHAT_MAX_TOKENS),
-            }
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.deepseek.com/v1/chat/completions",
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0,
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"DeepSeek API error: {response.text}")
-
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+            return await self.llm_client.chat(
+                messages,
+                temperature=temperature,
+                max_tokens=max(1, settings.CHAT_MAX_TOKENS),
+                timeout=60.0,
+            )
 
         except Exception as e:
             print(f"Error calling DeepSeek API: {e}")
@@ -202,7 +191,7 @@ Progression : {project.get('word_count', 0)} / {project.get('target_word_count',
 
         # Build messages for AI
         ai_messages = [
-            {"role": "system", "content": self._build_system_prompt(context)}
+            {"role": "system", "content": self._build_system_prompt(context, focus=message_content)}
         ]
 
         # Add conversation history
@@ -230,8 +219,7 @@ Progression : {project.get('word_count', 0)} / {project.get('target_word_count',
         )
         self.db.add(assistant_message)
 
-        await self.db.commit()
-        await self.db.refresh(assistant_message)
+        await self.db.flush()
 
         return ChatMessageResponse(
             response=ai_response,
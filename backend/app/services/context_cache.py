@@ -0,0 +1,135 @@
+"""Versioned cache for project context packs (Redis + in-process L1)."""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import json
+import logging
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import run_after_commit
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "context_cache_stale_projects"
+
+_l1: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_l1_lock = threading.Lock()
+
+
+def _revision_key(project_id: str) -> str:
+    return f"ctx:{project_id}:rev"
+
+
+def _pack_key(project_id: str, revision: int, preview_chars: int) -> str:
+    return f"ctx:{project_id}:{revision}:{preview_chars}"
+
+
+def mark_project_stale(db: AsyncSession, project_id: UUID) -> None:
+    """
+    Invalidate a project's cached context once the current transaction commits.
+
+    Bumping the revision after the commit (not before) guarantees no reader can
+    cache pre-commit data under the new revision.
+    """
+    info = db.sync_session.info
+    project_ids: Optional[Set[str]] = info.get(_PENDING_KEY)
+    if project_ids is None:
+        project_ids = info[_PENDING_KEY] = set()
+        # One INCR pipeline per transaction, run off the event loop after the commit
+        run_after_commit(db, lambda: _bump_revisions(project_ids))
+    project_ids.add(str(project_id))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _reset_pending(session: Session) -> None:
+    # The next transaction starts a new set (and registers its own callback)
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _bump_revisions(project_ids: Set[str]) -> None:
+    if not settings.CONTEXT_CACHE_ENABLED:
+        return
+    with _l1_lock:
+        for key in [key for key in _l1 if key[0] in project_ids]:
+            del _l1[key]
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for project_id in project_ids:
+            pipe.incr(_revision_key(project_id))
+        pipe.execute()
+    except Exception as exc:
+        logger.warning(f"Could not invalidate context cache for {sorted(project_ids)}: {exc}")
+
+
+def _get_revision(project_id: str) -> Optional[int]:
+    try:
+        return int(get_redis().get(_revision_key(project_id)) or 0)
+    except Exception as exc:
+        logger.warning(f"Context cache unavailable: {exc}")
+        return None
+
+
+def _read(project_id: str, revision: int, preview_chars: int) -> Optional[str]:
+    key = (project_id, revision, preview_chars)
+    with _l1_lock:
+        raw = _l1.get(key)
+        if raw is not None:
+            _l1.move_to_end(key)
+            return raw
+    try:
+        data = get_redis().get(_pack_key(project_id, revision, preview_chars))
+    except Exception as exc:
+        logger.warning(f"Context cache read failed: {exc}")
+        return None
+    if data is None:
+        return None
+    raw = data.decode("utf-8")
+    _remember(key, raw)
+    return raw
+
+
+def _remember(key: Tuple[str, int, int], raw: str) -> None:
+    with _l1_lock:
+        _l1[key] = raw
+        _l1.move_to_end(key)
+        while len(_l1) > settings.CONTEXT_CACHE_L1_SIZE:
+            _l1.popitem(last=False)
+
+
+def _write(project_id: str, revision: int, preview_chars: int, raw: str) -> None:
+    _remember((project_id, revision, preview_chars), raw)
+    try:
+        get_redis().set(
+            _pack_key(project_id, revision, preview_chars),
+            raw.encode("utf-8"),
+            ex=settings.CONTEXT_CACHE_TTL_SECONDS,
+        )
+    except Exception as exc:
+        logger.warning(f"Context cache write failed: {exc}")
+
+
+async def get_revision(project_id: UUID) -> Optional[int]:
+    """Current revision of a project, or None when the cache is disabled or unreachable."""
+    if not settings.CONTEXT_CACHE_ENABLED:
+        return None
+    return await asyncio.to_thread(_get_revision, str(project_id))
+
+
+async def get_cached(project_id: UUID, revision: int, preview_chars: int) -> Optional[Dict[str, Any]]:
+    """Return a fresh copy of the cached pack for this revision, if any."""
+    raw = await asyncio.to_thread(_read, str(project_id), revision, preview_chars)
+    return json.loads(raw) if raw is not None else None
+
+
+async def store(project_id: UUID, revision: int, preview_chars: int, pack: Dict[str, Any]) -> None:
+    """Cache a pack built while `revision` was current."""
+    raw = json.dumps(pack, ensure_ascii=False, default=str)
+    await asyncio.to_thread(_write, str(project_id), revision, preview_chars, raw)
@@ -0,0 +1,186 @@
+"""Token-budgeted selection of project context items for prompts."""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+import re
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is in requirements.txt
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+Renderer = Callable[[Dict[str, Any]], Optional[str]]
+
+_WORD_RE = re.compile(r"\w{4,}", re.UNICODE)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(settings.CONTEXT_TOKEN_ENCODING)
+    except Exception as exc:
+        logger.warning(f"Tokenizer {settings.CONTEXT_TOKEN_ENCODING} unavailable, estimating tokens: {exc}")
+        return None
+
+
+@lru_cache(maxsize=8192)
+def count_tokens(text: str) -> int:
+    """Token count of a text piece (memoized; about 4 chars per token without tiktoken)."""
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Iterable[Dict[str, str]]) -> int:
+    """Approximate prompt size of chat messages (content plus per-message overhead)."""
+    return sum(count_tokens(message.get("content") or "") + 4 for message in messages)
+
+
+def _terms(text: str) -> set:
+    return {word.lower() for word in _WORD_RE.findall(text or "")}
+
+
+def _relevance(item_text: str, name: Optional[str], focus_terms: set, focus_lower: str) -> int:
+    score = len(_terms(item_text) & focus_terms)
+    if name and name.lower() in focus_lower:
+        score += 10
+    return score
+
+
+def select_items(
+    items: List[Dict[str, Any]],
+    render: Renderer,
+    budget: int,
+    focus: str = "",
+    name_key: Optional[str] = None,
+    recency: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Pick the rendered lines that fit a token budget.
+
+    Items are ranked by overlap with the focus text (a mentioned name weighs most),
+    then by recency, and greedily kept while they fit. Kept lines are returned in
+    their original order.
+
+    Args:
+        items: Context items (dicts from the project context pack)
+        render: Item to prompt line, or None to skip the item
+        budget: Maximum tokens for the section (0 or less keeps everything)
+        focus: Text the prompt is about (title, summary, instructions, user message)
+        name_key: Item key holding a name to look for in the focus
+        recency: Sort key where larger means more recent
+
+    Returns:
+        {"lines": [...], "tokens": int, "omitted": int}
+    """
+    candidates = []
+    for position, item in enumerate(items):
+        line = render(item)
+        if line:
+            candidates.append((position, item, line))
+
+    if budget <= 0:
+        lines = [line for _, _, line in candidates]
+        return {"lines": lines, "tokens": sum(count_tokens(line) for line in lines), "omitted": 0}
+
+    focus_terms = _terms(focus)
+    focus_lower = (focus or "").lower()
+
+    ranked = candidates
+    if recency:
+        dated = [candidate for candidate in ranked if recency(candidate[1]) is not None]
+        undated = [candidate for candidate in ranked if recency(candidate[1]) is None]
+        ranked = sorted(dated, key=lambda candidate: recency(candidate[1]), reverse=True) + undated
+    # Stable sort: equally relevant items keep the recency order
+    ranked = sorted(
+        ranked,
+        key=lambda candidate: -_relevance(
+            candidate[2],
+            candidate[1].get(name_key) if name_key else None,
+            focus_terms,
+            focus_lower,
+        ),
+    )
+
+    kept = []
+    used = 0
+    for candidate in ranked:
+        tokens = count_tokens(candidate[2]) + 1  # newline
+        if used + tokens > budget:
+            continue
+        kept.append(candidate)
+        used += tokens
+
+    kept.sort(key=lambda candidate: candidate[0])
+    return {
+        "lines": [line for _, _, line in kept],
+        "tokens": used,
+        "omitted": len(candidates) - len(kept),
+    }
+
+
+def pack_context(
+    context: Dict[str, Any],
+    renderers: Dict[str, Renderer],
+    focus: str = "",
+    anchor_index: Optional[int] = None,
+    budgets: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """
+    Select instructions, characters and documents of a context pack within token budgets.
+
+    Args:
+        context: Pack from ProjectContextService.build_project_context
+        renderers: Line renderer per section ("instructions", "characters", "documents");
+            sections without a renderer are skipped
+        focus: Text the prompt is about, used for relevance
+        anchor_index: order_index of the element being written; nearby documents rank first
+        budgets: Token budget per section, defaults to the CONTEXT_BUDGET_* settings
+
+    Returns:
+        Per-section {"lines", "tokens", "omitted"} plus "tokens" (total)
+    """
+    budgets = {
+        "instructions": settings.CONTEXT_BUDGET_INSTRUCTIONS,
+        "characters": settings.CONTEXT_BUDGET_CHARACTERS,
+        "documents": settings.CONTEXT_BUDGET_DOCUMENTS,
+        **(budgets or {}),
+    }
+
+    def document_recency(doc: Dict[str, Any]) -> Any:
+        if anchor_index is None:
+            return doc.get("updated_at")
+        if doc.get("order_index") is None:
+            return None
+        return -abs(doc["order_index"] - anchor_index)
+
+    options = {
+        "instructions": {"recency": lambda item: item.get("created_at")},
+        "characters": {"name_key": "name"},
+        "documents": {"name_key": "title", "recency": document_recency},
+    }
+
+    packed: Dict[str, Any] = {}
+    total = 0
+    for section, render in renderers.items():
+        packed[section] = select_items(
+            context.get(section) or [],
+            render,
+            budgets.get(section, 0),
+            focus=focus,
+            **options.get(section, {}),
+        )
+        total += packed[section]["tokens"]
+        if packed[section]["omitted"]:
+            logger.debug(f"Context section {section}: {packed[section]['omitted']} item(s) over budget")
+    packed["tokens"] = total
+    return packed
@@ -1,5 +1,5 @@
 """Project context builder for writing and agents."""
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy import select
@@ -9,6 +9,8 @@ from fastapi import HTTPException, status
 from app.models.project import Project
 from app.models.document import Document
 from app.models.character import Character
+from app.services import context_cache
+from app.services.document_service import document_summary_columns
 
 
 class ProjectContextService:
@@ -23,7 +25,40 @@ class ProjectContextService:
         user_id: UUID,
         document_preview_chars: int = 800,
     ) -> Dict[str, Any]:
-        """Collect project, characters, documents, and constraints."""
+        """
+        Collect project, characters, documents, and constraints.
+
+        Packs are cached per project revision (see context_cache), so repeated calls
+        within a workflow skip the queries until a write bumps the revision.
+        """
+        revision = await context_cache.get_revision(project_id)
+        if revision is not None:
+            cached = await context_cache.get_cached(project_id, revision, document_preview_chars)
+            if cached is not None:
+                if cached["owner_id"] != str(user_id):
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Project not found or access denied",
+                    )
+                return cached["context"]
+
+        project, context = await self._load_context(project_id, user_id, document_preview_chars)
+        if revision is not None:
+            await context_cache.store(
+                project_id,
+                revision,
+                document_preview_chars,
+                {"owner_id": str(project.owner_id), "context": context},
+            )
+        return context
+
+    async def _load_context(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        document_preview_chars: int,
+    ) -> Tuple[Project, Dict[str, Any]]:
+        """Run the context queries; returns the project and the pack."""
         project_result = await self.db.execute(
             select(Project).where(
                 Project.id == project_id,
@@ -38,9 +73,11 @@ class ProjectContextService:
             )
 
         documents_result = await self.db.execute(
-            select(Document).where(Document.project_id == project_id).order_by(Document.order_index.asc())
+            select(*document_summary_columns(document_preview_chars))
+            .where(Document.project_id == project_id)
+            .order_by(Document.order_index.asc())
         )
-        documents = documents_result.scalars().all()
+        documents = documents_result.all()
 
         characters_result = await self.db.execute(
             select(Character).where(Character.project_id == project_id)
@@ -68,7 +105,7 @@ class ProjectContextService:
                     }
                 )
 
-        return {
+        return project, {
             "project": {
                 "id": str(project.id),
                 "title": project.title,
@@ -89,8 +126,9 @@ class ProjectContextService:
                     "document_type": doc.document_type.value if doc.document_type else None,
                     "order_index": doc.order_index,
                     "word_count": doc.word_count,
-                    "metadata": doc.document_metadata or {},
-                    "content_preview": (doc.content or "")[:document_preview_chars],
+                    "metadata": doc.metadata or {},
+                    "content_preview": doc.content_preview or "",
+                    "updated_at": doc.updated_at.isoformat() if doc.updated_at else None,
                 }
                 for doc in documents
             ],
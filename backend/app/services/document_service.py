@@ -1,13 +1,59 @@
 """Document service"""
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from uuid import UUID
-from sqlalchemy import select, func
+import logging
+from sqlalchemy import select, func, literal, literal_column, update, case, cast, column, or_, true
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.config import settings
+from app.db.session import run_after_commit
 from app.models.document import Document
 from app.models.project import Project
 from app.schemas.document import DocumentCreate, DocumentUpdate
+from app.services.auth_cache import owns_project
+from app.services.context_cache import mark_project_stale
+
+logger = logging.getLogger(__name__)
+
+# Fields whose change affects the chunks or chunk metadata stored in Qdrant
+INDEXED_FIELDS = {"title", "content", "order_index", "document_type"}
+
+# Metadata keys needed to render a document in lists and context packs
+SUMMARY_METADATA_KEYS = (
+    "element_type",
+    "element_index",
+    "parent_id",
+    "current_version",
+    "min_word_count",
+    "max_word_count",
+    "summary",
+)
+
+
+def document_summary_columns(preview_chars: int) -> tuple:
+    """
+    Columns for a lightweight document projection.
+
+    The content preview is cut with left() and the metadata reduced to
+    SUMMARY_METADATA_KEYS in SQL, so neither full texts nor comment lists leave Postgres.
+    """
+    metadata_pairs = []
+    for key in SUMMARY_METADATA_KEYS:
+        metadata_pairs.extend([literal_column(f"'{key}'"), Document.document_metadata[key]])
+    return (
+        Document.id,
+        Document.title,
+        Document.document_type,
+        Document.order_index,
+        Document.word_count,
+        Document.project_id,
+        Document.created_at,
+        Document.updated_at,
+        func.left(Document.content, preview_chars).label("content_preview"),
+        func.jsonb_strip_nulls(func.jsonb_build_object(*metadata_pairs), type_=JSONB).label("metadata"),
+    )
 
 
 class DocumentService:
@@ -26,29 +72,19 @@ class DocumentService:
         self,
         project_id: UUID,
         user_id: UUID
-    ) -> Project:
+    ) -> None:
         """
         Verify that user owns the project.
 
         Raises:
             HTTPException: If project not found or not owned by user
         """
-        result = await self.db.execute(
-            select(Project).where(
-                Project.id == project_id,
-                Project.owner_id == user_id
-            )
-        )
-        project = result.scalar_one_or_none()
-
-        if not project:
+        if not await owns_project(self.db, user_id, project_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Project not found or access denied"
             )
 
-        return project
-
     async def get_by_id(
         self,
         document_id: UUID,
@@ -74,6 +110,103 @@ class DocumentService:
         )
         return result.scalar_one_or_none()
 
+    async def get_history_header(self, document_id: UUID, user_id: UUID) -> Optional[Any]:
+        """
+        Document columns needed to list its versions and comments (with ownership check).
+
+        Neither the content nor the metadata blob leaves Postgres: only a few metadata
+        values, whether there is content and the number of comments.
+
+        Args:
+            document_id: Document ID
+            user_id: User ID
+
+        Returns:
+            Row (id, project_id, created_at, updated_at, word_count, has_content,
+            current_version, min_word_count, max_word_count, summary, comment_count)
+            if found and user has access
+        """
+        metadata = Document.document_metadata
+        comments = metadata["comments"]
+        result = await self.db.execute(
+            select(
+                Document.id,
+                Document.project_id,
+                Document.created_at,
+                Document.updated_at,
+                Document.word_count,
+                (func.length(func.btrim(func.coalesce(Document.content, ""))) > 0).label("has_content"),
+                metadata["current_version"].astext.label("current_version"),
+                metadata["min_word_count"].astext.label("min_word_count"),
+                metadata["max_word_count"].astext.label("max_word_count"),
+                metadata["summary"].astext.label("summary"),
+                case(
+                    (func.jsonb_typeof(comments) == "array", func.jsonb_array_length(comments)),
+                    else_=0,
+                ).label("comment_count"),
+            )
+            .join(Project)
+            .where(
+                Document.id == document_id,
+                Project.owner_id == user_id
+            )
+        )
+        return result.first()
+
+    async def list_comments(
+        self,
+        document_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        descending: bool = False,
+    ) -> List[Any]:
+        """
+        Page through the comments stored in a document's metadata (ownership is checked by the caller).
+
+        The array is expanded and filtered in SQL, ordered by (created_at, id) as
+        stored (ISO strings), so only the requested page is sent and decoded.
+
+        Args:
+            document_id: Document ID
+            limit: Maximum number of comments (None for all)
+            after: (created_at, id) of the last comment of the previous page
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Raw comment entries (dicts)
+        """
+        comments = Document.document_metadata["comments"]
+        entries = func.jsonb_array_elements(
+            case(
+                (func.jsonb_typeof(comments) == "array", comments),
+                else_=cast(literal("[]"), JSONB),
+            )
+        ).table_valued(column("value", JSONB)).alias("entry")
+        created_at = entries.c.value["created_at"].astext
+        comment_id = entries.c.value["id"].astext
+
+        query = select(entries.c.value).select_from(Document).join(entries, true()).where(Document.id == document_id)
+        if after is not None:
+            after_created_at, after_id = after
+            if descending:
+                query = query.where(
+                    created_at <= after_created_at,
+                    or_(created_at < after_created_at, comment_id < after_id),
+                )
+            else:
+                query = query.where(
+                    created_at >= after_created_at,
+                    or_(created_at > after_created_at, comment_id > after_id),
+                )
+        if descending:
+            query = query.order_by(created_at.desc(), comment_id.desc())
+        else:
+            query = query.order_by(created_at.asc(), comment_id.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
+        return [row.value for row in result]
+
     async def get_all_by_project(
         self,
         project_id: UUID,
@@ -116,6 +249,45 @@ class DocumentService:
 
         return list(documents), total
 
+    async def get_summaries_by_project(
+        self,
+        project_id: UUID,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        preview_chars: int = 280,
+    ) -> tuple[List[Any], int]:
+        """
+        Get lightweight document rows for a project (no full content, trimmed metadata).
+
+        Args:
+            project_id: Project ID
+            user_id: User ID (for ownership check)
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            preview_chars: Length of the content preview
+
+        Returns:
+            Tuple of (rows with document_summary_columns attributes, total count)
+        """
+        await self._verify_project_ownership(project_id, user_id)
+
+        count_result = await self.db.execute(
+            select(func.count(Document.id)).where(
+                Document.project_id == project_id
+            )
+        )
+        total = count_result.scalar()
+
+        result = await self.db.execute(
+            select(*document_summary_columns(preview_chars))
+            .where(Document.project_id == project_id)
+            .order_by(Document.order_index.asc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.all()), total
+
     async def create(
         self,
         document_data: DocumentCreate,
@@ -148,11 +320,9 @@ class DocumentService:
         )
 
         self.db.add(document)
-        await self.db.commit()
-        await self.db.refresh(document)
-
-        # Update project word count
-        await self._update_project_word_count(document_data.project_id)
+        await self._adjust_project_word_count(document.project_id, word_count)
+        mark_project_stale(self.db, document.project_id)
+        await self.db.flush()
 
         return document
 
@@ -183,6 +353,8 @@ class DocumentService:
                 detail="Document not found"
             )
 
+        previous_word_count = document.word_count or 0
+
         # Update fields
         update_data = document_data.model_dump(exclude_unset=True)
         if "metadata" in update_data:
@@ -194,11 +366,14 @@ class DocumentService:
         if document_data.content is not None:
             document.word_count = self._calculate_word_count(document.content)
 
-        await self.db.commit()
-        await self.db.refresh(document)
+        await self._adjust_project_word_count(
+            document.project_id, (document.word_count or 0) - previous_word_count
+        )
+        mark_project_stale(self.db, document.project_id)
+        await self.db.flush()
 
-        # Update project word count
-        await self._update_project_word_count(document.project_id)
+        if INDEXED_FIELDS.intersection(update_data):
+            self._schedule_reindex(document.id)
 
         return document
 
@@ -220,24 +395,53 @@ class DocumentService:
         project_id = document.project_id
 
         await self.db.delete(document)
-        await self.db.commit()
+        await self._adjust_project_word_count(project_id, -(document.word_count or 0))
+        mark_project_stale(self.db, project_id)
+        await self.db.flush()
 
-        # Update project word count
-        await self._update_project_word_count(project_id)
+        self._schedule_vector_removal(project_id, document_id)
 
         return True
 
-    async def _update_project_word_count(self, project_id: UUID):
-        """Update total word count for a project."""
-        result = await self.db.execute(
-            select(func.sum(Document.word_count)).where(
-                Document.project_id == project_id
-            )
-        )
-        total_words = result.scalar() or 0
+    def _schedule_reindex(self, document_id: UUID) -> None:
+        """Queue an incremental RAG reindex of an edited document once the edit is committed."""
+        if not settings.RAG_AUTO_REINDEX:
+            return
+        from app.tasks.indexing import reindex_document_task
+
+        def enqueue() -> None:
+            try:
+                reindex_document_task.delay(str(document_id))
+            except Exception as exc:
+                logger.warning(f"Could not queue reindex for document {document_id}: {exc}")
+
+        run_after_commit(self.db, enqueue)
+
+    def _schedule_vector_removal(self, project_id: UUID, document_id: UUID) -> None:
+        """Queue deletion of a removed document's vectors once the deletion is committed."""
+        if not settings.RAG_AUTO_REINDEX:
+            return
+        from app.tasks.indexing import delete_document_vectors_task
+
+        def enqueue() -> None:
+            try:
+                delete_document_vectors_task.delay(str(project_id), str(document_id))
+            except Exception as exc:
+                logger.warning(f"Could not queue vector removal for document {document_id}: {exc}")
 
-        # Update project
-        project = await self.db.get(Project, project_id)
-        if project:
-            project.current_word_count = total_words
-            await self.db.commit()
+        run_after_commit(self.db, enqueue)
+
+    async def _adjust_project_word_count(self, project_id: UUID, delta: int) -> None:
+        """
+        Apply a word count change to the project total in the current transaction.
+
+        The total is maintained by delta; ProjectService.reconcile_word_counts fixes any drift.
+        """
+        if not delta:
+            return
+        await self.db.execute(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(current_word_count=func.coalesce(Project.current_word_count, 0) + delta)
+            .execution_options(synchronize_session="fetch")
+        )
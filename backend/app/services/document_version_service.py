@@ -0,0 +1,287 @@
+"""Document version service"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid5
+import asyncio
+import re
+
+from sqlalchemy import select, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.document import Document
+from app.models.document_version import DocumentVersion
+from app.services import version_codec
+
+_BASE_VERSION_NAMESPACE = UUID("8f6c2a52-2d0b-4c1e-9a63-4f1f0c9b7e21")
+
+# Everything but the content, so listing history never reads the stored texts
+SUMMARY_COLUMNS = (
+    DocumentVersion.id,
+    DocumentVersion.version,
+    DocumentVersion.created_at,
+    DocumentVersion.word_count,
+    DocumentVersion.min_word_count,
+    DocumentVersion.max_word_count,
+    DocumentVersion.summary,
+    DocumentVersion.instructions,
+    DocumentVersion.source_version_id,
+    DocumentVersion.source_version,
+    DocumentVersion.source_type,
+    DocumentVersion.source_comment_ids,
+)
+
+
+def parse_version(value: Optional[str]) -> tuple[int, int]:
+    """Parse a "v<major>[.<minor>]" label, defaulting to v1."""
+    if not value:
+        return (1, 0)
+    match = re.match(r"^v(?P<major>\d+)(?:\.(?P<minor>\d+))?$", value.strip())
+    if not match:
+        return (1, 0)
+    return (int(match.group("major")), int(match.group("minor") or 0))
+
+
+def format_version(major: int, minor: int) -> str:
+    """Format a version label ("v1", "v1.01", ...)."""
+    if minor <= 0:
+        return f"v{major}"
+    return f"v{major}.{minor:02d}"
+
+
+def next_version_label(latest: Optional[str]) -> str:
+    """Label following `latest` (minor bump), or "v1" for the first version."""
+    if not latest:
+        return "v1"
+    major, minor = parse_version(latest)
+    return format_version(major, minor + 1)
+
+
+def base_version_id(document_id: UUID) -> UUID:
+    """Stable id of a document's "v1", whether it is stored yet or not."""
+    return uuid5(_BASE_VERSION_NAMESPACE, f"{document_id}:v1")
+
+
+def base_version_summary(document: Any) -> Dict[str, Any]:
+    """
+    Summary of the "v1" of a document that has content but no stored history.
+
+    Reads list it without writing; the row is created with the same id and date
+    by create_base_version on the next write that needs history.
+
+    Args:
+        document: Document or row with id, created_at, word_count and metadata values
+            (min_word_count, max_word_count, summary)
+    """
+    return {
+        "id": base_version_id(document.id),
+        "version": "v1",
+        "created_at": document.created_at,
+        "word_count": document.word_count or 0,
+        "min_word_count": document.min_word_count,
+        "max_word_count": document.max_word_count,
+        "summary": document.summary,
+        "instructions": None,
+        "source_version_id": None,
+        "source_version": None,
+        "source_type": None,
+        "source_comment_ids": None,
+    }
+
+
+class DocumentVersionService:
+    """Service for document version history (ownership is checked by the caller)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_summaries(
+        self,
+        document_id: UUID,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        descending: bool = False,
+    ) -> List[Any]:
+        """
+        List versions of a document without their content, by (created_at, id).
+
+        Keyset pagination: `after` is the (created_at, id) of the last row of the
+        previous page, so every page is an index range scan whatever its position.
+
+        Args:
+            document_id: Document ID
+            limit: Maximum number of rows (None for all)
+            after: Sort key to continue from
+            descending: Newest first instead of oldest first
+
+        Returns:
+            Rows with the SUMMARY_COLUMNS attributes
+        """
+        query = select(*SUMMARY_COLUMNS).where(DocumentVersion.document_id == document_id)
+        if after is not None:
+            created_at, version_id = after
+            if descending:
+                query = query.where(
+                    DocumentVersion.created_at <= created_at,
+                    or_(DocumentVersion.created_at < created_at, DocumentVersion.id < version_id),
+                )
+            else:
+                query = query.where(
+                    DocumentVersion.created_at >= created_at,
+                    or_(DocumentVersion.created_at > created_at, DocumentVersion.id > version_id),
+                )
+        if descending:
+            query = query.order_by(DocumentVersion.created_at.desc(), DocumentVersion.id.desc())
+        else:
+            query = query.order_by(DocumentVersion.created_at.asc(), DocumentVersion.id.asc())
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
+        return list(result.all())
+
+    async def count(self, document_id: UUID) -> int:
+        """Number of versions of a document (index-only count)."""
+        result = await self.db.execute(
+            select(func.count()).select_from(DocumentVersion).where(DocumentVersion.document_id == document_id)
+        )
+        return result.scalar_one()
+
+    async def get(self, document_id: UUID, version_id: UUID) -> Optional[DocumentVersion]:
+        """Get one version; read its text with get_content()."""
+        result = await self.db.execute(
+            select(DocumentVersion).where(
+                DocumentVersion.id == version_id,
+                DocumentVersion.document_id == document_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_labels(self, document_id: UUID, version_ids: Iterable[UUID]) -> Dict[str, str]:
+        """Map version ids to their labels."""
+        ids = list(version_ids)
+        if not ids:
+            return {}
+        result = await self.db.execute(
+            select(DocumentVersion.id, DocumentVersion.version).where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.id.in_(ids),
+            )
+        )
+        return {str(row.id): row.version for row in result.all()}
+
+    async def get_latest(self, document_id: UUID) -> Optional[Any]:
+        """Return (id, version) of the most recent version, if any."""
+        result = await self.db.execute(
+            select(DocumentVersion.id, DocumentVersion.version)
+            .where(DocumentVersion.document_id == document_id)
+            .order_by(DocumentVersion.created_at.desc())
+            .limit(1)
+        )
+        return result.first()
+
+    async def _encode_content(self, document_id: UUID, content: str) -> Dict[str, Any]:
+        """
+        Pick the storage for a new version: a delta against the latest snapshot while it
+        stays small, otherwise a fresh compressed snapshot. Compression and diffing
+        are CPU-bound and run in a worker thread.
+        """
+        snapshot = await asyncio.to_thread(version_codec.compress_text, content)
+        result = await self.db.execute(
+            select(DocumentVersion)
+            .where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.base_version_id.is_(None),
+            )
+            .order_by(DocumentVersion.created_at.desc())
+            .limit(1)
+        )
+        base = result.scalar_one_or_none()
+        if base is not None and settings.VERSION_SNAPSHOT_INTERVAL > 1:
+            deltas = (
+                await self.db.execute(
+                    select(func.count(DocumentVersion.id)).where(DocumentVersion.base_version_id == base.id)
+                )
+            ).scalar() or 0
+            if deltas < settings.VERSION_SNAPSHOT_INTERVAL - 1:
+                base_content = await self.get_content(base)
+                delta = await asyncio.to_thread(version_codec.make_delta, base_content, content)
+                if len(delta) < len(snapshot) * settings.VERSION_DELTA_MAX_RATIO:
+                    return {
+                        "content_encoding": version_codec.DELTA,
+                        "content_data": delta,
+                        "base_version_id": base.id,
+                    }
+
+        return {"content_encoding": version_codec.SNAPSHOT, "content_data": snapshot}
+
+    async def get_content(self, version: DocumentVersion) -> str:
+        """Return the full text of a version, decoding snapshots and deltas off the event loop."""
+        if version.content_encoding == version_codec.SNAPSHOT:
+            return await asyncio.to_thread(version_codec.decompress_text, version.content_data)
+        if version.content_encoding == version_codec.DELTA:
+            base = await self.db.get(DocumentVersion, version.base_version_id)
+            base_content = await self.get_content(base) if base is not None else ""
+            return await asyncio.to_thread(version_codec.apply_delta, base_content, version.content_data)
+        return version.content or ""
+
+    async def add(self, document_id: UUID, content: str, **fields: Any) -> DocumentVersion:
+        """
+        Insert a new version row.
+
+        The content is stored compressed (see version_codec). The row is flushed, not
+        committed, so it lands in the same transaction as the document update that
+        makes it current.
+
+        Args:
+            document_id: Document ID
+            content: Full text of the version
+            **fields: Other DocumentVersion column values (version, word_count, ...)
+
+        Returns:
+            Created version
+        """
+        storage = await self._encode_content(document_id, content)
+        version = DocumentVersion(document_id=document_id, **storage, **fields)
+        self.db.add(version)
+        await self.db.flush()
+        return version
+
+    async def find_by_label(self, document_id: UUID, label: str) -> Optional[Any]:
+        """Return (id, version) of the latest version carrying `label`."""
+        result = await self.db.execute(
+            select(DocumentVersion.id, DocumentVersion.version)
+            .where(
+                DocumentVersion.document_id == document_id,
+                DocumentVersion.version == label,
+            )
+            .order_by(DocumentVersion.created_at.desc())
+            .limit(1)
+        )
+        return result.first()
+
+    async def create_base_version(self, document: Document) -> DocumentVersion:
+        """
+        Snapshot a document's current content as "v1".
+
+        Used for documents that have content but no history yet.
+
+        Args:
+            document: Document
+
+        Returns:
+            Created version
+        """
+        content = (document.content or "").strip()
+        metadata = document.document_metadata or {}
+        # Same id and date as the virtual v1 listed before it existed (see base_version_summary)
+        return await self.add(
+            document.id,
+            id=base_version_id(document.id),
+            created_at=document.created_at,
+            version="v1",
+            content=content,
+            word_count=len(content.split()),
+            min_word_count=metadata.get("min_word_count"),
+            max_word_count=metadata.get("max_word_count"),
+            summary=metadata.get("summary"),
+        )
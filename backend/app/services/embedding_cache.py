@@ -0,0 +1,143 @@
+"""Redis-backed embedding cache keyed by model name and text hash."""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import logging
+import threading
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.services.embeddings import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+_cached_embeddings: Optional["CachedEmbeddings"] = None
+_lock = threading.Lock()
+
+
+def _to_float16(vector: List[float]) -> np.ndarray:
+    return np.asarray(vector, dtype=np.float16)
+
+
+class CachedEmbeddings(Embeddings):
+    """Serve embeddings from Redis (float16, LRU-evicted) before calling the model."""
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        max_entries: int,
+        query_cache_size: int,
+    ) -> None:
+        self.embeddings = embeddings
+        self.prefix = f"emb:{model_name}"
+        self.lru_key = f"{self.prefix}:lru"
+        self.max_entries = max_entries
+        self.query_cache_size = query_cache_size
+        self._queries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._queries_lock = threading.Lock()
+
+    def _key(self, kind: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{kind}:{digest}"
+
+    def _load(self, keys: List[str]) -> List[Optional[bytes]]:
+        try:
+            client = get_redis()
+            values = client.mget(keys)
+            hits = {key: time.time() for key, value in zip(keys, values) if value is not None}
+            if hits:
+                client.zadd(self.lru_key, hits)
+            return values
+        except Exception as exc:
+            logger.warning(f"Embedding cache read failed: {exc}")
+            return [None] * len(keys)
+
+    def _store(self, entries: Dict[str, bytes]) -> None:
+        try:
+            client = get_redis()
+            now = time.time()
+            pipe = client.pipeline(transaction=False)
+            pipe.mset(entries)
+            pipe.zadd(self.lru_key, {key: now for key in entries})
+            pipe.zcard(self.lru_key)
+            size = pipe.execute()[-1]
+            overflow = size - self.max_entries
+            if overflow > 0:
+                evicted = [key for key, _ in client.zpopmin(self.lru_key, overflow)]
+                if evicted:
+                    client.delete(*evicted)
+        except Exception as exc:
+            logger.warning(f"Embedding cache write failed: {exc}")
+
+    def _embed(self, kind: str, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        missing: Dict[str, int] = {}
+
+        for idx, (key, value) in enumerate(zip(keys, self._load(keys))):
+            if value is not None:
+                vectors[idx] = np.frombuffer(value, dtype=np.float16).astype(np.float32).tolist()
+            elif key not in missing:
+                missing[key] = idx
+
+        if missing:
+            missing_texts = [texts[idx] for idx in missing.values()]
+            if kind == "q":
+                computed = [self.embeddings.embed_query(missing_texts[0])]
+            else:
+                computed = self.embeddings.embed_documents(missing_texts)
+            entries: Dict[str, bytes] = {}
+            for key, vector in zip(missing, computed):
+                packed = _to_float16(vector)
+                entries[key] = packed.tobytes()
+                # Round-trip through float16 so cache hits and misses return identical vectors
+                missing[key] = packed.astype(np.float32).tolist()
+            self._store(entries)
+            for idx, key in enumerate(keys):
+                if vectors[idx] is None:
+                    vectors[idx] = missing[key]
+
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed document chunks, computing only those missing from the cache."""
+        if not texts:
+            return []
+        return self._embed("d", texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, checking the in-process LRU before Redis."""
+        with self._queries_lock:
+            vector = self._queries.get(text)
+            if vector is not None:
+                self._queries.move_to_end(text)
+                return vector
+
+        vector = self._embed("q", [text])[0]
+        with self._queries_lock:
+            self._queries[text] = vector
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+        return vector
+
+
+def get_cached_embeddings() -> Embeddings:
+    """Return the shared embedding model wrapped by the cache (or bare if disabled)."""
+    global _cached_embeddings
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return get_embeddings()
+    if _cached_embeddings is None:
+        with _lock:
+            if _cached_embeddings is None:
+                _cached_embeddings = CachedEmbeddings(
+                    get_embeddings(),
+                    model_name=settings.EMBEDDING_MODEL,
+                    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                    query_cache_size=settings.EMBEDDING_QUERY_CACHE_SIZE,
+                )
+    return _cached_embeddings
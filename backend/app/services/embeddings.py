@@ -0,0 +1,86 @@
+"""Process-wide embedding model shared by the API and Celery workers."""
+from typing import Optional
+import logging
+import os
+import threading
+import time
+
+from langchain_community.embeddings import HuggingFaceEmbeddings
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_embeddings: Optional[HuggingFaceEmbeddings] = None
+_lock = threading.Lock()
+
+
+def _model_memory_mb(model) -> float:
+    """Approximate memory held by the model parameters and buffers, in MB."""
+    total = 0
+    for tensor in list(model.parameters()) + list(model.buffers()):
+        total += tensor.numel() * tensor.element_size()
+    return total / (1024 * 1024)
+
+
+def _enforce_memory_budget(embeddings: HuggingFaceEmbeddings) -> None:
+    """Keep the loaded model under EMBEDDING_MEMORY_BUDGET_MB (0 disables the check)."""
+    budget = settings.EMBEDDING_MEMORY_BUDGET_MB
+    model = embeddings.client
+    used = _model_memory_mb(model)
+    logger.info("Embedding model %s loaded (%.0f MB)", settings.EMBEDDING_MODEL, used)
+    if budget <= 0 or used <= budget:
+        return
+
+    # Half precision halves the footprint; only do it where fp16 inference is supported
+    if str(model.device).startswith("cuda"):
+        model.half()
+        used = _model_memory_mb(model)
+        logger.info("Embedding model converted to fp16 (%.0f MB)", used)
+        if used <= budget:
+            return
+
+    raise RuntimeError(
+        f"Embedding model {settings.EMBEDDING_MODEL} needs {used:.0f} MB, "
+        f"above EMBEDDING_MEMORY_BUDGET_MB={budget}"
+    )
+
+
+def _configure_torch_threads() -> None:
+    """Pin torch intra-op threads; by default torch already spreads one encode over all cores."""
+    import torch
+
+    if settings.EMBEDDING_NUM_THREADS > 0:
+        torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+    logger.info("Embedding model uses %d torch threads (%s CPUs)", torch.get_num_threads(), os.cpu_count())
+
+
+def _load_embeddings() -> HuggingFaceEmbeddings:
+    started = time.perf_counter()
+    _configure_torch_threads()
+    model_kwargs = {}
+    if settings.EMBEDDING_DEVICE:
+        model_kwargs["device"] = settings.EMBEDDING_DEVICE
+    embeddings = HuggingFaceEmbeddings(
+        model_name=settings.EMBEDDING_MODEL,
+        model_kwargs=model_kwargs,
+        encode_kwargs={"batch_size": settings.EMBEDDING_BATCH_SIZE},
+    )
+    _enforce_memory_budget(embeddings)
+    logger.info("Embedding model ready in %.1fs", time.perf_counter() - started)
+    return embeddings
+
+
+def get_embeddings() -> HuggingFaceEmbeddings:
+    """Return the shared embedding model, loading it on first use."""
+    global _embeddings
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                _embeddings = _load_embeddings()
+    return _embeddings
+
+
+def warmup_embeddings() -> None:
+    """Load the model and run one encode so the first request does not pay for it."""
+    get_embeddings().embed_query("warmup")
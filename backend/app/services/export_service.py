@@ -0,0 +1,169 @@
+"""EPUB and DOCX exports with a disk cache of builds and rendered chapters"""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import asyncio
+import hashlib
+import logging
+import os
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.process_pool import get_process_pool, run_in_process
+from app.models.document import Document
+from app.services import exporters
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "epub": ("application/epub+zip", ".epub"),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", ".docx"),
+}
+
+# Bump when the rendering changes, so cached chapters and builds are not reused
+RENDER_VERSION = "1"
+
+_last_prune: Optional[float] = None
+
+
+def _export_pool() -> ProcessPoolExecutor:
+    return get_process_pool("export", settings.EXPORT_WORKERS, max_tasks_per_child=settings.EXPORT_TASKS_PER_WORKER)
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class ExportService:
+    """Service building EPUB/DOCX files for a project or a single document"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.cache_dir = Path(settings.EXPORT_CACHE_DIR)
+
+    async def build(
+        self,
+        fmt: str,
+        scope_id: UUID,
+        title: str,
+        description: Optional[str],
+        *criteria: Any,
+        show_title: bool = True,
+    ) -> Path:
+        """
+        Return the path of an export file, building it only when its inputs changed.
+
+        A build is keyed by a hash of (document ids, current_version labels,
+        updated_at) plus the title page, so an unchanged manuscript is served
+        straight from disk. When something changed, only chapters without a cached
+        fragment have their content loaded and rendered; packaging reuses the rest.
+        Rendering and packaging run in export worker processes.
+
+        Args:
+            fmt: "epub" or "docx"
+            scope_id: Project or document ID the file belongs to (used in its name)
+            title: Book title
+            description: Optional description for the title page and metadata
+            criteria: WHERE clauses selecting the documents
+            show_title: Add a title page (DOCX) before the chapters
+
+        Returns:
+            Path of the built file
+        """
+        _, extension = EXPORT_FORMATS[fmt]
+
+        # Fingerprint inputs only: no content leaves Postgres here
+        result = await self.db.execute(
+            select(
+                Document.id,
+                Document.updated_at,
+                Document.document_metadata["current_version"].astext.label("current_version"),
+            )
+            .where(*criteria)
+            .order_by(Document.order_index.asc())
+        )
+        fingerprints: Dict[UUID, str] = {
+            row.id: _digest(RENDER_VERSION, row.id, row.current_version, row.updated_at.isoformat() if row.updated_at else "")
+            for row in result
+        }
+
+        key = _digest(RENDER_VERSION, fmt, title, description, show_title, *fingerprints.values())
+        output_path = self.cache_dir / "builds" / f"{scope_id}-{key[:32]}{extension}"
+        if output_path.exists():
+            os.utime(output_path)  # Last use, for pruning
+            return output_path
+
+        missing = await asyncio.to_thread(
+            lambda: [
+                document_id for document_id, fingerprint in fingerprints.items()
+                if not (self.cache_dir / "chapters" / f"{fingerprint}.json").exists()
+            ]
+        )
+        pool = _export_pool()
+        rendered = 0
+        for start in range(0, len(missing), settings.EXPORT_DOCUMENT_BATCH_SIZE):
+            batch_ids = missing[start:start + settings.EXPORT_DOCUMENT_BATCH_SIZE]
+            rows = await self.db.execute(
+                select(Document.id, Document.title, Document.content).where(Document.id.in_(batch_ids))
+            )
+            chapters: List[Dict[str, Any]] = [
+                {"fingerprint": fingerprints[row.id], "title": row.title, "content": row.content}
+                for row in rows
+            ]
+            rendered += await run_in_process(pool, exporters.render_fragments, str(self.cache_dir), chapters)
+
+        book_meta = {
+            "identifier": str(scope_id),
+            "title": title,
+            "description": description,
+            "language": settings.EXPORT_LANGUAGE,
+            "show_title": show_title,
+        }
+        await run_in_process(
+            pool,
+            exporters.assemble,
+            fmt,
+            str(output_path),
+            book_meta,
+            str(self.cache_dir),
+            list(fingerprints.values()),
+        )
+        logger.info(
+            f"Built {fmt} export {output_path.name}: {len(fingerprints)} chapter(s), {rendered} rendered"
+        )
+        await self._remove_previous_builds(scope_id, extension, output_path)
+        await _maybe_prune()
+        return output_path
+
+    async def _remove_previous_builds(self, scope_id: UUID, extension: str, current: Path) -> None:
+        """Drop older builds of the same export (kept a minute for downloads in flight)."""
+
+        def remove() -> None:
+            for path in current.parent.glob(f"{scope_id}-*{extension}"):
+                try:
+                    if path != current and path.stat().st_mtime < current.stat().st_mtime - 60:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+
+        await asyncio.to_thread(remove)
+
+
+async def _maybe_prune() -> None:
+    """Delete builds and chapters unused for EXPORT_CACHE_MAX_AGE_DAYS, at most hourly per process."""
+    global _last_prune
+    now = time.monotonic()
+    if _last_prune is not None and now - _last_prune < 3600:
+        return
+    _last_prune = now
+    removed = await asyncio.to_thread(
+        exporters.prune,
+        settings.EXPORT_CACHE_DIR,
+        settings.EXPORT_CACHE_MAX_AGE_DAYS * 24 * 3600,
+    )
+    if removed:
+        logger.info(f"Pruned {removed} export cache file(s)")
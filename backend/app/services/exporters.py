@@ -0,0 +1,169 @@
+"""EPUB and DOCX builders, run in export worker processes."""
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import os
+import re
+import tempfile
+import time
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+def _fragment_path(cache_dir: str, fingerprint: str) -> Path:
+    return Path(cache_dir) / "chapters" / f"{fingerprint}.json"
+
+
+def _write_atomic(path: Path, write) -> None:
+    """Write through a temporary file renamed into place, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def parse_blocks(content: str) -> List[Dict[str, Any]]:
+    """Split Markdown text into headings and paragraphs (inline markup is kept as is)."""
+    blocks: List[Dict[str, Any]] = []
+    for raw in re.split(r"\n\s*\n", content or ""):
+        text = raw.strip()
+        if not text:
+            continue
+        match = _HEADING_RE.match(text)
+        if match and "\n" not in text:
+            blocks.append({"kind": "heading", "level": len(match.group(1)), "text": match.group(2).strip()})
+        else:
+            blocks.append({"kind": "paragraph", "text": " ".join(line.strip() for line in text.splitlines())})
+    return blocks
+
+
+def render_chapter(title: Optional[str], content: Optional[str]) -> Dict[str, Any]:
+    """Chapter fragment shared by both formats: parsed blocks plus the EPUB XHTML body."""
+    blocks = parse_blocks(content or "")
+    html = [f"<h1>{escape(title)}</h1>"] if title else []
+    for block in blocks:
+        if block["kind"] == "heading":
+            # The chapter title is the h1, content headings move one level down
+            level = min(block["level"] + 1, 6)
+            html.append(f"<h{level}>{escape(block['text'])}</h{level}>")
+        else:
+            html.append(f"<p>{escape(block['text'])}</p>")
+    return {"title": title or "", "blocks": blocks, "xhtml": "\n".join(html)}
+
+
+def render_fragments(cache_dir: str, chapters: List[Dict[str, Any]]) -> int:
+    """
+    Render chapters whose fragment is not cached yet.
+
+    Args:
+        cache_dir: Export cache directory
+        chapters: {"fingerprint", "title", "content"} items
+
+    Returns:
+        Number of fragments written
+    """
+    written = 0
+    for chapter in chapters:
+        path = _fragment_path(cache_dir, chapter["fingerprint"])
+        if path.exists():
+            continue
+        fragment = render_chapter(chapter.get("title"), chapter.get("content"))
+        _write_atomic(path, lambda tmp: Path(tmp).write_text(json.dumps(fragment), encoding="utf-8"))
+        written += 1
+    return written
+
+
+def _load_fragments(cache_dir: str, fingerprints: List[str]):
+    now = time.time()
+    for fingerprint in fingerprints:
+        path = _fragment_path(cache_dir, fingerprint)
+        fragment = json.loads(path.read_text(encoding="utf-8"))
+        os.utime(path, (now, now))  # Last use, for pruning
+        yield fragment
+
+
+def _build_epub(path: str, book_meta: Dict[str, Any], fragments) -> None:
+    from ebooklib import epub
+
+    book = epub.EpubBook()
+    book.set_identifier(book_meta["identifier"])
+    book.set_title(book_meta["title"])
+    book.set_language(book_meta["language"])
+    if book_meta.get("description"):
+        book.add_metadata("DC", "description", book_meta["description"])
+
+    chapters = []
+    for position, fragment in enumerate(fragments):
+        chapter = epub.EpubHtml(
+            title=fragment["title"] or f"{position + 1}",
+            file_name=f"chapter_{position:05d}.xhtml",
+            lang=book_meta["language"],
+        )
+        chapter.content = fragment["xhtml"]
+        book.add_item(chapter)
+        chapters.append(chapter)
+
+    book.toc = chapters
+    book.spine = ["nav", *chapters]
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+    epub.write_epub(path, book)
+
+
+def _build_docx(path: str, book_meta: Dict[str, Any], fragments) -> None:
+    from docx import Document
+
+    document = Document()
+    document.core_properties.title = book_meta["title"]
+    document.core_properties.language = book_meta["language"]
+    if book_meta.get("show_title"):
+        document.add_heading(book_meta["title"], level=0)
+        if book_meta.get("description"):
+            document.add_paragraph(book_meta["description"])
+
+    for position, fragment in enumerate(fragments):
+        if position or book_meta.get("show_title"):
+            document.add_page_break()
+        if fragment["title"]:
+            document.add_heading(fragment["title"], level=1)
+        for block in fragment["blocks"]:
+            if block["kind"] == "heading":
+                document.add_heading(block["text"], level=min(block["level"] + 1, 9))
+            else:
+                document.add_paragraph(block["text"])
+
+    document.save(path)
+
+
+BUILDERS = {"epub": _build_epub, "docx": _build_docx}
+
+
+def assemble(fmt: str, output_path: str, book_meta: Dict[str, Any], cache_dir: str, fingerprints: List[str]) -> str:
+    """Package cached chapter fragments into an EPUB or DOCX file written at output_path."""
+    builder = BUILDERS[fmt]
+    _write_atomic(Path(output_path), lambda tmp: builder(tmp, book_meta, _load_fragments(cache_dir, fingerprints)))
+    return output_path
+
+
+def prune(cache_dir: str, max_age_seconds: float) -> int:
+    """Delete builds and chapter fragments not used within max_age_seconds."""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for folder in ("chapters", "builds"):
+        directory = Path(cache_dir) / folder
+        if not directory.is_dir():
+            continue
+        for entry in os.scandir(directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+    return removed
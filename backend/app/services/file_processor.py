@@ -1,16 +1,34 @@
 """File processing service for document imports"""
-import os
+import asyncio
 import re
-from typing import Tuple
-from pathlib import Path
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Tuple
+
+from app.core.config import settings
+from app.core.process_pool import get_process_pool, run_in_process
+
+# Bytes copied per read when spooling an upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _parser_pool() -> ProcessPoolExecutor:
+    return get_process_pool(
+        "upload-parser",
+        settings.UPLOAD_PARSE_WORKERS,
+        max_tasks_per_child=settings.UPLOAD_PARSE_TASKS_PER_WORKER,
+    )
+
+
+class FileTooLargeError(Exception):
+    """Raised when an upload goes over MAX_UPLOAD_SIZE while it is being read"""
 
 
 class FileProcessor:
     """Process uploaded files and extract content"""
 
     SUPPORTED_EXTENSIONS = {'.txt', '.docx', '.pdf', '.md'}
-    MAX_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
 
     @staticmethod
     def is_supported(filename: str) -> bool:
@@ -26,9 +44,10 @@ class FileProcessor:
         return len(words)
 
     @staticmethod
-    async def process_txt(file_content: bytes) -> str:
+    def process_txt(path: str) -> str:
         """Process TXT file"""
         try:
+            file_content = Path(path).read_bytes()
             # Try UTF-8 first, then fall back to other encodings
             try:
                 return file_content.decode('utf-8')
@@ -41,21 +60,18 @@ class FileProcessor:
             raise Exception(f"Error processing TXT file: {str(e)}")
 
     @staticmethod
-    async def process_md(file_content: bytes) -> str:
+    def process_md(path: str) -> str:
         """Process Markdown file"""
         # Markdown is just text
-        return await FileProcessor.process_txt(file_content)
+        return FileProcessor.process_txt(path)
 
     @staticmethod
-    async def process_docx(file_content: bytes) -> str:
+    def process_docx(path: str) -> str:
         """Process DOCX file"""
         try:
             from docx import Document
-            from io import BytesIO
 
-            # Create a temporary file-like object
-            doc_io = BytesIO(file_content)
-            doc = Document(doc_io)
+            doc = Document(path)
 
             # Extract all paragraphs
             full_text = []
@@ -71,22 +87,20 @@ class FileProcessor:
             raise Exception(f"Error processing DOCX file: {str(e)}")
 
     @staticmethod
-    async def process_pdf(file_content: bytes) -> str:
+    def process_pdf(path: str) -> str:
         """Process PDF file"""
         try:
             import PyPDF2
-            from io import BytesIO
 
-            # Create a temporary file-like object
-            pdf_io = BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_io)
+            with open(path, 'rb') as pdf_file:
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
 
-            # Extract text from all pages
-            full_text = []
-            for page in pdf_reader.pages:
-                text = page.extract_text()
-                if text.strip():
-                    full_text.append(text)
+                # Extract text from all pages
+                full_text = []
+                for page in pdf_reader.pages:
+                    text = page.extract_text()
+                    if text.strip():
+                        full_text.append(text)
 
             return '\n\n'.join(full_text)
 
@@ -96,18 +110,62 @@ class FileProcessor:
             raise Exception(f"Error processing PDF file: {str(e)}")
 
     @classmethod
-    async def process_file(cls, filename: str, file_content: bytes) -> Tuple[str, int]:
+    def extract(cls, ext: str, path: str) -> Tuple[str, int]:
+        """Parse a spooled file and count its words (runs in a parser process)"""
+        if ext == '.txt':
+            content = cls.process_txt(path)
+        elif ext == '.md':
+            content = cls.process_md(path)
+        elif ext == '.docx':
+            content = cls.process_docx(path)
+        elif ext == '.pdf':
+            content = cls.process_pdf(path)
+        else:
+            raise Exception(f"Unsupported file type: {ext}")
+
+        return content, cls.count_words(content)
+
+    @staticmethod
+    def spool(source: BinaryIO, destination: BinaryIO) -> int:
+        """
+        Copy an upload chunk by chunk, stopping as soon as it exceeds MAX_UPLOAD_SIZE
+
+        Returns:
+            Number of bytes copied
+
+        Raises:
+            FileTooLargeError if the upload is over the limit
+        """
+        size = 0
+        while True:
+            chunk = source.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return size
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                raise FileTooLargeError(
+                    f"File too large. Maximum size: {settings.MAX_UPLOAD_SIZE / (1024 * 1024):.0f} MB"
+                )
+            destination.write(chunk)
+
+    @classmethod
+    async def process_file(cls, filename: str, source: BinaryIO) -> Tuple[str, int]:
         """
         Process uploaded file and return content and word count
 
+        The upload is copied to a temporary file on disk and parsed in a worker
+        process, so neither the copy nor PDF/DOCX parsing runs on the event loop
+        and the API process never holds the raw file in memory.
+
         Args:
             filename: Name of the file
-            file_content: Binary content of the file
+            source: Binary file object with the upload (e.g. UploadFile.file)
 
         Returns:
             Tuple of (content, word_count)
 
         Raises:
+            FileTooLargeError if the file is over MAX_UPLOAD_SIZE
             Exception if file processing fails
         """
         if not cls.is_supported(filename):
@@ -116,26 +174,12 @@ class FileProcessor:
                 f"File type '{ext}' not supported. Supported types: {', '.join(cls.SUPPORTED_EXTENSIONS)}"
             )
 
-        if len(file_content) > cls.MAX_FILE_SIZE:
-            size_mb = len(file_content) / (1024 * 1024)
-            raise Exception(
-                f"File too large ({size_mb:.1f} MB). Maximum size: {cls.MAX_FILE_SIZE / (1024 * 1024)} MB"
-            )
-
-        # Process based on file type
         ext = Path(filename).suffix.lower()
+        upload_dir = Path(settings.UPLOAD_DIR)
+        upload_dir.mkdir(parents=True, exist_ok=True)
 
-        if ext == '.txt':
-            content = await cls.process_txt(file_content)
-        elif ext == '.md':
-            content = await cls.process_md(file_content)
-        elif ext == '.docx':
-            content = await cls.process_docx(file_content)
-        elif ext == '.pdf':
-            content = await cls.process_pdf(file_content)
-        else:
-            raise Exception(f"Unsupported file type: {ext}")
-
-        word_count = cls.count_words(content)
+        with tempfile.NamedTemporaryFile(dir=upload_dir, suffix=ext) as spooled:
+            await asyncio.to_thread(cls.spool, source, spooled)
+            spooled.flush()
+            return await run_in_process(_parser_pool(), cls.extract, ext, spooled.name)
 
-        return content, word_count
@@ -0,0 +1,152 @@
+"""Bulk indexing pipeline: stream documents, embed in batches, upsert in parallel."""
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+from qdrant_client.http import models as qdrant_models
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.document import Document
+from app.services.rag_service import RagService
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class IndexingPipeline:
+    """Incrementally index a whole project without loading it in memory at once."""
+
+    def __init__(self, db: AsyncSession, rag_service: Optional[RagService] = None) -> None:
+        self.db = db
+        self.rag_service = rag_service or RagService()
+        self.embed_batch_size = max(1, settings.INDEXING_EMBED_BATCH_SIZE)
+        self._upsert_slots = asyncio.Semaphore(max(1, settings.INDEXING_UPSERT_PARALLELISM))
+        # Every upsert task is kept until run() gathers it, so no failure goes unseen
+        self._upserts: List[asyncio.Task] = []
+
+    async def _upsert(self, points: List[qdrant_models.PointStruct]) -> None:
+        try:
+            # wait=False: Qdrant acknowledges once the batch is in its WAL
+            await asyncio.to_thread(self.rag_service._upsert_points, points, False)
+        finally:
+            self._upsert_slots.release()
+
+    async def _flush(self, pending: List[Tuple[str, Dict[str, Any]]]) -> float:
+        """Embed one batch, hand it to a background upsert and return the embedding time."""
+        started = time.perf_counter()
+        points = await asyncio.to_thread(self.rag_service._embed_points, pending)
+        elapsed = time.perf_counter() - started
+
+        # Bounded fan-out: the next batch is embedded while previous upserts are in flight
+        await self._upsert_slots.acquire()
+        self._upserts.append(asyncio.create_task(self._upsert(points)))
+        return elapsed
+
+    async def run(
+        self,
+        project_id: UUID,
+        prune_missing_documents: bool = True,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Index every document of a project, embedding only new or changed chunks.
+
+        Args:
+            project_id: Project ID
+            prune_missing_documents: Delete vectors of documents that no longer exist
+            on_progress: Awaited with (documents done, total documents)
+
+        Returns:
+            Chunk counts plus timing and throughput figures
+        """
+        started = time.perf_counter()
+        await asyncio.to_thread(self.rag_service._ensure_collection)
+        existing = await asyncio.to_thread(self.rag_service._existing_points, project_id)
+
+        total_documents = (
+            await self.db.execute(
+                select(func.count(Document.id)).where(Document.project_id == project_id)
+            )
+        ).scalar() or 0
+
+        seen_ids: Set[str] = set()
+        seen_documents: Set[str] = set()
+        payload_updates: List[Tuple[str, Dict[str, Any]]] = []
+        pending: List[Tuple[str, Dict[str, Any]]] = []
+        embedded = 0
+        embed_seconds = 0.0
+        documents_done = 0
+
+        # Plain rows rather than entities: nothing accumulates in the session identity map
+        stream = await self.db.stream(
+            select(
+                Document.id,
+                Document.title,
+                Document.content,
+                Document.order_index,
+                Document.document_type,
+            )
+            .where(Document.project_id == project_id)
+            .order_by(Document.order_index)
+            .execution_options(yield_per=settings.INDEXING_DOCUMENT_BATCH_SIZE)
+        )
+        try:
+            async for document in stream:
+                seen_documents.add(str(document.id))
+                for point_id, chunk in self.rag_service._chunk_document(project_id, document).items():
+                    seen_ids.add(point_id)
+                    stored = existing.get(point_id)
+                    if stored is None:
+                        pending.append((point_id, chunk))
+                    elif self.rag_service._payload_outdated(stored, chunk):
+                        payload_updates.append((point_id, chunk["payload"]))
+
+                    if len(pending) >= self.embed_batch_size:
+                        embed_seconds += await self._flush(pending)
+                        embedded += len(pending)
+                        pending = []
+
+                documents_done += 1
+                if on_progress:
+                    await on_progress(documents_done, total_documents)
+
+            if pending:
+                embed_seconds += await self._flush(pending)
+                embedded += len(pending)
+        finally:
+            await stream.close()
+            # return_exceptions: an error raised by the loop above is not hidden by an upsert failure
+            results = await asyncio.gather(*self._upserts, return_exceptions=True)
+            self._upserts = []
+
+        # Stale points are only removed once every new vector is known to be written
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            logger.error(f"Indexing project {project_id} failed: {len(failures)} upsert batch(es) not written")
+            raise failures[0]
+
+        stale_ids = [
+            point_id
+            for point_id, payload in existing.items()
+            if point_id not in seen_ids
+            and (prune_missing_documents or (payload.get("metadata") or {}).get("document_id") in seen_documents)
+        ]
+        await asyncio.to_thread(self.rag_service._refresh_payloads, payload_updates)
+        await asyncio.to_thread(self.rag_service._delete_points, stale_ids)
+
+        seconds = time.perf_counter() - started
+        stats = {
+            "documents": documents_done,
+            "chunks": len(seen_ids),
+            "embedded": embedded,
+            "deleted": len(stale_ids),
+            "seconds": round(seconds, 3),
+            "chunks_per_second": round(embedded / embed_seconds, 1) if embed_seconds else 0.0,
+        }
+        logger.info(f"Indexed project {project_id}: {stats}")
+        return stats
@@ -0,0 +1,215 @@
+"""Background job service"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import logging
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+from app.models.job import GenerationJob, JobStatus, JobType
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when the user cancelled it"""
+
+
+class JobService:
+    """Service for background job bookkeeping"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self,
+        job_type: JobType,
+        user_id: UUID,
+        params: Dict[str, Any],
+        project_id: Optional[UUID] = None,
+    ) -> GenerationJob:
+        """
+        Create a pending job.
+
+        Args:
+            job_type: Kind of work to run
+            user_id: Owner of the job
+            params: JSON-serialisable task parameters
+            project_id: Optional project the job belongs to
+
+        Returns:
+            Created job
+        """
+        job = GenerationJob(
+            job_type=job_type,
+            status=JobStatus.PENDING,
+            progress=0,
+            params=params,
+            user_id=user_id,
+            project_id=project_id,
+        )
+        self.db.add(job)
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
+
+    async def get(self, job_id: UUID) -> Optional[GenerationJob]:
+        """Get a job by ID without ownership check (for workers)."""
+        return await self.db.get(GenerationJob, job_id)
+
+    async def get_by_id(self, job_id: UUID, user_id: UUID) -> Optional[GenerationJob]:
+        """
+        Get job by ID (ensuring user owns it).
+
+        Args:
+            job_id: Job ID
+            user_id: User ID
+
+        Returns:
+            Job if found and owned by user, None otherwise
+        """
+        result = await self.db.execute(
+            select(GenerationJob).where(
+                GenerationJob.id == job_id,
+                GenerationJob.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_all_by_user(
+        self,
+        user_id: UUID,
+        project_id: Optional[UUID] = None,
+        skip: int = 0,
+        limit: int = 50,
+    ) -> tuple[List[GenerationJob], int]:
+        """
+        Get jobs for a user, most recent first.
+
+        Returns:
+            Tuple of (jobs list, total count)
+        """
+        filters = [GenerationJob.user_id == user_id]
+        if project_id:
+            filters.append(GenerationJob.project_id == project_id)
+
+        count_result = await self.db.execute(
+            select(func.count(GenerationJob.id)).where(*filters)
+        )
+        total = count_result.scalar()
+
+        result = await self.db.execute(
+            select(GenerationJob)
+            .where(*filters)
+            .order_by(GenerationJob.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def enqueue(self, job: GenerationJob, task: Any) -> None:
+        """
+        Send the job to its Celery task. The job ID doubles as the task ID.
+
+        Raises:
+            HTTPException: If the task queue is unavailable
+        """
+        task_id = str(job.id)
+        try:
+            task.apply_async(args=[task_id], task_id=task_id)
+        except Exception as exc:
+            logger.error(f"Failed to enqueue job {job.id}: {exc}")
+            job.status = JobStatus.FAILED
+            job.error = "Task queue unavailable"
+            job.finished_at = datetime.utcnow()
+            await self.db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Task queue unavailable, please retry later"
+            ) from exc
+
+        job.celery_task_id = task_id
+        await self.db.commit()
+        await self.db.refresh(job)
+
+    async def mark_running(self, job_id: UUID) -> Optional[GenerationJob]:
+        """Flag a pending job as running. Returns None if it was cancelled meanwhile."""
+        job = await self.get(job_id)
+        if not job or job.status != JobStatus.PENDING:
+            return None
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        await self.db.commit()
+        return job
+
+    async def update_progress(
+        self,
+        job_id: UUID,
+        progress: int,
+        message: Optional[str] = None,
+    ) -> None:
+        """
+        Store job progress.
+
+        Raises:
+            JobCancelled: If the job was cancelled by the user
+        """
+        job = await self.get(job_id)
+        if not job:
+            raise JobCancelled()
+        if job.status == JobStatus.CANCELLED:
+            raise JobCancelled()
+        job.progress = max(0, min(100, int(progress)))
+        if message is not None:
+            job.progress_message = message[:255]
+        await self.db.commit()
+
+    async def mark_succeeded(self, job_id: UUID, result: Dict[str, Any]) -> None:
+        """Store the job result."""
+        job = await self.get(job_id)
+        if not job or job.status == JobStatus.CANCELLED:
+            return
+        job.status = JobStatus.SUCCEEDED
+        job.progress = 100
+        job.result = result
+        job.finished_at = datetime.utcnow()
+        await self.db.commit()
+
+    async def mark_failed(self, job_id: UUID, error: str) -> None:
+        """Store the job failure."""
+        job = await self.get(job_id)
+        if not job or job.status == JobStatus.CANCELLED:
+            return
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        await self.db.commit()
+
+    async def cancel(self, job_id: UUID, user_id: UUID) -> GenerationJob:
+        """
+        Cancel a pending or running job.
+
+        Running jobs stop cooperatively at their next progress checkpoint.
+
+        Raises:
+            HTTPException: If job not found or already finished
+        """
+        job = await self.get_by_id(job_id, user_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job not found"
+            )
+        if job.is_finished:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Job already finished"
+            )
+
+        job.status = JobStatus.CANCELLED
+        job.finished_at = datetime.utcnow()
+        await self.db.commit()
+        await self.db.refresh(job)
+        return job
@@ -1,9 +1,60 @@
 """LLM client wrapper for DeepSeek API."""
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+import importlib.util
+import json
+import logging
+
 import httpx
 from httpx import ReadTimeout
 
 from app.core.config import settings
+from app.services.context_packer import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client used for every DeepSeek call."""
+    http2 = settings.DEEPSEEK_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested for DeepSeek but 'h2' is not installed; falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(settings.DEEPSEEK_TIMEOUT, read=settings.DEEPSEEK_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.DEEPSEEK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.DEEPSEEK_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide DeepSeek HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _http_client
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+
+
+def _log_prompt_size(messages: List[Dict[str, str]], max_tokens: int) -> None:
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "DeepSeek prompt: %d tokens in %d messages (max_tokens=%d)",
+            count_message_tokens(messages), len(messages), max_tokens,
+        )
 
 
 class DeepSeekClient:
@@ -14,41 +65,102 @@ class DeepSeekClient:
         self.base_url = settings.DEEPSEEK_API_BASE.rstrip("/")
         self.model = settings.DEEPSEEK_MODEL
 
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+
     async def chat(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.7,
         max_tokens: int = 2000,
         model: Optional[str] = None,
+        timeout: Optional[float] = None,
     ) -> str:
         """Call DeepSeek chat completions and return the assistant content."""
+        _log_prompt_size(messages, max_tokens)
         payload = {
             "model": model or self.model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
+        headers = self._headers()
+        request_timeout = (
+            httpx.Timeout(timeout, read=timeout) if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        )
+
+        client = get_http_client()
+        try:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=request_timeout,
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"DeepSeek API error: {response.text}")
+        except ReadTimeout:
+            raise
+        except httpx.HTTPError as exc:
+            raise RuntimeError(
+                "DeepSeek connection error. Please retry in a moment."
+            ) from exc
+
+        result = response.json()
+        return result["choices"][0]["message"]["content"]
+
+    async def stream_chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Call DeepSeek chat completions with stream=true and yield content deltas."""
+        _log_prompt_size(messages, max_tokens)
+        payload = {
+            "model": model or self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
         }
 
-        timeout = httpx.Timeout(settings.DEEPSEEK_TIMEOUT, read=settings.DEEPSEEK_TIMEOUT)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload,
-                )
+        client = get_http_client()
+        try:
+            async with client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers=self._headers(),
+                json=payload,
+            ) as response:
                 if response.status_code != 200:
-                    raise RuntimeError(f"DeepSeek API error: {response.text}")
-            except ReadTimeout:
-                raise
-            except httpx.HTTPError as exc:
-                raise RuntimeError(
-                    "DeepSeek connection error. Please retry in a moment."
-                ) from exc
-
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+                    body = await response.aread()
+                    raise RuntimeError(f"DeepSeek API error: {body.decode('utf-8', errors='replace')}")
+
+                async for line in response.aiter_lines():
+                    # SSE frames look like "data: {...}"; keep-alive comments start with ":"
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    try:
+                        chunk = json.loads(data)
+                    except json.JSONDecodeError:
+                        continue
+                    choices = chunk.get("choices") or []
+                    if not choices:
+                        continue
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+        except ReadTimeout:
+            raise
+        except httpx.HTTPError as exc:
+            raise RuntimeError(
+                "DeepSeek connection error. Please retry in a moment."
+            ) from exc
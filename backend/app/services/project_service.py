@@ -1,13 +1,16 @@
 """Project service"""
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
 from app.models.project import Project
+from app.models.document import Document
 from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectUpdate
+from app.services.auth_cache import forget_project
+from app.services.context_cache import mark_project_stale
 
 
 class ProjectService:
@@ -91,8 +94,7 @@ class ProjectService:
         )
 
         self.db.add(project)
-        await self.db.commit()
-        await self.db.refresh(project)
+        await self.db.flush()
 
         return project
 
@@ -128,8 +130,8 @@ class ProjectService:
         for field, value in update_data.items():
             setattr(project, field, value)
 
-        await self.db.commit()
-        await self.db.refresh(project)
+        mark_project_stale(self.db, project.id)
+        await self.db.flush()
 
         return project
 
@@ -149,6 +151,52 @@ class ProjectService:
             return False
 
         await self.db.delete(project)
-        await self.db.commit()
+        mark_project_stale(self.db, project.id)
+        forget_project(self.db, user_id, project.id)
+        await self.db.flush()
 
         return True
+
+    async def reconcile_word_counts(self) -> int:
+        """
+        Recompute every project's word count from its documents.
+
+        Document writes maintain the totals by delta; this corrects any drift
+        (manual SQL edits, interrupted writes) and only touches projects that differ.
+
+        Drifted projects are locked first, then summed and updated by a second
+        statement. Under READ COMMITTED a single UPDATE would wait for a
+        concurrent delta write, then re-check the project row but keep its old
+        snapshot for the document sum, overwriting the delta with a stale total.
+        The second statement takes a fresh snapshot once the locks are held.
+
+        Returns:
+            Number of projects corrected
+        """
+        totals = (
+            select(func.coalesce(func.sum(Document.word_count), 0))
+            .where(Document.project_id == Project.id)
+            .scalar_subquery()
+        )
+        locked = await self.db.execute(
+            select(Project.id)
+            .where(Project.current_word_count.is_distinct_from(totals))
+            .order_by(Project.id)  # Stable lock order
+            .with_for_update(of=Project)
+        )
+        candidate_ids = list(locked.scalars().all())
+        if not candidate_ids:
+            return 0
+
+        result = await self.db.execute(
+            update(Project)
+            .where(Project.id.in_(candidate_ids), Project.current_word_count.is_distinct_from(totals))
+            # Keep updated_at: a correction is not a user edit
+            .values(current_word_count=totals, updated_at=Project.updated_at)
+            .returning(Project.id)
+            .execution_options(synchronize_session=False)
+        )
+        project_ids = list(result.scalars().all())
+        for project_id in project_ids:
+            mark_project_stale(self.db, project_id)
+        return len(project_ids)
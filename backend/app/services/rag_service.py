@@ -1,16 +1,23 @@
 """RAG service for indexing and retrieving project context."""
-from typing import List, Dict, Any
-from uuid import UUID
+from typing import List, Dict, Any, Optional, Tuple
+from uuid import UUID, NAMESPACE_URL, uuid5
 import asyncio
+import hashlib
+import logging
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qdrant_models
 from langchain_community.vectorstores import Qdrant
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.core.config import settings
 from app.models.document import Document
+from app.services.embedding_cache import get_cached_embeddings
+
+logger = logging.getLogger(__name__)
+
+RAG_SCROLL_BATCH_SIZE = 1000
+RAG_UPSERT_BATCH_SIZE = 256
 
 
 class RagService:
@@ -19,7 +26,7 @@ class RagService:
     def __init__(self) -> None:
         self.client = QdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
         self.collection_name = settings.QDRANT_COLLECTION_NAME
-        self.embeddings = HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
+        self.embeddings = get_cached_embeddings()
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=settings.RAG_CHUNK_SIZE,
             chunk_overlap=settings.RAG_CHUNK_OVERLAP,
@@ -37,64 +44,198 @@ class RagService:
                 distance=qdrant_models.Distance.COSINE,
             ),
         )
+        for field_name in ("project_id", "document_id"):
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name=field_name,
+                field_schema=qdrant_models.PayloadSchemaType.KEYWORD,
+            )
 
-    def _delete_project_vectors(self, project_id: UUID) -> None:
-        """Delete existing vectors for a project to avoid duplicates."""
-        project_filter = qdrant_models.Filter(
-            must=[
-                qdrant_models.FieldCondition(
-                    key="project_id",
-                    match=qdrant_models.MatchValue(value=str(project_id)),
+    def _project_filter(self, project_id: UUID, document_ids: Optional[List[str]] = None) -> qdrant_models.Filter:
+        """Match a project's points, including ones written before payload keys were top-level."""
+        must: List[qdrant_models.Condition] = [
+            qdrant_models.Filter(
+                should=[
+                    qdrant_models.FieldCondition(
+                        key=key,
+                        match=qdrant_models.MatchValue(value=str(project_id)),
+                    )
+                    for key in ("project_id", "metadata.project_id")
+                ]
+            )
+        ]
+        if document_ids is not None:
+            must.append(
+                qdrant_models.Filter(
+                    should=[
+                        qdrant_models.FieldCondition(
+                            key=key,
+                            match=qdrant_models.MatchAny(any=document_ids),
+                        )
+                        for key in ("document_id", "metadata.document_id")
+                    ]
                 )
-            ]
-        )
-        self.client.delete(
-            collection_name=self.collection_name,
-            points_selector=project_filter,
-        )
+            )
+        return qdrant_models.Filter(must=must)
 
-    def index_documents(
+    def _chunk_document(self, project_id: UUID, doc: Document) -> Dict[str, Dict[str, Any]]:
+        """Split a document and key each chunk by a point id derived from its content hash."""
+        chunks: Dict[str, Dict[str, Any]] = {}
+        if not doc.content:
+            return chunks
+
+        seen: Dict[str, int] = {}
+        for idx, chunk in enumerate(self.text_splitter.split_text(doc.content)):
+            content_hash = hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+            # Identical chunks in one document still need distinct points
+            occurrence = seen.get(content_hash, 0)
+            seen[content_hash] = occurrence + 1
+            point_id = str(uuid5(NAMESPACE_URL, f"{project_id}:{doc.id}:{content_hash}:{occurrence}"))
+            metadata = {
+                "project_id": str(project_id),
+                "document_id": str(doc.id),
+                "title": doc.title,
+                "order_index": doc.order_index,
+                "document_type": doc.document_type.value if doc.document_type else None,
+                "chunk_index": idx,
+            }
+            chunks[point_id] = {
+                "text": chunk,
+                "payload": {
+                    "page_content": chunk,
+                    "metadata": metadata,
+                    "project_id": str(project_id),
+                    "document_id": str(doc.id),
+                    "content_hash": content_hash,
+                },
+            }
+        return chunks
+
+    def _existing_points(
+        self,
+        project_id: UUID,
+        document_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return stored point ids with their payload metadata, without vectors."""
+        points: Dict[str, Dict[str, Any]] = {}
+        offset = None
+        while True:
+            records, offset = self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=self._project_filter(project_id, document_ids),
+                limit=RAG_SCROLL_BATCH_SIZE,
+                offset=offset,
+                with_payload=["metadata", "content_hash"],
+                with_vectors=False,
+            )
+            for record in records:
+                points[str(record.id)] = record.payload or {}
+            if offset is None:
+                return points
+
+    def _payload_outdated(self, stored: Dict[str, Any], chunk: Dict[str, Any]) -> bool:
+        """Unchanged chunks keep their vector; only their title/position metadata may move."""
+        return stored.get("metadata") != chunk["payload"]["metadata"]
+
+    def _embed_points(self, chunks: List[Tuple[str, Dict[str, Any]]]) -> List[qdrant_models.PointStruct]:
+        """Embed a batch of chunks and build the points to upsert."""
+        vectors = self.embeddings.embed_documents([chunk["text"] for _, chunk in chunks])
+        return [
+            qdrant_models.PointStruct(id=point_id, vector=vector, payload=chunk["payload"])
+            for (point_id, chunk), vector in zip(chunks, vectors)
+        ]
+
+    def _upsert_points(self, points: List[qdrant_models.PointStruct], wait: bool = True) -> None:
+        if points:
+            self.client.upsert(collection_name=self.collection_name, points=points, wait=wait)
+
+    def _refresh_payloads(self, updates: List[Tuple[str, Dict[str, Any]]]) -> None:
+        operations = [
+            qdrant_models.SetPayloadOperation(
+                set_payload=qdrant_models.SetPayload(payload=payload, points=[point_id])
+            )
+            for point_id, payload in updates
+        ]
+        for start in range(0, len(operations), RAG_UPSERT_BATCH_SIZE):
+            self.client.batch_update_points(
+                collection_name=self.collection_name,
+                update_operations=operations[start:start + RAG_UPSERT_BATCH_SIZE],
+            )
+
+    def _delete_points(self, point_ids: List[str]) -> None:
+        for start in range(0, len(point_ids), RAG_SCROLL_BATCH_SIZE):
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=qdrant_models.PointIdsList(points=point_ids[start:start + RAG_SCROLL_BATCH_SIZE]),
+            )
+
+    def index_project(
         self,
         project_id: UUID,
         documents: List[Document],
-        clear_existing: bool = True,
-    ) -> int:
-        """Split and index documents into Qdrant. Returns number of chunks."""
-        self._ensure_collection()
+        prune_missing_documents: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Bring the project's vectors in line with `documents`, embedding only changed chunks.
 
-        if clear_existing:
-            self._delete_project_vectors(project_id)
+        Args:
+            project_id: Project ID
+            documents: Documents to index
+            prune_missing_documents: Also delete vectors of documents not in `documents`
 
-        texts: List[str] = []
-        metadatas: List[Dict[str, Any]] = []
+        Returns:
+            Counts of chunks in the index, newly embedded and deleted
+        """
+        self._ensure_collection()
 
+        desired: Dict[str, Dict[str, Any]] = {}
         for doc in documents:
-            if not doc.content:
-                continue
-            chunks = self.text_splitter.split_text(doc.content)
-            for idx, chunk in enumerate(chunks):
-                texts.append(chunk)
-                metadatas.append(
-                    {
-                        "project_id": str(project_id),
-                        "document_id": str(doc.id),
-                        "title": doc.title,
-                        "order_index": doc.order_index,
-                        "document_type": doc.document_type.value if doc.document_type else None,
-                        "chunk_index": idx,
-                    }
-                )
+            desired.update(self._chunk_document(project_id, doc))
 
-        if not texts:
-            return 0
+        scope = None if prune_missing_documents else [str(doc.id) for doc in documents]
+        existing = self._existing_points(project_id, scope)
 
-        vector_store = Qdrant(
-            client=self.client,
+        stale_ids = [point_id for point_id in existing if point_id not in desired]
+        new_ids = [point_id for point_id in desired if point_id not in existing]
+
+        for start in range(0, len(new_ids), RAG_UPSERT_BATCH_SIZE):
+            batch = new_ids[start:start + RAG_UPSERT_BATCH_SIZE]
+            self._upsert_points(self._embed_points([(point_id, desired[point_id]) for point_id in batch]))
+
+        self._refresh_payloads([
+            (point_id, desired[point_id]["payload"])
+            for point_id, payload in existing.items()
+            if point_id in desired and self._payload_outdated(payload, desired[point_id])
+        ])
+        self._delete_points(stale_ids)
+
+        logger.info(
+            "Indexed project %s: %d chunks, %d embedded, %d deleted",
+            project_id, len(desired), len(new_ids), len(stale_ids),
+        )
+        return {"chunks": len(desired), "embedded": len(new_ids), "deleted": len(stale_ids)}
+
+    def index_documents(
+        self,
+        project_id: UUID,
+        documents: List[Document],
+        clear_existing: bool = True,
+    ) -> int:
+        """Index documents into Qdrant, re-embedding only changed chunks. Returns number of chunks."""
+        stats = self.index_project(project_id, documents, prune_missing_documents=clear_existing)
+        return stats["chunks"]
+
+    def reindex_document(self, document: Document) -> Dict[str, int]:
+        """Re-sync a single document's chunks after it was edited."""
+        return self.index_project(document.project_id, [document], prune_missing_documents=False)
+
+    def delete_document_vectors(self, project_id: UUID, document_id: UUID) -> None:
+        """Remove every chunk of a deleted document."""
+        self._ensure_collection()
+        self.client.delete(
             collection_name=self.collection_name,
-            embeddings=self.embeddings,
+            points_selector=self._project_filter(project_id, [str(document_id)]),
         )
-        vector_store.add_texts(texts=texts, metadatas=metadatas)
-        return len(texts)
 
     def retrieve(
         self,
@@ -109,15 +250,7 @@ class RagService:
             collection_name=self.collection_name,
             embeddings=self.embeddings,
         )
-        project_filter = qdrant_models.Filter(
-            must=[
-                qdrant_models.FieldCondition(
-                    key="project_id",
-                    match=qdrant_models.MatchValue(value=str(project_id)),
-                )
-            ]
-        )
-        docs = vector_store.similarity_search(query, k=top_k, filter=project_filter)
+        docs = vector_store.similarity_search(query, k=top_k, filter=self._project_filter(project_id))
         return [doc.page_content for doc in docs]
 
     async def aindex_documents(
@@ -129,6 +262,19 @@ class RagService:
         """Async wrapper for indexing documents."""
         return await asyncio.to_thread(self.index_documents, project_id, documents, clear_existing)
 
+    async def aindex_project(
+        self,
+        project_id: UUID,
+        documents: List[Document],
+        prune_missing_documents: bool = True,
+    ) -> Dict[str, int]:
+        """Async wrapper for incremental project indexing."""
+        return await asyncio.to_thread(self.index_project, project_id, documents, prune_missing_documents)
+
+    async def areindex_document(self, document: Document) -> Dict[str, int]:
+        """Async wrapper for single-document reindexing."""
+        return await asyncio.to_thread(self.reindex_document, document)
+
     async def aretrieve(
         self,
         project_id: UUID,
@@ -7,7 +7,8 @@ from fastapi import HTTPException, status
 
 from app.models.user import User
 from app.schemas.user import UserUpdate
-from app.core.security import get_password_hash
+from app.core.security import aget_password_hash
+from app.services.auth_cache import forget_user
 
 
 class UserService:
@@ -80,10 +81,10 @@ class UserService:
             user.full_name = user_data.full_name
 
         if user_data.password:
-            user.hashed_password = get_password_hash(user_data.password)
+            user.hashed_password = await aget_password_hash(user_data.password)
 
-        await self.db.commit()
-        await self.db.refresh(user)
+        forget_user(self.db, user.id)
+        await self.db.flush()
 
         return user
 
@@ -102,6 +103,7 @@ class UserService:
             return False
 
         await self.db.delete(user)
-        await self.db.commit()
+        forget_user(self.db, user.id, ownership=True)
+        await self.db.flush()
 
         return True
@@ -0,0 +1,57 @@
+"""Compact encodings for document version content: zlib snapshots and line deltas."""
+from difflib import SequenceMatcher
+from typing import List, Union
+import json
+import zlib
+
+from app.core.config import settings
+
+# content_encoding values stored on document_versions
+PLAIN = "plain"          # legacy rows: text in the content column
+SNAPSHOT = "zlib"        # zlib-compressed UTF-8 text
+DELTA = "zlib-delta"     # zlib-compressed line delta against base_version_id
+
+DeltaOp = Union[List[int], str]
+
+
+def compress_text(text: str) -> bytes:
+    """Compress a full text snapshot."""
+    return zlib.compress(text.encode("utf-8"), settings.VERSION_COMPRESSION_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    """Inverse of compress_text."""
+    return zlib.decompress(data).decode("utf-8")
+
+
+def make_delta(base: str, text: str) -> bytes:
+    """
+    Encode `text` as line-level edits of `base`.
+
+    The delta is a list of `[start, end]` ranges copied from the base lines and
+    literal strings for inserted or replaced lines, JSON-encoded and compressed.
+    """
+    base_lines = base.splitlines(keepends=True)
+    text_lines = text.splitlines(keepends=True)
+    ops: List[DeltaOp] = []
+    matcher = SequenceMatcher(None, base_lines, text_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(text_lines[j1:j2]))
+    payload = json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"), settings.VERSION_COMPRESSION_LEVEL)
+
+
+def apply_delta(base: str, data: bytes) -> str:
+    """Rebuild a text from its base and a delta produced by make_delta."""
+    base_lines = base.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in json.loads(zlib.decompress(data).decode("utf-8")):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            start, end = op
+            parts.extend(base_lines[start:end])
+    return "".join(parts)
@@ -1,8 +1,9 @@
 """Writing pipeline orchestrated with LangGraph."""
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional, TypedDict
+from typing import Awaitable, Callable, Dict, Any, List, Optional, TypedDict
 from uuid import UUID
+import asyncio
 import json
 import math
 
@@ -13,10 +14,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.models.document import Document, DocumentType
 from app.schemas.document import DocumentCreate
+from app.schemas.writing import ChapterGenerationRequest
 from app.services.context_service import ProjectContextService
+from app.services.context_packer import pack_context
 from app.services.document_service import DocumentService
 from app.services.llm_client import DeepSeekClient
 from app.services.rag_service import RagService
+from app.services.indexing_pipeline import IndexingPipeline
 
 
 class WritingState(TypedDict, total=False):
@@ -37,6 +41,22 @@ class WritingState(TypedDict, total=False):
     document_id: Optional[str]
 
 
+def build_chapter_state(request: ChapterGenerationRequest, user_id: UUID) -> WritingState:
+    """Build the initial pipeline state for a chapter generation request."""
+    return {
+        "project_id": request.project_id,
+        "user_id": user_id,
+        "chapter_title": request.chapter_title or "",
+        "chapter_prompt": request.chapter_prompt,
+        "target_word_count": request.target_word_count,
+        "constraints": request.constraints or {},
+        "use_rag": request.use_rag,
+        "reindex_documents": request.reindex_documents,
+        "order_index": request.order_index,
+        "create_document": request.create_document,
+    }
+
+
 class WritingPipeline:
     """LangGraph pipeline for autonomous chapter and book generation."""
 
@@ -79,8 +99,7 @@ class WritingPipeline:
             return {"retrieved_chunks": []}
 
         if state.get("reindex_documents"):
-            documents = await self._load_project_documents(state["project_id"])
-            await self.rag_service.aindex_documents(state["project_id"], documents, clear_existing=True)
+            await IndexingPipeline(self.db, self.rag_service).run(state["project_id"])
 
         query = f"{state.get('chapter_title', '')}\n{state.get('chapter_prompt', '')}".strip()
         chunks = await self.rag_service.aretrieve(
@@ -176,7 +195,17 @@ class WritingPipeline:
         use_rag: bool = True,
         reindex_documents: bool = False,
         create_documents: bool = True,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        concurrency: int = 1,
+        continuity_pass: bool = False,
     ) -> Dict[str, Any]:
+        """
+        Generate an outline then every chapter.
+
+        With `concurrency` > 1, chapters are drafted in parallel from the outline and
+        persisted afterwards in outline order. `continuity_pass` then smooths chapter
+        transitions sequentially. `on_progress(done, total)` is awaited per chapter.
+        """
         outline = await self._generate_outline(
             project_id=project_id,
             user_id=user_id,
@@ -186,9 +215,8 @@ class WritingPipeline:
         )
 
         base_order_index = await self._get_next_order_index(project_id) if create_documents else 0
-        chapters: List[Dict[str, Any]] = []
-        for idx, item in enumerate(outline):
-            chapter_state: WritingState = {
+        chapter_states: List[WritingState] = [
+            {
                 "project_id": project_id,
                 "user_id": user_id,
                 "chapter_title": item.get("title") or f"Chapter {idx + 1}",
@@ -200,11 +228,147 @@ class WritingPipeline:
                 "order_index": base_order_index + idx if create_documents else None,
                 "create_document": create_documents,
             }
+            for idx, item in enumerate(outline)
+        ]
+
+        workers = self._resolve_concurrency(concurrency)
+        if workers > 1 or continuity_pass:
+            chapters = await self._generate_chapters_concurrently(
+                chapter_states,
+                workers=workers,
+                continuity_pass=continuity_pass,
+                on_progress=on_progress,
+            )
+            return {"outline": outline, "chapters": chapters}
+
+        chapters: List[Dict[str, Any]] = []
+        for idx, chapter_state in enumerate(chapter_states):
             result = await self.generate_chapter(chapter_state)
             chapters.append(result)
+            if on_progress:
+                await on_progress(idx + 1, len(outline))
 
         return {"outline": outline, "chapters": chapters}
 
+    def _resolve_concurrency(self, requested: int) -> int:
+        """Cap the requested parallelism by the per-book limit and the provider pool size."""
+        return max(
+            1,
+            min(
+                requested or 1,
+                settings.BOOK_MAX_CONCURRENCY,
+                settings.DEEPSEEK_MAX_CONNECTIONS,
+            ),
+        )
+
+    async def _draft_chapter(self, state: WritingState) -> WritingState:
+        """Run the DB-free nodes (retrieve, plan, write) for one chapter."""
+        state = {**state, **await self.retrieve_context(state)}
+        state = {**state, **await self.plan_chapter(state)}
+        state = {**state, **await self.write_chapter(state)}
+        return state
+
+    async def _generate_chapters_concurrently(
+        self,
+        chapter_states: List[WritingState],
+        workers: int,
+        continuity_pass: bool,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Draft chapters in parallel, then persist them sequentially.
+
+        The AsyncSession is not safe for concurrent use, so the project context and the
+        optional reindex are done once up front and documents are written in outline
+        order after every draft is ready.
+        """
+        if not chapter_states:
+            return []
+
+        shared_state = chapter_states[0]
+        shared_context = await self.collect_context(shared_state)
+        if shared_state.get("use_rag", True) and shared_state.get("reindex_documents"):
+            await IndexingPipeline(self.db, self.rag_service).run(shared_state["project_id"])
+
+        semaphore = asyncio.Semaphore(workers)
+        total = len(chapter_states)
+        done = 0
+
+        async def draft(state: WritingState) -> WritingState:
+            nonlocal done
+            async with semaphore:
+                drafted = await self._draft_chapter(
+                    {**state, **shared_context, "reindex_documents": False}
+                )
+            done += 1
+            if on_progress:
+                await on_progress(done, total)
+            return drafted
+
+        tasks = [asyncio.create_task(draft(state)) for state in chapter_states]
+        try:
+            drafted_states = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        if continuity_pass:
+            await self._continuity_pass(drafted_states)
+
+        chapters: List[Dict[str, Any]] = []
+        for state in drafted_states:
+            persisted = await self.persist_chapter(state)
+            chapters.append(
+                {
+                    "chapter_title": state.get("chapter_title", ""),
+                    "chapter_plan": state.get("chapter_plan", ""),
+                    "chapter_text": state.get("chapter_text", ""),
+                    "document_id": persisted.get("document_id"),
+                    "retrieved_chunks": state.get("retrieved_chunks", []),
+                }
+            )
+        return chapters
+
+    async def _continuity_pass(self, states: List[WritingState]) -> None:
+        """Rewrite each chapter opening so it follows on from the previous chapter ending."""
+        for idx in range(1, len(states)):
+            previous_text = states[idx - 1].get("chapter_text") or ""
+            current_text = states[idx].get("chapter_text") or ""
+            if previous_text and current_text:
+                opening, rest = self._split_opening(current_text)
+                prompt = (
+                    "Revise the opening of the chapter below so it follows naturally from the end "
+                    "of the previous chapter. Fix contradictions in names, timeline, setting and tone. "
+                    "Keep the content, length and style otherwise unchanged.\n\n"
+                    f"Previous chapter ending:\n{previous_text[-1500:]}\n\n"
+                    f"Chapter title: {states[idx].get('chapter_title', '')}\n"
+                    f"Chapter opening to revise:\n{opening}\n\n"
+                    "Return only the revised opening."
+                )
+                messages = [
+                    {"role": "system", "content": "You are a senior literary editor in charge of continuity."},
+                    {"role": "user", "content": prompt},
+                ]
+                revised = await self.llm_client.chat(
+                    messages,
+                    temperature=0.4,
+                    max_tokens=max(1, settings.CHAT_MAX_TOKENS),
+                )
+                revised = (revised or "").strip()
+                if revised:
+                    states[idx]["chapter_text"] = f"{revised}\n\n{rest}".strip() if rest else revised
+
+    def _split_opening(self, text: str, min_chars: int = 2000) -> tuple[str, str]:
+        """Split a chapter after the first paragraph break past `min_chars`."""
+        if len(text) <= min_chars:
+            return text, ""
+        split_at = text.find("\n\n", min_chars)
+        if split_at == -1:
+            return text, ""
+        return text[:split_at], text[split_at:].lstrip()
+
     async def _generate_outline(
         self,
         project_id: UUID,
@@ -260,12 +424,6 @@ class WritingPipeline:
         max_index = result.scalar()
         return (max_index + 1) if max_index is not None else 0
 
-    async def _load_project_documents(self, project_id: UUID) -> List[Document]:
-        result = await self.db.execute(
-            select(Document).where(Document.project_id == project_id).order_by(Document.order_index.asc())
-        )
-        return list(result.scalars().all())
-
     def _count_words(self, text: str) -> int:
         return len(text.split())
 
@@ -319,27 +477,24 @@ class WritingPipeline:
         context = state.get("project_context") or {}
         project = context.get("project", {})
         constraints = state.get("constraints") or {}
-        character_list = ", ".join(
-            [
-                f"{char.get('name')} ({char.get('role') or 'unknown'})"
-                for char in context.get("characters", [])
-                if char.get("name")
-            ][:20]
-        )
-        document_list = ", ".join(
-            [
-                doc.get("title", "")
-                for doc in context.get("documents", [])
-                if doc.get("title")
-            ][:20]
-        )
-        instruction_list = "; ".join(
-            [
-                f"{item.get('title')}: {item.get('detail')}"
-                for item in context.get("instructions", [])
-                if item.get("title") and item.get("detail")
-            ][:20]
+        packed = pack_context(
+            context,
+            {
+                "characters": lambda char: (
+                    f"{char.get('name')} ({char.get('role') or 'unknown'})" if char.get("name") else None
+                ),
+                "documents": lambda doc: doc.get("title") or None,
+                "instructions": lambda item: (
+                    f"{item.get('title')}: {item.get('detail')}"
+                    if item.get("title") and item.get("detail") else None
+                ),
+            },
+            focus=f"{state.get('chapter_title') or ''}\n{state.get('chapter_prompt') or ''}",
+            anchor_index=state.get("order_index"),
         )
+        character_list = ", ".join(packed["characters"]["lines"])
+        document_list = ", ".join(packed["documents"]["lines"])
+        instruction_list = "; ".join(packed["instructions"]["lines"])
         return (
             "Project context:\n"
             f"- Title: {project.get('title')}\n"
@@ -2,9 +2,6 @@
 Celery tasks module
 """
 from app.core.celery_app import celery_app
+from app.tasks import generation, indexing, maintenance
 
-# Import all task modules here
-# Example:
-# from app.tasks import document_processing, embeddings
-
-__all__ = ["celery_app"]
+__all__ = ["celery_app", "generation", "indexing", "maintenance"]
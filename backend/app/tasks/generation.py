@@ -0,0 +1,120 @@
+"""Chapter, book and element generation tasks"""
+from typing import Any, Dict
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.celery_app import celery_app
+from app.core.config import settings
+from app.models.job import GenerationJob
+from app.schemas.document import ElementGenerateRequest
+from app.schemas.writing import ChapterGenerationRequest, BookGenerationRequest
+from app.tasks.runner import ProgressCallback, run_job
+
+
+async def _generate_chapter(
+    db: AsyncSession,
+    job: GenerationJob,
+    progress: ProgressCallback,
+) -> Dict[str, Any]:
+    from app.services.writing_pipeline import WritingPipeline, build_chapter_state
+
+    request = ChapterGenerationRequest(**job.params)
+    await progress(5, "Generating chapter")
+    pipeline = WritingPipeline(db)
+    result = await pipeline.generate_chapter(build_chapter_state(request, job.user_id))
+    return {
+        "chapter_title": result.get("chapter_title", ""),
+        "chapter_plan": result.get("chapter_plan", ""),
+        "content": result.get("chapter_text", ""),
+        "document_id": result.get("document_id"),
+        "retrieved_chunks": result.get("retrieved_chunks", []),
+    }
+
+
+async def _generate_book(
+    db: AsyncSession,
+    job: GenerationJob,
+    progress: ProgressCallback,
+) -> Dict[str, Any]:
+    from app.services.writing_pipeline import WritingPipeline
+
+    request = BookGenerationRequest(**job.params)
+
+    async def on_chapter(done: int, total: int) -> None:
+        # Keep the last 5% for the final commit
+        await progress(5 + int(90 * done / max(total, 1)), f"Chapter {done}/{total} generated")
+
+    await progress(2, "Generating outline")
+    pipeline = WritingPipeline(db)
+    result = await pipeline.generate_book(
+        project_id=request.project_id,
+        user_id=job.user_id,
+        book_prompt=request.book_prompt,
+        chapter_count=request.chapter_count,
+        per_chapter_word_count=request.per_chapter_word_count,
+        constraints=request.constraints or {},
+        use_rag=request.use_rag,
+        reindex_documents=request.reindex_documents,
+        create_documents=request.create_documents,
+        concurrency=request.concurrency,
+        continuity_pass=request.continuity_pass,
+        on_progress=on_chapter,
+    )
+    return {
+        "outline": result.get("outline", []),
+        "chapters": result.get("chapters", []),
+    }
+
+
+async def _generate_element(
+    db: AsyncSession,
+    job: GenerationJob,
+    progress: ProgressCallback,
+) -> Dict[str, Any]:
+    # Imported lazily: the documents endpoints module enqueues this task
+    from app.api.v1.endpoints.documents import run_element_generation
+
+    payload = ElementGenerateRequest(**job.params.get("payload", {}))
+
+    async def on_iteration(iteration: int, max_iterations: int, word_count: int) -> None:
+        await progress(
+            int(95 * iteration / max(max_iterations, 1)),
+            f"Iteration {iteration}/{max_iterations} ({word_count} words)",
+        )
+
+    document, version = await run_element_generation(
+        db=db,
+        document_id=UUID(job.params["document_id"]),
+        payload=payload,
+        user_id=job.user_id,
+        on_progress=on_iteration,
+    )
+    return {
+        "document_id": str(document.id),
+        "version_id": str(version.id),
+        "version": version.version,
+        "word_count": version.word_count,
+    }
+
+
+@celery_app.task(name="app.tasks.generation.generate_chapter")
+def generate_chapter_task(job_id: str) -> None:
+    """Generate a single chapter through the writing pipeline."""
+    run_job(job_id, _generate_chapter)
+
+
+@celery_app.task(
+    name="app.tasks.generation.generate_book",
+    time_limit=settings.BOOK_JOB_TIME_LIMIT,
+    soft_time_limit=max(60, settings.BOOK_JOB_TIME_LIMIT - 300),
+)
+def generate_book_task(job_id: str) -> None:
+    """Generate an outline and all its chapters."""
+    run_job(job_id, _generate_book)
+
+
+@celery_app.task(name="app.tasks.generation.generate_element")
+def generate_element_task(job_id: str) -> None:
+    """Generate or rewrite a structured element."""
+    run_job(job_id, _generate_element)
@@ -0,0 +1,74 @@
+"""RAG indexing tasks"""
+from typing import Any, Dict
+from uuid import UUID
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.celery_app import celery_app
+from app.models.document import Document
+from app.models.job import GenerationJob
+from app.schemas.writing import IndexProjectRequest
+from app.db.session import AsyncSessionLocal
+from app.tasks.runner import ProgressCallback, run_async, run_job
+
+logger = logging.getLogger(__name__)
+
+
+async def _index_project(
+    db: AsyncSession,
+    job: GenerationJob,
+    progress: ProgressCallback,
+) -> Dict[str, Any]:
+    from app.services.indexing_pipeline import IndexingPipeline
+
+    request = IndexProjectRequest(**job.params)
+    await progress(5, "Indexing documents")
+
+    async def on_progress(done: int, total: int) -> None:
+        await progress(5 + int(90 * done / max(total, 1)), f"Indexed {done}/{total} documents")
+
+    stats = await IndexingPipeline(db).run(
+        request.project_id,
+        prune_missing_documents=request.clear_existing,
+        on_progress=on_progress,
+    )
+    return {
+        "chunks_indexed": stats["chunks"],
+        "chunks_embedded": stats["embedded"],
+        "chunks_deleted": stats["deleted"],
+        "seconds": stats["seconds"],
+        "chunks_per_second": stats["chunks_per_second"],
+    }
+
+
+@celery_app.task(name="app.tasks.indexing.index_project")
+def index_project_task(job_id: str) -> None:
+    """Index all documents of a project into Qdrant."""
+    run_job(job_id, _index_project)
+
+
+async def _reindex_document(document_id: UUID) -> None:
+    from app.services.rag_service import RagService
+
+    async with AsyncSessionLocal() as session:
+        document = await session.get(Document, document_id)
+    if document is None:
+        return
+
+    stats = await RagService().areindex_document(document)
+    logger.info(f"Reindexed document {document_id}: {stats}")
+
+
+@celery_app.task(name="app.tasks.indexing.reindex_document")
+def reindex_document_task(document_id: str) -> None:
+    """Re-embed the changed chunks of one document after an edit."""
+    run_async(lambda: _reindex_document(UUID(document_id)))
+
+
+@celery_app.task(name="app.tasks.indexing.delete_document_vectors")
+def delete_document_vectors_task(project_id: str, document_id: str) -> None:
+    """Drop the vectors of a deleted document."""
+    from app.services.rag_service import RagService
+
+    RagService().delete_document_vectors(UUID(project_id), UUID(document_id))
@@ -0,0 +1,26 @@
+"""Periodic maintenance tasks (scheduled by Celery beat)"""
+import logging
+
+from app.core.celery_app import celery_app
+from app.db.session import AsyncSessionLocal, commit
+from app.tasks.runner import run_async
+
+logger = logging.getLogger(__name__)
+
+
+async def _reconcile_word_counts() -> int:
+    from app.services.project_service import ProjectService
+
+    async with AsyncSessionLocal() as session:
+        corrected = await ProjectService(session).reconcile_word_counts()
+        await commit(session)
+    return corrected
+
+
+@celery_app.task(name="app.tasks.maintenance.reconcile_word_counts")
+def reconcile_word_counts_task() -> int:
+    """Correct project word counts that drifted from the sum of their documents."""
+    corrected = run_async(_reconcile_word_counts)
+    if corrected:
+        logger.warning(f"Reconciled word count of {corrected} project(s)")
+    return corrected
@@ -0,0 +1,69 @@
+"""Run async job handlers inside synchronous Celery tasks"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from uuid import UUID
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal, commit, engine
+from app.models.job import GenerationJob
+from app.services.job_service import JobService, JobCancelled
+from app.services.llm_client import close_http_client
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[int, Optional[str]], Awaitable[None]]
+JobHandler = Callable[[AsyncSession, GenerationJob, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+async def _report_progress(job_id: UUID, progress: int, message: Optional[str] = None) -> None:
+    # Progress is committed from its own session so it is visible while the job runs
+    async with AsyncSessionLocal() as session:
+        await JobService(session).update_progress(job_id, progress, message)
+
+
+async def _execute(job_id: UUID, handler: JobHandler) -> None:
+    async with AsyncSessionLocal() as session:
+        job = await JobService(session).mark_running(job_id)
+    if job is None:
+        logger.info(f"Job {job_id} is no longer pending, skipping")
+        return
+
+    async def progress(value: int, message: Optional[str] = None) -> None:
+        await _report_progress(job_id, value, message)
+
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await handler(session, job, progress)
+            await commit(session)
+    except JobCancelled:
+        logger.info(f"Job {job_id} cancelled")
+        return
+    except Exception as exc:
+        logger.error(f"Job {job_id} failed", exc_info=True)
+        async with AsyncSessionLocal() as session:
+            await JobService(session).mark_failed(job_id, str(exc) or type(exc).__name__)
+        return
+
+    async with AsyncSessionLocal() as session:
+        await JobService(session).mark_succeeded(job_id, result)
+
+
+def run_async(coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run a coroutine to completion on a fresh event loop and release pooled connections."""
+
+    async def main() -> Any:
+        try:
+            return await coro_factory()
+        finally:
+            # Pooled connections are bound to this event loop; drop them before it closes
+            await close_http_client()
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def run_job(job_id: str, handler: JobHandler) -> None:
+    """Run a job handler to completion on a fresh event loop."""
+    run_async(lambda: _execute(UUID(job_id), handler))
@@ -0,0 +1,88 @@
+"""
+Measure login password checks under concurrent load, on and off the event loop.
+
+Simulates a burst of logins (bcrypt verification at BCRYPT_ROUNDS) while a
+heartbeat task stands in for the other requests served by the same worker. For
+each mode it reports login latency percentiles, throughput and the worst
+heartbeat delay, i.e. how long unrelated requests were stalled.
+
+The HTTP login routes are rate limited per IP, so this runs in-process:
+
+    cd backend
+    python -m benchmarks.login_latency --logins 40 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from app.core.config import settings
+from app.core.security import averify_password, get_password_hash, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float, delays: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        delays.append(time.perf_counter() - started - interval)
+
+
+async def run(check: Callable[[str, str], Awaitable[bool]], hashed: str, logins: int, concurrency: int) -> Dict[str, float]:
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    delays: List[float] = []
+    stop = asyncio.Event()
+
+    async def login() -> None:
+        # Every login of the burst arrives at once: latency includes queueing
+        async with slots:
+            assert await check(PASSWORD, hashed)
+            latencies.append(time.perf_counter() - started)
+
+    heartbeat = asyncio.create_task(_heartbeat(stop, 0.01, delays))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await heartbeat
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "logins_per_s": logins / elapsed,
+        "max_stall_ms": max(delays, default=0.0) * 1000,
+    }
+
+
+async def on_loop(password: str, hashed: str) -> bool:
+    # Previous behaviour: bcrypt called directly from the coroutine
+    return verify_password(password, hashed)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD)
+    print(
+        f"bcrypt rounds={settings.BCRYPT_ROUNDS}, workers={settings.BCRYPT_MAX_WORKERS}, "
+        f"{args.logins} logins, concurrency {args.concurrency}"
+    )
+    print(f"{'mode':<12} {'p50 ms':>9} {'p95 ms':>9} {'logins/s':>9} {'max stall ms':>13}")
+    for name, check in (("event loop", on_loop), ("executor", averify_password)):
+        stats = await run(check, hashed, args.logins, args.concurrency)
+        print(
+            f"{name:<12} {stats['p50_ms']:>9.0f} {stats['p95_ms']:>9.0f} "
+            f"{stats['logins_per_s']:>9.1f} {stats['max_stall_ms']:>13.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
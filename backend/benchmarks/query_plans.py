@@ -0,0 +1,225 @@
+"""
+Compare query plans of the hot project-scoped queries with and without their indexes.
+
+Seeds a benchmark dataset (100k documents by default) into the database pointed to
+by DATABASE_URL, then runs EXPLAIN ANALYZE on each query twice: once inside a
+transaction that drops the indexes (rolled back afterwards), once with them.
+Use a dedicated database: the index drop takes exclusive locks while it runs.
+
+    cd backend
+    alembic upgrade head
+    python -m benchmarks.query_plans --seed --documents 100000
+    python -m benchmarks.query_plans --cleanup
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import settings
+
+BENCH_EMAIL_PATTERN = "bench-%@thoth.local"
+
+INDEXES = [
+    "ix_documents_project_id_order_index",
+    "ix_documents_project_id_element_type",
+    "ix_documents_document_metadata",
+    "ix_characters_project_id_name",
+    "ix_projects_owner_id_updated_at",
+]
+
+QUERIES: List[Tuple[str, str]] = [
+    (
+        "documents list",
+        "SELECT * FROM documents WHERE project_id = :project_id "
+        "ORDER BY order_index LIMIT 100",
+    ),
+    ("documents count", "SELECT count(id) FROM documents WHERE project_id = :project_id"),
+    ("next order_index", "SELECT max(order_index) FROM documents WHERE project_id = :project_id"),
+    (
+        "elements by type",
+        "SELECT id FROM documents WHERE project_id = :project_id "
+        "AND document_metadata @> '{\"element_type\": \"chapitre\"}'",
+    ),
+    (
+        "next element index",
+        "SELECT max((document_metadata->>'element_index')::int), count(id) FROM documents "
+        "WHERE project_id = :project_id AND document_metadata->>'element_type' = 'scene'",
+    ),
+    (
+        "children of parent",
+        "SELECT id FROM documents WHERE document_metadata @> jsonb_build_object('parent_id', CAST(:parent_id AS text))",
+    ),
+    (
+        "characters list",
+        "SELECT * FROM characters WHERE project_id = :project_id ORDER BY name LIMIT 100",
+    ),
+    (
+        "projects list",
+        "SELECT * FROM projects WHERE owner_id = :owner_id ORDER BY updated_at DESC LIMIT 100",
+    ),
+]
+
+
+async def seed(conn: AsyncConnection, documents: int, projects: int, users: int, characters: int) -> None:
+    """Insert users, projects, documents (chapters with child scenes) and characters."""
+    started = time.perf_counter()
+    await conn.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, is_active, is_superuser, subscription_tier, created_at) "
+            "SELECT gen_random_uuid(), 'bench-' || g || '@thoth.local', 'x', true, false, 'FREE', now() "
+            "FROM generate_series(1, :users) AS g"
+        ),
+        {"users": users},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO projects (id, title, status, current_word_count, project_metadata, owner_id, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'Projet ' || g, 'DRAFT', 0, '{}'::jsonb, u.id, now(), "
+            "now() - (g || ' minutes')::interval "
+            "FROM generate_series(1, :projects) AS g "
+            "JOIN LATERAL (SELECT id FROM users WHERE email LIKE :pattern "
+            "OFFSET (g % :users) LIMIT 1) u ON true"
+        ),
+        {"projects": projects, "users": users, "pattern": BENCH_EMAIL_PATTERN},
+    )
+    # Per project: every 10th document is a chapter, the following ones are its scenes
+    await conn.execute(
+        text(
+            "WITH bench_projects AS ("
+            "  SELECT p.id, row_number() OVER () - 1 AS n FROM projects p "
+            "  JOIN users u ON u.id = p.owner_id WHERE u.email LIKE :pattern"
+            "), numbered AS ("
+            "  SELECT bp.id AS project_id, g / :projects AS position "
+            "  FROM generate_series(0, :documents - 1) AS g "
+            "  JOIN bench_projects bp ON bp.n = g % :projects"
+            ") "
+            "INSERT INTO documents (id, title, content, document_type, order_index, word_count, "
+            "document_metadata, project_id, created_at, updated_at) "
+            "SELECT md5(project_id::text || '-' || position)::uuid, 'Element ' || position, "
+            "repeat('lorem ipsum ', 200), "
+            "CASE WHEN position % 10 = 0 THEN 'CHAPTER' ELSE 'SCENE' END, position, 400, "
+            "CASE WHEN position % 10 = 0 "
+            "  THEN jsonb_build_object('element_type', 'chapitre', 'element_index', position / 10 + 1) "
+            "  ELSE jsonb_build_object('element_type', 'scene', 'element_index', position % 10, "
+            "    'parent_id', md5(project_id::text || '-' || (position / 10 * 10))::uuid::text) END, "
+            "project_id, now(), now() "
+            "FROM numbered"
+        ),
+        {"documents": documents, "projects": projects, "pattern": BENCH_EMAIL_PATTERN},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO characters (id, name, description, character_metadata, project_id, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'Personnage ' || g, 'Description', '{}'::jsonb, p.id, now(), now() "
+            "FROM generate_series(1, :characters) AS g "
+            "JOIN LATERAL (SELECT p.id FROM projects p JOIN users u ON u.id = p.owner_id "
+            "WHERE u.email LIKE :pattern OFFSET (g % :projects) LIMIT 1) p ON true"
+        ),
+        {"characters": characters, "projects": projects, "pattern": BENCH_EMAIL_PATTERN},
+    )
+    for table in ("users", "projects", "documents", "characters"):
+        await conn.execute(text(f"ANALYZE {table}"))
+    print(f"Seeded {documents} documents in {time.perf_counter() - started:.1f}s")
+
+
+async def pick_parameters(conn: AsyncConnection) -> Dict[str, Any]:
+    """Pick a seeded project, its owner and a parent id to query with."""
+    row = (
+        await conn.execute(
+            text(
+                "SELECT p.id AS project_id, p.owner_id, d.document_metadata->>'parent_id' AS parent_id "
+                "FROM projects p JOIN users u ON u.id = p.owner_id "
+                "JOIN documents d ON d.project_id = p.id "
+                "WHERE u.email LIKE :pattern AND d.document_metadata ? 'parent_id' LIMIT 1"
+            ),
+            {"pattern": BENCH_EMAIL_PATTERN},
+        )
+    ).first()
+    if row is None:
+        raise SystemExit("No benchmark data found, run with --seed first")
+    return {"project_id": row.project_id, "owner_id": row.owner_id, "parent_id": row.parent_id}
+
+
+async def explain(conn: AsyncConnection, sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]
+    node = root["Plan"]
+    scans = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if "Scan" in current["Node Type"]:
+            scans.append(f"{current['Node Type']}({current.get('Index Name') or current.get('Relation Name')})")
+        stack.extend(current.get("Plans", []))
+    return {
+        "ms": root["Execution Time"],
+        "buffers": node.get("Shared Hit Blocks", 0) + node.get("Shared Read Blocks", 0),
+        "scans": ", ".join(scans),
+    }
+
+
+async def run_queries(conn: AsyncConnection, params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, sql in QUERIES:
+        await explain(conn, sql, params)  # warm the cache
+        results[name] = await explain(conn, sql, params)
+    return results
+
+
+async def compare(conn: AsyncConnection) -> None:
+    params = await pick_parameters(conn)
+    await conn.rollback()
+
+    transaction = await conn.begin()
+    for index in INDEXES:
+        await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+    before = await run_queries(conn, params)
+    await transaction.rollback()
+
+    async with conn.begin():
+        after = await run_queries(conn, params)
+
+    print(f"{'query':<20} {'before ms':>10} {'after ms':>10} {'buffers':>15}  plan (before -> after)")
+    for name, _ in QUERIES:
+        b, a = before[name], after[name]
+        print(
+            f"{name:<20} {b['ms']:>10.2f} {a['ms']:>10.2f} {b['buffers']:>7}->{a['buffers']:<7}"
+            f"  {b['scans']} -> {a['scans']}"
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", action="store_true", help="Insert the benchmark dataset first")
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark dataset and exit")
+    parser.add_argument("--documents", type=int, default=100_000)
+    parser.add_argument("--projects", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--characters", type=int, default=20_000)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        if args.cleanup:
+            async with engine.begin() as conn:
+                await conn.execute(text("DELETE FROM users WHERE email LIKE :pattern"), {"pattern": BENCH_EMAIL_PATTERN})
+            return
+        if args.seed:
+            async with engine.begin() as conn:
+                await seed(conn, args.documents, args.projects, args.users, args.characters)
+        async with engine.connect() as conn:
+            await compare(conn)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
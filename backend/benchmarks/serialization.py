@@ -0,0 +1,152 @@
+"""
+Compare JSON rendering and payload size of editor responses before and after orjson + compression.
+
+Builds the responses the editor polls for a chapter with 50 versions (the
+document, its version list and one version with content), then times the
+rendering with the stdlib-based JSONResponse (previous default) and with
+ORJSONResponse, and reports the body size raw, gzip and Brotli at the
+COMPRESSION_* settings. No database is needed:
+
+    cd backend
+    python -m benchmarks.serialization --versions 50 --words 6000
+"""
+import argparse
+import random
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.compression import brotli
+from app.core.config import settings
+from app.schemas.document import DocumentResponse, DocumentVersionList, DocumentVersionResponse
+
+WORDS = "le la les un une des nuit porte silence regard ombre lumiere chemin maison memoire souffle".split()
+
+
+def _text(words: int, rng: random.Random) -> str:
+    paragraphs = []
+    for start in range(0, words, 120):
+        paragraphs.append(" ".join(rng.choice(WORDS) for _ in range(min(120, words - start))) + ".")
+    return "\n\n".join(paragraphs)
+
+
+def build_payloads(versions: int, words: int) -> Dict[str, Any]:
+    """Pydantic models as returned by get_document, list_document_versions and get_document_version."""
+    rng = random.Random(42)
+    now = datetime(2026, 1, 1)
+    document_id = uuid4()
+    user_id = uuid4()
+    summaries = []
+    for number in range(1, versions + 1):
+        summaries.append({
+            "id": uuid4(),
+            "version": f"v{number}",
+            "created_at": now + timedelta(hours=number),
+            "word_count": words + rng.randint(-300, 300),
+            "min_word_count": words - 500,
+            "max_word_count": words + 500,
+            "summary": _text(60, rng),
+            "instructions": _text(30, rng),
+            "source_version_id": str(summaries[-1]["id"]) if summaries else None,
+            "source_version": summaries[-1]["version"] if summaries else None,
+            "source_type": "manual" if number % 3 else "generation",
+            "source_comment_ids": [str(uuid4()) for _ in range(number % 4)],
+            "is_current": number == versions,
+        })
+    content = _text(words, rng)
+    comments = [
+        {
+            "id": str(uuid4()),
+            "content": _text(40, rng),
+            "created_at": (now + timedelta(hours=number)).isoformat(),
+            "user_id": str(user_id),
+            "version_id": str(summaries[number % versions]["id"]),
+            "applied_version_ids": [str(summaries[number % versions]["id"])],
+        }
+        for number in range(versions)
+    ]
+    document = DocumentResponse(
+        id=document_id,
+        title="Chapitre 12",
+        content=content,
+        document_type="chapter",
+        order_index=12,
+        word_count=words,
+        metadata={
+            "element_type": "chapitre",
+            "element_index": 12,
+            "current_version": f"v{versions}",
+            "summary": _text(80, rng),
+            "comments": comments,
+        },
+        project_id=uuid4(),
+        created_at=now,
+        updated_at=now + timedelta(hours=versions),
+    )
+    return {
+        "document": document,
+        "versions": DocumentVersionList(
+            versions=summaries,
+            total=versions,
+        ),
+        "version": DocumentVersionResponse(**summaries[-1], content=content),
+    }
+
+
+def _time(func: Callable[[], Any], repeat: int) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def _sizes(body: bytes) -> List[str]:
+    gzip = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+    sizes = [str(len(body)), str(len(gzip.compress(body) + gzip.flush()))]
+    sizes.append(str(len(brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY))) if brotli else "n/a")
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", type=int, default=50)
+    parser.add_argument("--words", type=int, default=6000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.versions} versions, {args.words} words per chapter, {args.repeat} runs")
+    print(
+        f"{'response':<10} {'dump ms':>8} {'json ms':>8} {'orjson ms':>10} "
+        f"{'raw B':>9} {'gzip B':>8} {'br B':>8} {'gzip ms':>8} {'br ms':>7}"
+    )
+    for name, model in build_payloads(args.versions, args.words).items():
+        # What FastAPI hands to the response class for a response_model endpoint
+        jsonable = model.model_dump(mode="json", by_alias=True)
+        dump_ms = _time(lambda: model.model_dump(mode="json", by_alias=True), args.repeat)
+        json_ms = _time(lambda: JSONResponse(jsonable), args.repeat)
+        orjson_ms = _time(lambda: ORJSONResponse(jsonable), args.repeat)
+        body = ORJSONResponse(jsonable).body
+        raw, gzipped, brotlied = _sizes(body)
+
+        def gzip_body() -> bytes:
+            compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+            return compressor.compress(body) + compressor.flush()
+
+        gzip_ms = _time(gzip_body, args.repeat)
+        br_ms = (
+            f"{_time(lambda: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY), args.repeat):>7.2f}"
+            if brotli else f"{'n/a':>7}"
+        )
+        print(
+            f"{name:<10} {dump_ms:>8.2f} {json_ms:>8.2f} {orjson_ms:>10.2f} "
+            f"{raw:>9} {gzipped:>8} {brotlied:>8} {gzip_ms:>8.2f} {br_ms}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware
+
+BODY = "Il etait une fois une tempete sur la lande. " * 100
+
+
+async def text(request):
+    return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+
+async def small(request):
+    return PlainTextResponse("court")
+
+
+async def events(request):
+    async def stream():
+        for index in range(3):
+            yield f"data: {BODY} {index}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+async def epub(request):
+    return Response(BODY.encode("utf-8"), media_type="application/epub+zip")
+
+
+def make_client():
+    app = Starlette(
+        routes=[
+            Route("/text", text),
+            Route("/small", small),
+            Route("/events", events),
+            Route("/epub", epub),
+        ]
+    )
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return TestClient(app)
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_negotiation_prefers_brotli_over_gzip():
+    client = make_client()
+
+    assert client.get("/text", headers={"Accept-Encoding": "gzip, br"}).headers["content-encoding"] == "br"
+    assert client.get("/text", headers={"Accept-Encoding": "br;q=0, gzip"}).headers["content-encoding"] == "gzip"
+
+
+def test_gzip_response_is_decodable_with_weak_etag():
+    response = make_client().get("/text", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.text == BODY
+
+
+def test_identity_keeps_strong_etag_and_small_bodies_are_not_compressed():
+    client = make_client()
+
+    identity = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] == '"abc"'
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+
+
+@pytest.mark.parametrize("path", ["/events", "/epub"])
+def test_streams_and_archives_pass_through(path):
+    response = make_client().get(path, headers={"Accept-Encoding": "gzip, br"})
+
+    assert "content-encoding" not in response.headers
+    assert BODY in response.text
@@ -0,0 +1,46 @@
+from app.services.context_packer import count_tokens, pack_context, select_items
+
+
+def _render(item):
+    return f"- {item['name']}: {item['description']}"
+
+
+def test_select_items_prefers_focus_mentions_within_budget():
+    characters = [
+        {"name": f"Figurant {index}", "description": "passant anonyme dans la foule"}
+        for index in range(30)
+    ]
+    characters.append({"name": "Helene", "description": "capitaine du navire"})
+    line_tokens = count_tokens(_render(characters[0])) + 1
+
+    packed = select_items(
+        characters,
+        _render,
+        budget=line_tokens * 3,
+        focus="Helene prend la barre pendant la tempete",
+        name_key="name",
+    )
+
+    assert len(packed["lines"]) <= 3
+    assert any(line.startswith("- Helene") for line in packed["lines"])
+    assert packed["omitted"] == len(characters) - len(packed["lines"])
+    assert packed["tokens"] <= line_tokens * 3
+
+
+def test_pack_context_ranks_documents_near_anchor_and_keeps_order():
+    context = {
+        "documents": [
+            {"title": f"Chapitre {index}", "order_index": index} for index in range(50)
+        ],
+    }
+    budget = (count_tokens("Chapitre 10") + 1) * 3
+
+    packed = pack_context(
+        context,
+        {"documents": lambda doc: doc["title"]},
+        anchor_index=20,
+        budgets={"documents": budget},
+    )
+
+    assert packed["documents"]["lines"] == ["Chapitre 19", "Chapitre 20", "Chapitre 21"]
+    assert packed["tokens"] == packed["documents"]["tokens"]
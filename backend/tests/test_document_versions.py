@@ -16,6 +16,7 @@ class DummyDocument:
         self.content = content
         self.document_metadata = metadata
         self.document_type = DocumentType.CHAPTER
+        self.order_index = 0
 
 
 class DummyDocumentService:
@@ -36,6 +37,43 @@ class DummyDocumentService:
         return self.document
 
 
+class DummyDocumentVersionService:
+    def __init__(self, versions=None):
+        self.versions = list(versions or [])
+
+    async def get(self, document_id, version_id):
+        return next((item for item in self.versions if str(item.id) == str(version_id)), None)
+
+    async def get_content(self, version):
+        return version.content
+
+    async def get_labels(self, document_id, version_ids):
+        wanted = {str(version_id) for version_id in version_ids}
+        return {str(item.id): item.version for item in self.versions if str(item.id) in wanted}
+
+    async def get_latest(self, document_id):
+        return self.versions[-1] if self.versions else None
+
+    async def find_by_label(self, document_id, label):
+        matches = [item for item in self.versions if item.version == label]
+        return matches[-1] if matches else None
+
+    async def add(self, document_id, **fields):
+        version = SimpleNamespace(id=uuid4(), document_id=document_id, created_at=datetime.utcnow(), **fields)
+        self.versions.append(version)
+        return version
+
+
+def make_version(version_id, version, content):
+    return SimpleNamespace(
+        id=version_id,
+        version=version,
+        created_at=datetime.utcnow(),
+        content=content,
+        word_count=len(content.split()),
+    )
+
+
 class DummyContextService:
     def __init__(self, db):
         self.db = db
@@ -60,21 +98,12 @@ async def test_manual_edit_creates_version(monkeypatch):
     doc_id = uuid4()
     project_id = uuid4()
     source_version_id = uuid4()
-    metadata = {
-        "versions": [
-            {
-                "id": str(source_version_id),
-                "version": "v1",
-                "created_at": datetime.utcnow().isoformat(),
-                "content": "Contenu initial",
-                "word_count": 2,
-            }
-        ],
-        "current_version": "v1",
-    }
+    metadata = {"current_version": "v1"}
     document = DummyDocument(doc_id, project_id, "Chapitre 1", "Contenu initial", metadata)
     service = DummyDocumentService(document)
+    version_service = DummyDocumentVersionService([make_version(source_version_id, "v1", "Contenu initial")])
     monkeypatch.setattr(documents_module, "DocumentService", lambda db: service)
+    monkeypatch.setattr(documents_module, "DocumentVersionService", lambda db: version_service)
 
     payload = DocumentVersionCreate(content="Contenu corrige")
     user = SimpleNamespace(id=uuid4())
@@ -83,9 +112,12 @@ async def test_manual_edit_creates_version(monkeypatch):
 
     updated_metadata = document.document_metadata
     assert updated_metadata["current_version"] == "v1.01"
-    latest_version = updated_metadata["versions"][-1]
-    assert latest_version["source_type"] == "manual_edit"
-    assert latest_version["source_version_id"] == str(source_version_id)
+    assert "versions" not in updated_metadata
+    latest_version = version_service.versions[-1]
+    assert latest_version.version == "v1.01"
+    assert latest_version.content == "Contenu corrige"
+    assert latest_version.source_type == "manual_edit"
+    assert str(latest_version.source_version_id) == str(source_version_id)
 
 
 @pytest.mark.asyncio
@@ -96,15 +128,6 @@ async def test_generate_element_applies_selected_comment(monkeypatch):
     comment_id = uuid4()
     other_comment_id = uuid4()
     metadata = {
-        "versions": [
-            {
-                "id": str(source_version_id),
-                "version": "v1",
-                "created_at": datetime.utcnow().isoformat(),
-                "content": "Version source",
-                "word_count": 2,
-            }
-        ],
         "current_version": "v1",
         "comments": [
             {
@@ -127,7 +150,9 @@ async def test_generate_element_applies_selected_comment(monkeypatch):
     }
     document = DummyDocument(doc_id, project_id, "Chapitre 1", "Version source", metadata)
     service = DummyDocumentService(document)
+    version_service = DummyDocumentVersionService([make_version(source_version_id, "v1", "Version source")])
     monkeypatch.setattr(documents_module, "DocumentService", lambda db: service)
+    monkeypatch.setattr(documents_module, "DocumentVersionService", lambda db: version_service)
     monkeypatch.setattr(documents_module, "ProjectContextService", DummyContextService)
     monkeypatch.setattr(documents_module, "DeepSeekClient", DummyDeepSeekClient)
 
@@ -140,9 +165,10 @@ async def test_generate_element_applies_selected_comment(monkeypatch):
     await documents_module.generate_element(doc_id, payload, db=None, current_user=user)
 
     updated_metadata = document.document_metadata
-    latest_version = updated_metadata["versions"][-1]
-    assert latest_version["source_comment_ids"] == [str(comment_id)]
+    latest_version = version_service.versions[-1]
+    assert updated_metadata["current_version"] == latest_version.version == "v1.01"
+    assert latest_version.source_comment_ids == [str(comment_id)]
     comment_entry = next(item for item in updated_metadata["comments"] if item["id"] == str(comment_id))
-    assert latest_version["id"] in comment_entry["applied_version_ids"]
+    assert str(latest_version.id) in comment_entry["applied_version_ids"]
     other_entry = next(item for item in updated_metadata["comments"] if item["id"] == str(other_comment_id))
     assert other_entry["applied_version_ids"] == []
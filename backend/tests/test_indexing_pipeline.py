@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.services.indexing_pipeline import IndexingPipeline
+
+
+class DummyStream:
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            yield row
+
+    async def close(self):
+        self.closed = True
+
+
+class DummyDb:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, statement):
+        return SimpleNamespace(scalar=lambda: len(self.rows))
+
+    async def stream(self, statement):
+        return DummyStream(self.rows)
+
+
+class FirstUpsertFailsRagService:
+    def __init__(self, existing):
+        self.existing = existing
+        self.deleted = []
+        self.refreshed = []
+        self.upserts = 0
+
+    def _ensure_collection(self):
+        pass
+
+    def _existing_points(self, project_id):
+        return self.existing
+
+    def _chunk_document(self, project_id, document):
+        return {f"{document.id}-0": {"text": document.content, "payload": {}}}
+
+    def _payload_outdated(self, stored, chunk):
+        return False
+
+    def _embed_points(self, pending):
+        time.sleep(0.02)
+        return [point_id for point_id, _ in pending]
+
+    def _upsert_points(self, points, wait):
+        # Only the first batch fails; it is long finished when the last batches are awaited
+        self.upserts += 1
+        if self.upserts == 1:
+            raise RuntimeError("qdrant unavailable")
+
+    def _refresh_payloads(self, updates):
+        self.refreshed.extend(updates)
+
+    def _delete_points(self, point_ids):
+        self.deleted.extend(point_ids)
+
+
+@pytest.mark.asyncio
+async def test_failed_upsert_aborts_run_without_deleting(monkeypatch):
+    documents = [
+        SimpleNamespace(id=uuid4(), title=f"Chapitre {index}", content="texte", order_index=index, document_type="chapter")
+        for index in range(5)
+    ]
+    rag_service = FirstUpsertFailsRagService(existing={"ancien-point": {"metadata": {"document_id": "supprime"}}})
+    pipeline = IndexingPipeline(DummyDb(documents), rag_service=rag_service)
+    # One document per batch, each embedding slower than an upsert
+    pipeline.embed_batch_size = 1
+
+    with pytest.raises(RuntimeError, match="qdrant unavailable"):
+        await pipeline.run(uuid4())
+
+    assert rag_service.deleted == []
+    assert rag_service.refreshed == []
@@ -0,0 +1,107 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import documents as documents_module
+from app.core.pagination import decode_cursor, encode_cursor
+
+START = datetime(2026, 1, 1)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(START.isoformat(), "3f2b")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 2) == [START.isoformat(), "3f2b"]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "pas-un-curseur!",
+        encode_cursor("2026-01-01T00:00:00"),  # wrong number of keys
+        encode_cursor("a", "b", "c"),
+        "eyJhIjogMX0",  # valid base64 JSON, but an object
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, 2)
+    assert exc_info.value.status_code == 400
+
+
+def test_version_cursor_with_bad_keys_is_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        documents_module._parse_version_cursor(encode_cursor("hier", "pas-un-uuid"))
+    assert exc_info.value.status_code == 400
+
+
+def make_comments(count):
+    return [
+        {
+            "id": str(uuid4()),
+            "content": f"Commentaire {index}",
+            "created_at": (START + timedelta(minutes=index)).isoformat(),
+            "user_id": str(uuid4()),
+        }
+        for index in range(count)
+    ]
+
+
+class DummyCommentService:
+    def __init__(self, comments):
+        self.comments = comments
+        self.calls = []
+
+    async def get_history_header(self, document_id, user_id):
+        return SimpleNamespace(id=document_id, comment_count=len(self.comments))
+
+    async def list_comments(self, document_id, limit, after, descending):
+        self.calls.append({"limit": limit, "after": after})
+        entries = self.comments
+        if after:
+            entries = [entry for entry in entries if (entry["created_at"], entry["id"]) > after]
+        return entries[:limit] if limit else entries
+
+
+async def list_comments(limit, cursor=None):
+    return await documents_module.list_document_comments(
+        uuid4(),
+        limit=limit,
+        cursor=cursor,
+        order="asc",
+        db=None,
+        current_user=SimpleNamespace(id=uuid4()),
+    )
+
+
+@pytest.mark.asyncio
+async def test_comment_pages_chain_through_next_cursor(monkeypatch):
+    comments = make_comments(5)
+    service = DummyCommentService(comments)
+    monkeypatch.setattr(documents_module, "DocumentService", lambda db: service)
+
+    first = await list_comments(limit=2)
+    # One extra row is fetched to know whether another page exists
+    assert service.calls[0]["limit"] == 3
+    assert [str(comment.id) for comment in first.comments] == [entry["id"] for entry in comments[:2]]
+    assert decode_cursor(first.next_cursor, 2) == [comments[1]["created_at"], comments[1]["id"]]
+    assert first.total == 5
+
+    second = await list_comments(limit=2, cursor=first.next_cursor)
+    last = await list_comments(limit=2, cursor=second.next_cursor)
+    assert [str(comment.id) for comment in second.comments + last.comments] == [
+        entry["id"] for entry in comments[2:]
+    ]
+    assert last.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_next_cursor_only_when_more_rows_than_limit(monkeypatch):
+    monkeypatch.setattr(documents_module, "DocumentService", lambda db: DummyCommentService(make_comments(3)))
+
+    assert (await list_comments(limit=3)).next_cursor is None
+    assert (await list_comments(limit=None)).next_cursor is None
+    assert (await list_comments(limit=2)).next_cursor is not None
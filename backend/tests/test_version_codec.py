@@ -0,0 +1,31 @@
+from app.services import version_codec
+
+
+def make_chapter(paragraphs):
+    return "\n\n".join(
+        f"Paragraphe {idx}. " + " ".join(f"mot{idx}_{word}" for word in range(80))
+        for idx in range(paragraphs)
+    )
+
+
+def test_snapshot_round_trip():
+    text = make_chapter(30) + "\nAccents: éèàç — fin"
+    data = version_codec.compress_text(text)
+    assert len(data) < len(text.encode("utf-8"))
+    assert version_codec.decompress_text(data) == text
+
+
+def test_delta_round_trip_is_small_for_local_edit():
+    base = make_chapter(60)
+    edited = base.replace("Paragraphe 12.", "Paragraphe douze, reecrit.").replace(
+        "Paragraphe 40.", "Nouveau passage.\n\nParagraphe 40."
+    )
+    delta = version_codec.make_delta(base, edited)
+    assert version_codec.apply_delta(base, delta) == edited
+    assert len(delta) * 10 < len(version_codec.compress_text(edited))
+
+
+def test_delta_handles_removal_and_trailing_text():
+    base = "ligne 1\nligne 2\nligne 3"
+    for text in ("", "ligne 1\nligne 3", "ligne 1\nligne 2\nligne 3\n", "tout autre texte"):
+        assert version_codec.apply_delta(base, version_codec.make_delta(base, text)) == text